@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Content-addressed copies of the project images and documents the site serves.
+
+public/projects/<id>/images/ and documents/ are where covers and partner files
+are dropped, one directory per project. The same stock placeholder or the same
+PDF often sits under several ui_* ids, and Vite copies the whole tree into
+docs/projects/ on every build, so Pages deployed each copy under its own URL and
+no URL could be cached for long: the file behind /projects/ui_3/images/x.jpg
+changes whenever someone replaces the cover.
+
+This stage hashes every such file and writes each distinct one once, to
+public/blobs/<sha256[:2]>/<sha256[:20]><ext>. data_sources/asset_manifest.json
+maps each site path to its sha256 and blob, and nothing else, so it only changes
+when an asset does (the size/mtime memo that spares re-reading an unchanged tree
+is utils.FileHashMemo's local, git-ignored file). generate_catalog_data.py
+publishes the blob URL in `image`, `hosted_documents` and site-path
+`additional_resources`, so the SPA,
+the SEO pages and the API all point at the immutable copy; a blob URL never
+changes meaning, which is what makes long-lived cache headers safe.
+
+After the Vite build, build.py calls prune_docs_copies() to delete the
+docs/projects/<id>/images/ copies that now have a blob. Documents keep their
+named copy too: partners link to reports by name from outside the catalogue.
+
+The blobs themselves are never committed (public/blobs/ and docs/blobs/ are
+git-ignored): committing them would put every image in git a second and third
+time next to public/projects/, which stays the one copy. The manifest is
+committed with the catalogue that points into it, and the Pages deploy job runs
+`asset_store.py --export docs/blobs` to write the blobs it names from the named
+files before uploading docs/. export_blobs() fails when a named file no longer
+matches its manifest entry, so a deploy never ships a catalogue whose images 404.
+Markdown under projects/<id>/docs/ and the *.txt title markers are not assets the
+catalogue references by path, and public/img/ is left alone: the site's logos
+are referenced by fixed path from the app bundle, and public/img/derived/ is
+content-addressed already (image_derivatives.py).
+"""
+
+import argparse
+import json
+import os
+import shutil
+
+from utils import ProjectTree, FileHashMemo
+
+BLOBS_DIR = os.path.join('public', 'blobs')
+# Site-root URL of BLOBS_DIR (public/ is served at the root).
+BLOBS_URL = '/blobs'
+MANIFEST_PATH = os.path.join('data_sources', 'asset_manifest.json')
+# Hex digits of the sha256 kept in a blob's name: 80 bits, far from any collision
+# at catalogue scale while keeping URLs short.
+BLOB_HASH_CHARS = 20
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """The manifest's assets by site path; empty when missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('assets') or {}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_manifest(assets, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'assets': assets}, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+
+
+def load_asset_map(path=MANIFEST_PATH):
+    """Site path -> blob URL, for asset_url(). Empty before the stage first runs."""
+    return {url: entry['blob'] for url, entry in load_manifest(path).items()}
+
+
+def asset_url(url, asset_map):
+    """The blob URL for a site path, or the path itself when it has no blob."""
+    return asset_map.get(url, url) if url and asset_map else url
+
+
+def blob_path(digest, filename):
+    """Blob location relative to BLOBS_DIR; the extension is kept for the MIME type."""
+    ext = os.path.splitext(filename)[1].lower()
+    return f"{digest[:2]}/{digest[:BLOB_HASH_CHARS]}{ext}"
+
+
+def project_assets(tree):
+    """(site path, file path) of every image and hosted document in the tree."""
+    assets = []
+    for name in sorted(tree.projects):
+        root = os.path.join(tree.projects_dir, name)
+        rel_paths = [f"images/{f}" for f in tree.images(name)] + tree.documents(name)
+        for rel in rel_paths:
+            assets.append((f"/projects/{name}/{rel}", os.path.join(root, *rel.split('/'))))
+    return assets
+
+
+def prune_blobs(keep, blobs_dir=BLOBS_DIR):
+    """Delete blobs not in keep (paths relative to blobs_dir); returns how many."""
+    removed = 0
+    for dirpath, _dirs, names in os.walk(blobs_dir, topdown=False):
+        for name in names:
+            rel = os.path.relpath(os.path.join(dirpath, name), blobs_dir).replace(os.sep, '/')
+            if rel not in keep:
+                os.remove(os.path.join(dirpath, name))
+                removed += 1
+        if dirpath != blobs_dir and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
+
+
+def build_store(tree=None, blobs_dir=BLOBS_DIR, manifest_path=MANIFEST_PATH):
+    """Write a blob for every distinct asset and the manifest; returns the manifest."""
+    tree = tree or ProjectTree()
+    memo = FileHashMemo()
+    assets = {}
+    keep = set()
+    written = 0
+    total_bytes = unique_bytes = 0
+    for url, path in project_assets(tree):
+        digest = memo.sha256(path)
+        size = os.path.getsize(path)
+        rel = blob_path(digest, path)
+        target = os.path.join(blobs_dir, *rel.split('/'))
+        if rel not in keep:
+            unique_bytes += size
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                tmp = target + '.tmp'
+                shutil.copyfile(path, tmp)
+                os.replace(tmp, target)
+                written += 1
+        keep.add(rel)
+        total_bytes += size
+        assets[url] = {'sha256': digest, 'blob': f"{BLOBS_URL}/{rel}"}
+    os.makedirs(blobs_dir, exist_ok=True)
+    removed = prune_blobs(keep, blobs_dir)
+    memo.save()
+    # Rewritten only when its content changes, so the 'catalog' stage (which lists
+    # it as an input) stays skippable.
+    if assets != load_manifest(manifest_path):
+        save_manifest(assets, manifest_path)
+    print(f"Asset store: {len(assets)} file(s) -> {len(keep)} blob(s) "
+          f"({written} new, {removed} removed); "
+          f"{(total_bytes - unique_bytes) / 1e6:.1f} MB of duplicates stored once")
+    return assets
+
+
+def export_blobs(dest, manifest_path=MANIFEST_PATH, public_dir='public'):
+    """Write every blob the manifest names into dest, from the named files.
+
+    Returns the site paths whose file is missing or no longer hashes to its
+    manifest entry (the catalogue was built from other bytes); their blobs are
+    not written.
+    """
+    memo = FileHashMemo()
+    stale = []
+    for url, entry in sorted(load_manifest(manifest_path).items()):
+        path = os.path.join(public_dir, *url.strip('/').split('/'))
+        if not os.path.isfile(path) or memo.sha256(path) != entry['sha256']:
+            stale.append(url)
+            continue
+        target = os.path.join(dest, *entry['blob'][len(BLOBS_URL):].strip('/').split('/'))
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(path, target)
+    memo.save()
+    return stale
+
+
+def prune_docs_copies(asset_map=None, docs_dir='docs'):
+    """Delete docs/projects/<id>/images/ files whose blob is in the built site.
+
+    Vite copies public/projects/ into docs/ wholesale; once the catalogue points at
+    the blobs, those copies are dead weight in the Pages deploy. A file is only
+    removed when its blob was copied into docs/ too. Returns how many were removed.
+    """
+    asset_map = load_asset_map() if asset_map is None else asset_map
+    removed = 0
+    for url, blob in asset_map.items():
+        parts = url.strip('/').split('/')
+        if len(parts) < 4 or parts[2] != 'images':
+            continue
+        copy = os.path.join(docs_dir, *parts)
+        if os.path.isfile(copy) and os.path.isfile(os.path.join(docs_dir, *blob.strip('/').split('/'))):
+            os.remove(copy)
+            removed += 1
+            images_dir = os.path.dirname(copy)
+            if not os.listdir(images_dir):
+                os.rmdir(images_dir)
+    return removed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Store project images and documents once each under public/blobs/ by content hash.')
+    parser.add_argument('--prune-docs', action='store_true',
+                        help='Instead, delete the docs/projects/*/images/ copies that have a blob in docs/')
+    parser.add_argument('--export', metavar='DIR',
+                        help='Instead, write the blobs the committed manifest names into DIR (deploy)')
+    cli_args = parser.parse_args()
+    if cli_args.prune_docs:
+        print(f"Removed {prune_docs_copies()} image copies from docs/projects/")
+    elif cli_args.export:
+        stale = export_blobs(cli_args.export)
+        for url in stale:
+            print(f"Out of date in {MANIFEST_PATH}: {url}")
+        if stale:
+            raise SystemExit(f"{len(stale)} asset(s) changed since the catalogue was built; "
+                             "rerun scripts/build.py")
+        print(f"Blobs written to {cli_args.export}")
+    else:
+        build_store()
@@ -1,14 +1,14 @@
 import argparse
-import os
-import datetime
-import csv
 import gspread
 from utils import get_gsheet_client, DEFAULT_CREDENTIALS_PATH
+from sheet_snapshot import take_snapshot
 
 def main():
-    parser = argparse.ArgumentParser(description='Backup Google Sheet data to CSV.')
+    parser = argparse.ArgumentParser(
+        description='Back up the Google Sheet into the snapshot store '
+                    '(restore with: python scripts/sheet_snapshot.py restore YYYY-MM-DD).')
     parser.add_argument('--credentials', type=str, default=DEFAULT_CREDENTIALS_PATH, help='Path to Google API credentials JSON file.')
-    parser.add_argument('--backup-dir', type=str, required=True, help='Directory to save the backup CSV file.')
+    parser.add_argument('--backup-dir', type=str, required=True, help='Snapshot store directory.')
     args = parser.parse_args()
 
     print("Starting monthly Google Sheet backup...")
@@ -18,29 +18,15 @@ def main():
         _client, _spreadsheet, sheet = get_gsheet_client(args.credentials)
         print(f"Successfully connected to sheet: {sheet.title}")
 
-        # --- Fetch Data ---
-        all_values = sheet.get_all_values()
-        if not all_values:
+        # --- Fetch and store ---
+        # An unchanged sheet leaves the store untouched; a changed one is
+        # stored as a delta (or a new base).
+        snapshot = take_snapshot(sheet, args.backup_dir)
+        if not snapshot['values']:
             print("Warning: No data found in the sheet.")
-            return # Exit if sheet is empty
+            return
 
-        print(f"Fetched {len(all_values)} rows from the sheet.")
-
-        # --- Save Backup ---
-        os.makedirs(args.backup_dir, exist_ok=True)
-        # Use Year and Month for the filename
-        current_month_str = datetime.datetime.now().strftime("%Y%m") 
-        backup_filename = f"monthly_sheet_backup_{current_month_str}.csv"
-        backup_filepath = os.path.join(args.backup_dir, backup_filename)
-
-        try:
-            with open(backup_filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerows(all_values)
-            print(f"Successfully created monthly backup: {backup_filepath}")
-        except Exception as backup_e:
-            print(f"Error writing backup CSV file: {backup_e}")
-            exit(1)
+        print(f"Successfully backed up {len(snapshot['values'])} rows ({snapshot['stored']}).")
 
     except gspread.exceptions.APIError as api_e:
         print(f"Google Sheets API Error: {api_e}")
@@ -6,28 +6,345 @@ Orchestrates the complete build process:
 1. Generate JSON data files from Excel
 2. Build React application  
 3. Output to docs/ for GitHub Pages
+
+Stages form a small build graph: each declares the files it reads and writes, and
+a stage whose inputs and outputs still hash to what data_sources/build_manifest.json
+recorded after its last successful run is skipped. A sheet sync that changed nothing
+therefore skips the URL audit, the Vite build and page generation. Pass --force to
+run every stage regardless of the manifest.
 """
 
+import argparse
+import glob
+import hashlib
+import json
 import subprocess
 import sys
 import os
 
 PYTHON = sys.executable
 
+# Records, per stage, the input/output digests of its last successful run. Lives
+# under data_sources/ (committed alongside the outputs it describes) so CI runs on
+# a fresh checkout can still skip stages whose inputs did not change.
+MANIFEST_PATH = os.path.join('data_sources', 'build_manifest.json')
+
+EXCEL_PATH = os.path.join('docs', 'data_catalog.xlsx')
+CATALOG_PATH = os.path.join('public', 'data', 'catalog.json')
+
+# Modules imported by most stages; a change to either invalidates all of them.
+SHARED_CODE = ['scripts/utils.py', 'scripts/text_parsing.py']
+
+# Declared inputs/outputs per cached stage. Entries are files, directories (hashed
+# recursively) or glob patterns. Each stage lists its own script so code changes
+# invalidate it. Stages not listed here (catalog diff, placeholder images, docs
+# cleanup, head parity) are cheap or depend on the network, and always run.
+STAGES = {
+    # Resized WebP/AVIF covers. Without Pillow the stage changes nothing, its
+    # outputs may be missing, and it simply reruns (cheaply) on the next build.
+    'derivatives': {
+        'inputs': ['public/projects', 'scripts/image_derivatives.py'] + SHARED_CODE,
+        'outputs': ['public/img/derived'],
+    },
+    # Project images and documents stored once each under their content hash.
+    'assets': {
+        'inputs': ['public/projects', 'scripts/asset_store.py'] + SHARED_CODE,
+        'outputs': ['public/blobs', 'data_sources/asset_manifest.json'],
+    },
+    'catalog': {
+        'inputs': ['docs/data_catalog.xlsx', 'public/projects',
+                   'public/img/derived/manifest.json', 'scripts/image_derivatives.py',
+                   'data_sources/asset_manifest.json', 'scripts/asset_store.py',
+                   'scripts/generate_catalog_data.py'] + SHARED_CODE,
+        'outputs': ['public/data/catalog.json', 'public/data/projects/*.json'],
+    },
+    # health_check.py rewrites the index too when it publishes new health data.
+    'index': {
+        'inputs': ['public/data/catalog.json', 'public/data/health.json',
+                   'scripts/catalog_index.py'],
+        'outputs': ['public/data/catalog-index.json'],
+    },
+    'validate': {
+        'inputs': ['docs/data_catalog.xlsx', 'public/data/catalog.json',
+                   'scripts/validate_data.py'] + SHARED_CODE,
+        'outputs': ['docs/data_quality_report.md'],
+    },
+    'parity': {
+        'inputs': ['public/data/catalog.json', 'public/data/health.json',
+                   'src/utils/parsing.js', 'src/utils/ranking.js',
+                   'scripts/catalog_index.py', 'scripts/check_parity.py'] + SHARED_CODE,
+        'outputs': [],
+    },
+    'insights': {
+        'inputs': ['docs/data_catalog.xlsx', 'public/data/catalog.json',
+                   'scripts/generate_insights_data.py'] + SHARED_CODE,
+        'outputs': ['public/data/insights.json'],
+    },
+    'api': {
+        'inputs': ['public/data/catalog.json', 'scripts/generate_api.py',
+                   'scripts/diff_catalog.py'] + SHARED_CODE,
+        'outputs': ['public/api/**/*.json', 'public/api/index.html'],
+    },
+    # Vite copies all of public/ into docs/, so every public file is an input.
+    'vite': {
+        'inputs': ['src', 'public', 'index.html', 'package.json', 'vite.config.js'],
+        'outputs': ['docs/index.html', 'docs/assets', 'docs/data', 'docs/api'],
+    },
+    'seo': {
+        'inputs': ['public/data/catalog.json', 'docs/assets',
+                   'scripts/generate_seo_pages.py'] + SHARED_CODE,
+        'outputs': ['docs/projects/*/index.html', 'docs/insights/index.html',
+                    'docs/sitemap.xml', 'docs/robots.txt'],
+    },
+}
+
+# (path, size, mtime_ns) -> sha256 hex. public/projects is hashed by several stages
+# (and twice by 'catalog' when new images arrive), so memoise within one build.
+_file_hash_cache = {}
+
+
+def _file_digest(path):
+    st = os.stat(path)
+    key = (path, st.st_size, st.st_mtime_ns)
+    if key not in _file_hash_cache:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        _file_hash_cache[key] = h.hexdigest()
+    return _file_hash_cache[key]
+
+
+def _expand(patterns):
+    """Resolve files, directories and glob patterns to a sorted list of file paths.
+
+    Returns (files, missing) where missing lists the patterns that matched nothing.
+    """
+    files = set()
+    missing = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else (
+            [pattern] if os.path.exists(pattern) else [])
+        if not matches:
+            missing.append(pattern)
+        for match in matches:
+            if os.path.isdir(match):
+                for root, dirs, names in os.walk(match):
+                    dirs[:] = [d for d in dirs if d != '__pycache__']
+                    files.update(os.path.join(root, n) for n in names)
+            else:
+                files.add(match)
+    return sorted(files), missing
+
+
+def hash_paths(patterns):
+    """Content digest of every file matched by patterns (path + bytes, order-stable)."""
+    files, missing = _expand(patterns)
+    h = hashlib.sha256()
+    for path in files:
+        h.update(path.replace(os.sep, '/').encode('utf-8'))
+        h.update(b'\0')
+        h.update(_file_digest(path).encode('ascii'))
+        h.update(b'\n')
+    return h.hexdigest(), missing
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def stage_is_fresh(name, manifest):
+    """True when the stage's inputs and outputs match its last recorded successful run.
+
+    Outputs are checked too: a stage whose outputs were deleted or hand-edited since
+    its last run is rebuilt even though its inputs did not change.
+    """
+    recorded = manifest.get(name)
+    if not recorded:
+        return False
+    spec = STAGES[name]
+    inputs, _ = hash_paths(spec['inputs'])
+    outputs, missing_outputs = hash_paths(spec['outputs'])
+    if missing_outputs:
+        return False
+    return recorded.get('inputs') == inputs and recorded.get('outputs') == outputs
+
+
+def run_stage(name, cmd, description, manifest, force=False, fn=None):
+    """Run a cached stage unless its manifest entry is still fresh.
+
+    fn, when given, runs the stage in-process instead of cmd (see PipelineContext).
+    Returns True on success (or skip). Inputs are hashed after the stage runs,
+    because 'catalog' itself renames project directories under public/projects.
+    """
+    if not force and stage_is_fresh(name, manifest):
+        print(f"\n⏭️  {description} - unchanged inputs, skipped")
+        return True
+    ok = run_function(fn, description) if fn else run_command(cmd, description)
+    if not ok:
+        manifest.pop(name, None)
+        save_manifest(manifest)
+        return False
+    spec = STAGES[name]
+    manifest[name] = {
+        'inputs': hash_paths(spec['inputs'])[0],
+        'outputs': hash_paths(spec['outputs'])[0],
+    }
+    save_manifest(manifest)
+    return True
+
+
+class PipelineContext:
+    """Workbook and catalog shared by the Python stages of one in-process build.
+
+    Each stage used to be its own interpreter that re-imported pandas, re-read
+    data_catalog.xlsx and re-parsed catalog.json. Here both are loaded on first use
+    and kept, and the catalog stage hands over the dict it just wrote, so a build
+    parses each once. A stage skipped by the manifest never triggers the load.
+    """
+
+    def __init__(self, excel_path=EXCEL_PATH, catalog_path=CATALOG_PATH):
+        self.excel_path = excel_path
+        self.catalog_path = catalog_path
+        self._workbook = None
+        self._catalog = None
+        self._project_tree = None
+
+    @property
+    def workbook(self):
+        if self._workbook is None:
+            from utils import load_sheet
+            self._workbook = load_sheet(self.excel_path)
+            print(f"Loaded {len(self._workbook)} rows from {self.excel_path}")
+        return self._workbook
+
+    @property
+    def catalog(self):
+        if self._catalog is None:
+            with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                self._catalog = json.load(f)
+        return self._catalog
+
+    @catalog.setter
+    def catalog(self, value):
+        self._catalog = value
+
+    @property
+    def project_tree(self):
+        """ProjectTree of public/projects shared by catalog, insights and the image
+        snapshots. The catalog stage's directory migration keeps it current; call
+        refresh() on it after anything else writes under public/projects."""
+        if self._project_tree is None:
+            from utils import ProjectTree
+            self._project_tree = ProjectTree()
+        return self._project_tree
+
+
+# In-process stage bodies. Each mirrors the script's own __main__ and returns
+# True on success; the modules are imported here rather than at the top so
+# --subprocess builds never pay for pandas in this process.
+
+def derivatives_stage(ctx):
+    from image_derivatives import generate_derivatives
+    generate_derivatives(ctx.project_tree)
+    return True
+
+
+def assets_stage(ctx):
+    from asset_store import build_store
+    build_store(ctx.project_tree)
+    return True
+
+
+def generate_catalog_stage(ctx):
+    from generate_catalog_data import generate_catalog_json
+    catalog = generate_catalog_json(ctx.workbook, ctx.project_tree)
+    if not catalog:
+        return False
+    ctx.catalog = catalog
+    return True
 
-def snapshot_project_images():
-    """Return set of image file paths under public/projects/*/images/."""
-    images = set()
-    projects_dir = os.path.join('public', 'projects')
-    if not os.path.isdir(projects_dir):
-        return images
-    for project in os.listdir(projects_dir):
-        img_dir = os.path.join(projects_dir, project, 'images')
-        if os.path.isdir(img_dir):
-            for f in os.listdir(img_dir):
-                if f.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
-                    images.add(os.path.join(img_dir, f))
-    return images
+
+def validate_stage(ctx):
+    from validate_data import run_checks
+    run_checks(ctx.catalog_path, 'docs/data_quality_report.md', check_urls=True,
+               data=ctx.catalog)
+    return True
+
+
+def parity_stage(ctx):
+    import check_parity
+    return check_parity.main(ctx.catalog) == 0
+
+
+def insights_stage(ctx, project_count):
+    from generate_insights_data import generate_insights_json
+    return generate_insights_json(ctx.workbook, project_count, ctx.project_tree) is not None
+
+
+def index_stage(ctx):
+    from catalog_index import generate_index
+    generate_index(catalog=ctx.catalog)
+    return True
+
+
+def api_stage(ctx):
+    from generate_api import generate_api
+    generate_api(catalog=ctx.catalog)
+    return True
+
+
+def seo_stage(ctx):
+    import generate_seo_pages
+    return generate_seo_pages.main(ctx.catalog) == 0
+
+
+def head_parity_stage(ctx):
+    import check_head_parity
+    return check_head_parity.main() == 0
+
+
+def diff_stage(ctx, in_process):
+    """Compare the new catalog with the live one; returns (exit code, report, stderr).
+
+    Exit codes follow diff_catalog.py: 0 normal, 1 suspicious, anything else crashed.
+    """
+    if not in_process:
+        result = subprocess.run(
+            [PYTHON, 'scripts/diff_catalog.py'],
+            capture_output=True, text=True
+        )
+        return result.returncode, result.stdout, result.stderr
+    try:
+        from diff_catalog import build_report, load_catalog, OLD_PATH
+        new_catalog = {p['id']: p for p in ctx.catalog.get('projects', [])}
+        report, suspicious = build_report(load_catalog(OLD_PATH), new_catalog)
+        return (1 if suspicious else 0), report, ''
+    except Exception as e:
+        return 2, '', f"{type(e).__name__}: {e}"
+
+
+def snapshot_project_images(tree=None):
+    """Return set of image file paths under public/projects/*/images/.
+
+    tree is an up-to-date ProjectTree to read from; without one the directory is
+    scanned afresh.
+    """
+    if tree is None:
+        from utils import ProjectTree
+        tree = ProjectTree()
+    return tree.image_paths()
 
 def run_command(cmd, description):
     """Run a command and handle errors."""
@@ -43,31 +360,91 @@ def run_command(cmd, description):
         print(f"Error: {e}")
         return False
 
+def run_function(fn, description):
+    """In-process counterpart of run_command: same banners, exceptions count as failure."""
+    print(f"\n{'='*60}")
+    print(f"  {description}")
+    print(f"{'='*60}")
+    try:
+        ok = fn()
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        ok = False
+        print(f"Error: {e}")
+    print(f"✅ {description} - SUCCESS" if ok else f"❌ {description} - FAILED")
+    return ok
+
 def main():
+    parser = argparse.ArgumentParser(description='Build the Fair Forward Data Catalog site into docs/.')
+    parser.add_argument('--force', action='store_true',
+                        help='Run every stage even if its inputs are unchanged since the last build')
+    parser.add_argument('--subprocess', action='store_true',
+                        help='Run each Python stage in its own interpreter instead of in-process '
+                             '(slower; isolates a misbehaving stage when debugging)')
+    args = parser.parse_args()
+    force = args.force
+    manifest = load_manifest()
+    ctx = PipelineContext()
+    in_process = not args.subprocess
+
+    def inproc(fn, *fn_args):
+        """Bind fn to the shared context, or None to fall back to the stage's command."""
+        return (lambda: fn(ctx, *fn_args)) if in_process else None
+
     print("\n" + "="*60)
     print("  Fair Forward Data Catalog - Complete Build")
     print("="*60)
     
+    # Step 0: Resize project covers to WebP/AVIF. Before the catalog, which
+    # publishes the variants as image_srcset. Advisory: without derivatives the
+    # catalog still carries every original.
+    run_stage(
+        'derivatives',
+        [PYTHON, 'scripts/image_derivatives.py'],
+        "Generating resized cover images (WebP/AVIF)",
+        manifest, force, inproc(derivatives_stage)
+    )
+
+    # Step 0b: Store project images/documents by content hash. Fatal: the catalog
+    # publishes blob URLs from its manifest, and a half-written store would point
+    # the site at files that are not there.
+    if not run_stage(
+        'assets',
+        [PYTHON, 'scripts/asset_store.py'],
+        "Storing project assets by content hash",
+        manifest, force, inproc(assets_stage)
+    ):
+        sys.exit(1)
+
     # Step 1: Generate catalog JSON
-    if not run_command(
+    if not run_stage(
+        'catalog',
         [PYTHON, 'scripts/generate_catalog_data.py'],
-        "Generating catalog data (JSON)"
+        "Generating catalog data (JSON)",
+        manifest, force, inproc(generate_catalog_stage)
     ):
         sys.exit(1)
     
-    # Step 1b: Run data quality validation (advisory, never blocks the build)
-    subprocess.run(
+    # Step 1b: Run data quality validation (advisory, never blocks the build).
+    # Cached like the other stages: the URL audit is the slowest step of a no-op
+    # rebuild, and a failure is recorded as "not fresh" so the next build retries.
+    run_stage(
+        'validate',
         [PYTHON, 'scripts/validate_data.py', '--check-urls'],
-        check=False
+        "Validating data quality (advisory)",
+        manifest, force, inproc(validate_stage)
     )
 
     # Step 1b2: Confirm the Python link/license parsing still matches its JavaScript
     # twin over every URL now in the catalog. Fatal: the two label the same links, so
     # a divergence means the site and the published API describe the same asset
     # differently. Skips itself when node is unavailable.
-    if not run_command(
+    if not run_stage(
+        'parity',
         [PYTHON, 'scripts/check_parity.py'],
-        "Checking Python/JavaScript parsing parity"
+        "Checking Python/JavaScript parsing and ranking parity",
+        manifest, force, inproc(parity_stage)
     ):
         sys.exit(1)
 
@@ -76,30 +453,27 @@ def main():
     print(f"\n{'='*60}")
     print(f"  Comparing catalog changes (security check)")
     print(f"{'='*60}")
-    diff_result = subprocess.run(
-        [PYTHON, 'scripts/diff_catalog.py'],
-        capture_output=True, text=True
-    )
-    if diff_result.returncode == 1:
+    diff_code, diff_stdout, diff_stderr = diff_stage(ctx, in_process)
+    if diff_code == 1:
         # Script detected suspicious changes
         with open('change_summary.md', 'w') as f:
-            f.write(diff_result.stdout)
+            f.write(diff_stdout)
         with open('.diff_exit_code', 'w') as f:
             f.write('1')
-        print(diff_result.stdout)
+        print(diff_stdout)
         print("Build will continue, but the deployment workflow will flag this for review.")
-    elif diff_result.returncode == 0:
+    elif diff_code == 0:
         # Normal changes
         with open('change_summary.md', 'w') as f:
-            f.write(diff_result.stdout)
+            f.write(diff_stdout)
         with open('.diff_exit_code', 'w') as f:
             f.write('0')
-        print(diff_result.stdout)
+        print(diff_stdout)
     else:
         # Script crashed -- treat as safe to avoid blocking deploys, but warn
-        print(f"Warning: diff_catalog.py exited with code {diff_result.returncode}")
-        if diff_result.stderr:
-            print(f"  stderr: {diff_result.stderr.strip()}")
+        print(f"Warning: diff_catalog.py exited with code {diff_code}")
+        if diff_stderr:
+            print(f"  stderr: {diff_stderr.strip()}")
         with open('change_summary.md', 'w') as f:
             f.write("## Sheet Update Summary\n\nChange detection script encountered an error. "
                     "Changes were not analyzed but the build proceeded.\n")
@@ -108,65 +482,107 @@ def main():
 
     # Step 2: Generate insights JSON
     # Read project count from catalog.json
-    import json
     try:
-        with open('public/data/catalog.json', 'r') as f:
-            catalog = json.load(f)
-            project_count = catalog['stats']['total_projects']
+        project_count = ctx.catalog['stats']['total_projects']
     except:
         project_count = 60  # Fallback
     
-    if not run_command(
+    if not run_stage(
+        'insights',
         [PYTHON, 'scripts/generate_insights_data.py', '--project-count', str(project_count)],
-        "Generating insights data (JSON)"
+        "Generating insights data (JSON)",
+        manifest, force, inproc(insights_stage, project_count)
     ):
         sys.exit(1)
     
     # Step 3: Download placeholder images for projects without images
-    # Runs only when API keys are available (via env vars or .env file)
-    images_before = snapshot_project_images()
+    # Runs only when API keys are available (via env vars or .env file). Bounded
+    # by wall-clock time rather than project count: the downloader works through
+    # as many projects as the providers' rate budgets allow in that time and leaves
+    # the rest for the next build.
+    images_before = snapshot_project_images(ctx.project_tree if in_process else None)
 
     print(f"\n{'='*60}")
     print(f"  Downloading placeholder images (if API keys available)")
     print(f"{'='*60}")
     result = subprocess.run(
-        [PYTHON, 'scripts/download_placeholder_images.py', '--limit', '10'],
+        [PYTHON, 'scripts/download_placeholder_images.py', '--time-budget', '180'],
         check=False  # Never fail the build due to image downloads
     )
     if result.returncode != 0:
         print("Warning: Placeholder image download encountered an error (non-fatal)")
 
-    images_after = snapshot_project_images()
+    if in_process:
+        # The downloader wrote under public/projects in its own process.
+        ctx.project_tree.refresh()
+    images_after = snapshot_project_images(ctx.project_tree if in_process else None)
     new_images = images_after - images_before
 
     if new_images:
         print(f"\n{len(new_images)} new placeholder image(s) downloaded.")
         print("Regenerating catalog.json to include new image paths...")
-        if not run_command(
+        run_stage(
+            'derivatives',
+            [PYTHON, 'scripts/image_derivatives.py'],
+            "Generating resized cover images (for new images)",
+            manifest, force, inproc(derivatives_stage)
+        )
+        if not run_stage(
+            'assets',
+            [PYTHON, 'scripts/asset_store.py'],
+            "Storing project assets by content hash (new images)",
+            manifest, force, inproc(assets_stage)
+        ):
+            sys.exit(1)
+        # public/projects changed, so the 'catalog' stage is stale and reruns.
+        if not run_stage(
+            'catalog',
             [PYTHON, 'scripts/generate_catalog_data.py'],
-            "Regenerating catalog data (with new images)"
+            "Regenerating catalog data (with new images)",
+            manifest, force, inproc(generate_catalog_stage)
         ):
             sys.exit(1)
     else:
         print("No new images downloaded; skipping catalog regeneration.")
 
+    # Step 3a: Build the ranked card index (catalog + health) the catalogue page
+    # loads first. After Step 3 for the same reason as the API below, and before
+    # Step 5, which copies public/data/ into docs/.
+    if not run_stage(
+        'index',
+        [PYTHON, 'scripts/catalog_index.py'],
+        "Building ranked catalog index (catalog + health)",
+        manifest, force, inproc(index_stage)
+    ):
+        sys.exit(1)
+
     # Step 3b: Generate the public API from the finished catalog.
     # Must run after Step 3 (which can regenerate catalog.json with new image paths)
     # and before Step 5, which copies public/api/ into docs/ as part of the Vite
     # build. Fatal: a stale API is worse than a failed build, because partners
     # mirror it into their own repositories.
-    if not run_command(
+    if not run_stage(
+        'api',
         [PYTHON, 'scripts/generate_api.py'],
-        "Generating public API (JSON)"
+        "Generating public API (JSON)",
+        manifest, force, inproc(api_stage)
     ):
         sys.exit(1)
 
     # Step 4: Clean stale project directories from docs/
-    # Vite's emptyOutDir:false preserves old dirs; remove any not in public/projects/
+    # Vite's emptyOutDir:false preserves old dirs; remove any not in public/projects/.
+    # The slug-named SEO page dirs of current projects are kept: when the 'seo' stage
+    # is skipped they are the up-to-date pages, and when it runs it rewrites them.
     docs_projects = os.path.join('docs', 'projects')
     public_projects = os.path.join('public', 'projects')
     if os.path.isdir(docs_projects) and os.path.isdir(public_projects):
         source_dirs = set(os.listdir(public_projects))
+        try:
+            with open('public/data/catalog.json', 'r', encoding='utf-8') as f:
+                source_dirs.update(p.get('slug') or p.get('id')
+                                   for p in json.load(f).get('projects', []))
+        except (OSError, ValueError):
+            pass
         stale = [d for d in os.listdir(docs_projects)
                  if os.path.isdir(os.path.join(docs_projects, d)) and d not in source_dirs]
         if stale:
@@ -175,33 +591,63 @@ def main():
                 shutil.rmtree(os.path.join(docs_projects, d))
             print(f"Removed {len(stale)} stale project directories from docs/projects/")
 
+    # The same applies to per-project shards (the API's records and pages, the SPA's
+    # detail files): a record that left the catalogue must stop resolving on the
+    # site too, not linger in docs/. Likewise blobs the asset store pruned.
+    for shard_dir in (os.path.join('docs', 'api'), os.path.join('docs', 'data', 'projects'),
+                      os.path.join('docs', 'blobs')):
+        stale_files = []
+        for root, _dirs, files in os.walk(shard_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                source = os.path.join('public', os.path.relpath(path, 'docs'))
+                if not os.path.exists(source):
+                    stale_files.append(path)
+        for path in stale_files:
+            os.remove(path)
+        if stale_files:
+            print(f"Removed {len(stale_files)} stale file(s) from {shard_dir}/")
+
     # Step 5: Build React application
-    if not run_command(
+    if not run_stage(
+        'vite',
         ['npm', 'run', 'build'],
-        "Building React application (Vite)"
+        "Building React application (Vite)",
+        manifest, force
     ):
         sys.exit(1)
 
-    # Step 6: Generate per-project SEO pages + sitemap.xml + robots.txt (non-fatal).
+    # Step 5b: Vite copied all of public/projects/ into docs/ again. The catalogue
+    # points at docs/blobs/ now, so drop the per-project image copies from the
+    # deploy (their blobs are checked to be present first). docs/blobs/ itself is
+    # git-ignored; the Pages deploy job writes it again from the manifest.
+    from asset_store import prune_docs_copies
+    pruned = prune_docs_copies()
+    if pruned:
+        print(f"Removed {pruned} image copies from docs/projects/ (served from docs/blobs/)")
+
+    # Step 6: Generate per-project SEO pages + sitemap.xml + robots.txt.
     # Must run after Step 5 (needs docs/assets/) and after Step 4's cleanup, so the
     # slug-named page directories survive in the final committed output.
-    if not run_command(
+    if not run_stage(
+        'seo',
         [PYTHON, 'scripts/generate_seo_pages.py'],
-        "Generating SEO pages (per-project HTML + sitemap)"
+        "Generating SEO pages (per-project HTML + sitemap)",
+        manifest, force, inproc(seo_stage)
     ):
-        # Fatal: Step 4 already removed the per-project page dirs, so a failed
-        # regeneration would deploy a site with no project pages and a stale sitemap.
-        # Fail the build rather than ship that broken state.
+        # Fatal: Step 4 already removed the page dirs of removed projects, so a failed
+        # regeneration would deploy a site whose pages and sitemap disagree with the
+        # catalog. Fail the build rather than ship that broken state.
         sys.exit(1)
 
     # Step 7: Confirm every built page head carries the same CSP and analytics tag.
     # Must run last, on the finished docs/. Fatal: a CSP that blocks the analytics
     # script on some pages, or a missing tag, reports as "those pages get no traffic"
     # and nothing else anywhere would flag it.
-    if not run_command(
-        [PYTHON, 'scripts/check_head_parity.py'],
-        "Checking page head parity (CSP + analytics)"
-    ):
+    head_parity_cmd = [PYTHON, 'scripts/check_head_parity.py']
+    description = "Checking page head parity (CSP + analytics)"
+    if not (run_function(inproc(head_parity_stage), description) if in_process
+            else run_command(head_parity_cmd, description)):
         sys.exit(1)
 
     print("\n" + "="*60)
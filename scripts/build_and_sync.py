@@ -7,10 +7,10 @@ import pandas as pd
 import gspread
 import sys
 import re
-import csv
 import json
 from thefuzz import process, fuzz
-from utils import normalize_for_directory, resolve_project_id, PROJECTS_DIR, GOOGLE_SHEET_ID, GOOGLE_SHEET_GID, DEFAULT_CREDENTIALS_PATH
+from sheet_snapshot import take_snapshot, new_run_id, RUN_ENV
+from utils import load_sheet, write_sheet_cache, normalize_for_directory, resolve_project_id, ProjectTree, PROJECTS_DIR, GOOGLE_SHEET_ID, GOOGLE_SHEET_GID, DEFAULT_CREDENTIALS_PATH
 
 # Parse command line arguments
 parser = argparse.ArgumentParser(description='Fetch data from Google Sheets and build the website.')
@@ -18,7 +18,7 @@ parser.add_argument('--output', type=str, default="docs/data_catalog.xlsx", help
 parser.add_argument('--credentials', type=str, default=DEFAULT_CREDENTIALS_PATH, help='Path to the Google Sheets API credentials file')
 parser.add_argument('--backup', action='store_true', help='Create a backup of the existing Excel file')
 parser.add_argument('--skip-fetch', action='store_true', help='Skip fetching data from Google Sheets and just build the website')
-parser.add_argument('--backup-dir', type=str, default="data_sources/google_sheets_backup", help='Directory to save raw Google Sheet backups')
+parser.add_argument('--backup-dir', type=str, default="data_sources/google_sheets_backup", help='Directory for the sheet snapshots (raw backups)')
 args = parser.parse_args()
 
 # Create a backup of the existing Excel file only if explicitly requested
@@ -33,51 +33,47 @@ if args.backup and os.path.exists(args.output) and not args.skip_fetch:
 
 
 # Helper function to find existing directory that matches a row
-def find_existing_directory_for_row(row, projects_dir):
+def find_existing_directory_for_row(row, projects_dir, tree=None):
     """
     Find existing directory that matches this row.
     Tries multiple strategies:
     1. Match by Project ID
     2. Match by checking .txt title files in directories
     Returns directory name if found, None otherwise.
+
+    tree is a ProjectTree of projects_dir. This runs once per sheet row and used to
+    list every project directory each time; with the index, an ID or an exact title
+    match is a dictionary hit and only the substring fallback walks the (in-memory)
+    title stems.
     """
+    tree = tree or ProjectTree(projects_dir)
     project_id = row.get('Project ID', '')
     
     # Strategy 1: Match by Project ID
     if project_id and not pd.isna(project_id):
         normalized_id = normalize_for_directory(str(project_id))
-        dir_path = os.path.join(projects_dir, normalized_id)
-        if os.path.exists(dir_path) and os.path.isdir(dir_path):
+        if normalized_id in tree:
             return normalized_id
     
     # Strategy 2: Match by .txt title file
-    # Check all existing directories for matching title files
-    if os.path.exists(projects_dir):
-        for dir_name in os.listdir(projects_dir):
-            dir_path = os.path.join(projects_dir, dir_name)
-            if not os.path.isdir(dir_path):
-                continue
-            
-            # Check .txt files in directory
-            try:
-                txt_files = [f for f in os.listdir(dir_path) if f.endswith('.txt') and os.path.isfile(os.path.join(dir_path, f))]
-                for txt_file in txt_files:
-                    txt_name = normalize_for_directory(txt_file[:-4])
-                    
-                    # Check if this matches any title in the row
-                    dataset_title = row.get('Dataset Speaking Titles', '')
-                    usecase_title = row.get('Use Case Speaking Title', '')
-                    onsite_name = row.get('OnSite Name', '')
-                    
-                    for title_field in [dataset_title, usecase_title, onsite_name]:
-                        if title_field and not pd.isna(title_field):
-                            normalized_title = normalize_for_directory(str(title_field))
-                            # Match if txt file name matches title (exact or substring match)
-                            if txt_name == normalized_title or (txt_name and normalized_title and (txt_name in normalized_title or normalized_title in txt_name)):
-                                return dir_name
-            except OSError:
-                # Skip directories we can't read
-                continue
+    normalized_titles = []
+    for col in ['Dataset Speaking Titles', 'Use Case Speaking Title', 'OnSite Name']:
+        title_field = row.get(col, '')
+        if title_field and not pd.isna(title_field):
+            normalized_title = normalize_for_directory(str(title_field))
+            if normalized_title:
+                normalized_titles.append(normalized_title)
+
+    for normalized_title in normalized_titles:
+        dirs = tree.dirs_with_stem(normalized_title)
+        if dirs:
+            return dirs[0]
+
+    # Fallback: title file name and title contain one another (title edited slightly)
+    for dir_name, txt_name in tree.stems():
+        for normalized_title in normalized_titles:
+            if txt_name in normalized_title or normalized_title in txt_name:
+                return dir_name
     
     return None
 
@@ -86,35 +82,6 @@ def find_existing_directory_for_row(row, projects_dir):
 FUZZY_MIGRATE_MIN_SCORE = 90
 
 
-def _project_root_txt_stems(project_root):
-    """Normalized stems from *.txt title marker files in project root (not subdirs)."""
-    stems = set()
-    if not os.path.isdir(project_root):
-        return stems
-    try:
-        for name in os.listdir(project_root):
-            path = os.path.join(project_root, name)
-            if os.path.isfile(path) and name.lower().endswith('.txt'):
-                stem = normalize_for_directory(name[:-4])
-                if stem:
-                    stems.add(stem)
-    except OSError:
-        pass
-    return stems
-
-
-def _documents_dir_has_files(documents_path):
-    if not os.path.isdir(documents_path):
-        return False
-    try:
-        for _root, _dirs, files in os.walk(documents_path):
-            if files:
-                return True
-    except OSError:
-        pass
-    return False
-
-
 def _unique_filename_in_dir(dest_dir, filename):
     """Avoid overwriting when merging migrated files."""
     dest = os.path.join(dest_dir, filename)
@@ -149,7 +116,7 @@ def _merge_documents_tree(src_documents, dest_documents):
                 shutil.move(src_path, dest_sub)
 
 
-def _find_migration_target_for_orphan(orphan_name, correct_dirs, public_projects_dir):
+def _find_migration_target_for_orphan(orphan_name, correct_dirs, tree):
     """
     Conservative target resolution:
     1) Title-file overlap: unique candidate whose root .txt stems overlap orphan's root .txt stems.
@@ -159,15 +126,13 @@ def _find_migration_target_for_orphan(orphan_name, correct_dirs, public_projects
     if not candidates:
         return None
 
-    orphan_path = os.path.join(public_projects_dir, orphan_name)
-    orphan_stems = _project_root_txt_stems(orphan_path)
+    orphan_stems = tree.txt_stems(orphan_name)
 
     # 1) Title-file stem overlap (unique match only)
     if orphan_stems:
         overlap_matches = []
         for c in candidates:
-            c_path = os.path.join(public_projects_dir, c)
-            c_stems = _project_root_txt_stems(c_path)
+            c_stems = tree.txt_stems(c)
             if orphan_stems & c_stems:
                 overlap_matches.append(c)
         if len(overlap_matches) == 1:
@@ -182,8 +147,7 @@ def _find_migration_target_for_orphan(orphan_name, correct_dirs, public_projects
     # 2) Fuzzy match on directory name and title stems (unique best, score >= FUZZY_MIGRATE_MIN_SCORE)
     scores = []
     for c in candidates:
-        c_path = os.path.join(public_projects_dir, c)
-        c_stems = _project_root_txt_stems(c_path)
+        c_stems = tree.txt_stems(c)
         s_dir = fuzz.ratio(orphan_name, c) if c else 0
         s_stems = max((fuzz.ratio(orphan_name, s) for s in c_stems), default=0)
         best = max(s_dir, s_stems)
@@ -241,14 +205,20 @@ def create_project_directories(df):
     # Create the projects directory if it doesn't exist
     if not os.path.exists(public_projects_dir):
         os.makedirs(public_projects_dir)
+
+    # One index of the projects directory for the whole sync; every rename, new
+    # directory and title file below re-indexes just the project it touched.
+    tree = ProjectTree(public_projects_dir)
     
     # Iterate through each row in the dataframe
     for index, row in df.iterrows():
         # --- Find existing directory for this row (if any) ---
-        existing_dir = find_existing_directory_for_row(row, public_projects_dir)
+        existing_dir = find_existing_directory_for_row(row, public_projects_dir, tree)
         
         # --- Resolve Project ID with smart fallback logic ---
-        dir_name, id_source, error_msg = resolve_project_id(row, projects_dir=public_projects_dir, row_idx=index)
+        dir_name, id_source, error_msg = resolve_project_id(
+            row, projects_dir=public_projects_dir, row_idx=index, tree=tree
+        )
         if error_msg:
             print(f"ERROR: {error_msg}")
             continue
@@ -268,6 +238,8 @@ def create_project_directories(df):
                 # Rename the directory
                 try:
                     shutil.move(old_path, new_path)
+                    tree.discard(existing_dir)
+                    tree.refresh_project(dir_name)
                     print(f"Renamed directory: '{existing_dir}' -> '{dir_name}' (title changed)")
                 except Exception as e:
                     print(f"ERROR renaming '{existing_dir}' to '{dir_name}': {e}")
@@ -369,6 +341,8 @@ def create_project_directories(df):
                     # Less verbose logging
                     # print(f"Skipping file {filename} for row {index}: Column '{column}' not found.")
                     pass # Silently skip if column doesn't exist
+
+            tree.refresh_project(dir_name)
         else:
             # Skipped because no resolved ID or no real title was found
             if dir_name:
@@ -379,30 +353,32 @@ def create_project_directories(df):
     # Get all directories that SHOULD exist based on current data
     correct_dirs = set()
     for idx, row in df.iterrows():
-        resolved_dir, _, _ = resolve_project_id(row, projects_dir=public_projects_dir, row_idx=idx)
+        resolved_dir, _, _ = resolve_project_id(
+            row, projects_dir=public_projects_dir, row_idx=idx, tree=tree
+        )
         if resolved_dir:
             correct_dirs.add(resolved_dir)
     
     # Find and remove orphaned directories
     if os.path.exists(public_projects_dir):
-        existing_dirs = set(d for d in os.listdir(public_projects_dir) 
-                          if os.path.isdir(os.path.join(public_projects_dir, d)))
+        existing_dirs = tree.names()
         orphaned_dirs = existing_dirs - correct_dirs
         
         if orphaned_dirs:
             print(f"Cleaning up {len(orphaned_dirs)} orphaned directories...")
             for orphan in orphaned_dirs:
                 orphan_path = os.path.join(public_projects_dir, orphan)
-                docs_path = os.path.join(orphan_path, 'documents')
                 try:
-                    if _documents_dir_has_files(docs_path):
+                    if tree.documents(orphan, include_hidden=True):
                         target = _find_migration_target_for_orphan(
-                            orphan, correct_dirs, public_projects_dir
+                            orphan, correct_dirs, tree
                         )
                         if target:
                             _migrate_orphan_documents_then_remove(
                                 orphan, target, public_projects_dir
                             )
+                            tree.refresh_project(orphan)
+                            tree.refresh_project(target)
                         else:
                             print(
                                 f"  WARNING: Orphan '{orphan}' has files in documents/ but no safe "
@@ -410,6 +386,7 @@ def create_project_directories(df):
                             )
                     else:
                         shutil.rmtree(orphan_path)
+                        tree.discard(orphan)
                         print(f"  Removed orphaned directory: {orphan}")
                 except Exception as e:
                     print(f"  Error processing orphan {orphan}: {e}")
@@ -423,30 +400,15 @@ if not args.skip_fetch:
         _client, spreadsheet, sheet = get_gsheet_client(args.credentials)
         print(f"Successfully connected to sheet: {sheet.title}")
         
-        # Get all values
-        all_values = sheet.get_all_values()
+        # Get all values. The snapshot is also the raw backup, and the later steps
+        # of this run (validate_data.py's note write-back) read it instead of
+        # fetching the sheet again: they inherit the run id set here.
+        os.environ.setdefault(RUN_ENV, new_run_id())
+        all_values = take_snapshot(sheet, args.backup_dir)['values']
         actual_headers = all_values[0]
         # Skip the second row (index 1) which contains explanations
         data = all_values[2:]
 
-        # --- Start: Backup raw data ---
-        if all_values:
-            backup_dir = args.backup_dir
-            os.makedirs(backup_dir, exist_ok=True)
-            # Use full timestamp so multiple builds per day each get a backup
-            current_date_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"sheet_backup_{current_date_str}.csv"
-            backup_filepath = os.path.join(backup_dir, backup_filename)
-
-            try:
-                with open(backup_filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerows(all_values)
-                print(f"Successfully backed up raw sheet data to {backup_filepath}")
-            except Exception as backup_e:
-                print(f"Error writing backup CSV file: {backup_e}")
-        # --- End: Backup raw data ---
-
         # Define the canonical column names used by scripts and potential aliases in the sheet
         CANONICAL_COLUMN_MAP = {
             # Canonical Name: [List of potential aliases in Google Sheet]
@@ -628,6 +590,16 @@ if not args.skip_fetch:
         # Save to Excel
         df.to_excel(args.output, index=False)
         print(f"Successfully saved data to {args.output}")
+        # Emit the columnar copy the build's readers load instead of the workbook.
+        # It is read back from the file just written, so it holds exactly what
+        # read_excel returns (NaN for blank cells, Excel's typing), not the raw grid.
+        # The copy is only an accelerator: when it cannot be written (pyarrow
+        # rejecting a column that mixes numbers and text, a full disk, ...) readers
+        # fall back to the workbook, so it must not abort the sync.
+        try:
+            write_sheet_cache(pd.read_excel(args.output), args.output)
+        except Exception as e:
+            print(f"  Note: could not write the columnar sheet copy ({e})")
         
         # Create project directories
         create_project_directories(df)
@@ -649,7 +621,7 @@ if not args.skip_fetch:
 else:
     # If skipping fetch, still create project directories from the existing Excel file
     try:
-        df = pd.read_excel(args.output)
+        df = load_sheet(args.output)
         create_project_directories(df)
     except Exception as e:
         print(f"Error reading Excel file: {e}")
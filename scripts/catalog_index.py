@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Build public/data/catalog-index.json, the one payload the catalog page loads.
+
+catalog.json is complete but mostly prose that only the detail panel shows (the
+panel fetches public/data/projects/<id>.json instead). The index keeps just the
+fields that cards, filters and the result stats use, merges each project's weekly
+health.json entry under `health`, and lists the projects already in rank order.
+The browser used to fetch both files, join them by id and sort on every load; now
+it renders the list as shipped.
+
+Health changes weekly and the catalog whenever the sheet is synced, so this runs in
+both places: as build.py's 'index' stage after generate_catalog_data.py, and at the
+end of health_check.py for the copies it publishes.
+
+rank_score() mirrors rankScore() in src/utils/ranking.js (the weights and the
+method are documented in docs/health-thresholds.md). check_parity.py diffs the two
+over the live catalog, so a change to either has to be made in both.
+"""
+
+import argparse
+import json
+import os
+
+from utils import SERVED_JSON_SEPARATORS
+
+DATA_DIR = os.path.join('public', 'data')
+CATALOG_PATH = os.path.join(DATA_DIR, 'catalog.json')
+HEALTH_PATH = os.path.join(DATA_DIR, 'health.json')
+INDEX_PATH = os.path.join(DATA_DIR, 'catalog-index.json')
+
+INDEX_FIELDS = [
+    'id', 'slug', 'title', 'sdgs', 'countries', 'data_types', 'maturity',
+    'maturity_tags', 'quality_score', 'image', 'license', 'has_dataset',
+    'has_usecase', 'is_lacuna', 'has_access_note',
+]
+# Keep in sync with maxLength in src/components/ProjectCard.jsx.
+CARD_SUMMARY_CHARS = 160
+
+# Keep in sync with src/utils/ranking.js.
+# Max boost a maximally active project earns, in quality-score points.
+ACTIVITY_WEIGHT = 40
+# Demotion applied when health.availability is 'unavailable'.
+UNAVAILABLE_PENALTY = 20
+
+
+def rank_score(project):
+    """Sort key for a catalog card: quality_score adjusted by its health entry."""
+    score = project.get('quality_score') or 0
+    health = project.get('health')
+    if health:
+        if health.get('availability') == 'unavailable':
+            score -= UNAVAILABLE_PENALTY
+        activity = health.get('activity_score')
+        if isinstance(activity, (int, float)) and not isinstance(activity, bool):
+            score += (activity / 100) * ACTIVITY_WEIGHT
+    return score
+
+
+def card_summary(description):
+    """The card's two-line description, truncated exactly as ProjectCard.jsx does."""
+    if not description or len(description) <= CARD_SUMMARY_CHARS:
+        return description
+    return description[:CARD_SUMMARY_CHARS].rstrip() + '…'
+
+
+def image_variants(srcset):
+    """The card's compact form of a project's image_srcset, or None without one.
+
+    The full srcset spells out a URL, width and height per variant and per type, and
+    is most of an entry's size. Every variant is <hash>-<width>.<ext> under
+    /img/derived/ (image_derivatives.variant_name) and each type comes in the same
+    widths, so the hash, the widths and the types are enough for expandVariants() in
+    src/utils/images.js to rebuild the URLs. The detail panel reads the full form
+    from projects/<id>.json.
+    """
+    sources = [s for s in (srcset or {}).get('sources') or [] if s.get('srcset')]
+    if not sources:
+        return None
+    variants = sources[0]['srcset']
+    return {
+        'hash': variants[0]['url'].rsplit('/', 1)[-1].split('-', 1)[0],
+        'widths': [v['width'] for v in variants],
+        'types': [s['type'] for s in sources],
+    }
+
+
+def index_entry(project, health=None):
+    """Slim list-view record of one catalog project (see INDEX_FIELDS)."""
+    entry = {key: project.get(key) for key in INDEX_FIELDS}
+    entry['image_variants'] = image_variants(project.get('image_srcset'))
+    entry['summary'] = card_summary(project.get('description'))
+    entry['dataset_link_count'] = len(project.get('dataset_links') or [])
+    entry['usecase_link_count'] = len(project.get('usecase_links') or [])
+    entry['health'] = health
+    return entry
+
+
+def load_health_entries(path=HEALTH_PATH):
+    """health.json's entries by project id; empty when the file is missing or bad.
+
+    Health is additive: without it every project ranks on quality_score alone.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('entries') or {}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def build_index(catalog, health_entries):
+    """The index document: catalog-level keys plus ranked slim entries."""
+    index = {key: value for key, value in catalog.items() if key != 'projects'}
+    entries = [index_entry(p, health_entries.get(p.get('id'))) for p in catalog['projects']]
+    # Stable sort, like Array.prototype.sort: equal scores keep catalog order.
+    index['projects'] = sorted(entries, key=rank_score, reverse=True)
+    return index
+
+
+def generate_index(catalog=None, catalog_path=CATALOG_PATH, health_path=HEALTH_PATH,
+                   output_path=INDEX_PATH):
+    """Write the index for catalog (read from catalog_path when not given)."""
+    if catalog is None:
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            catalog = json.load(f)
+    health_entries = load_health_entries(health_path)
+    index = build_index(catalog, health_entries)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=SERVED_JSON_SEPARATORS, ensure_ascii=False)
+    with_health = sum(1 for p in index['projects'] if p['health'])
+    print(f"Wrote {output_path} ({len(index['projects'])} projects, "
+          f"{with_health} with health, ranked)")
+    return index
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Build the ranked list index (catalog-index.json) from catalog.json and health.json.')
+    parser.add_argument('--catalog', default=CATALOG_PATH, help='Path to catalog.json')
+    parser.add_argument('--health', default=HEALTH_PATH, help='Path to health.json')
+    parser.add_argument('--output', default=INDEX_PATH, help='Path to write the index')
+    cli_args = parser.parse_args()
+    generate_index(catalog_path=cli_args.catalog, health_path=cli_args.health,
+                   output_path=cli_args.output)
@@ -10,6 +10,11 @@ implementations of one rule will drift, and drift here changes what readers see
 and what partners mirror -- so this diffs them over every URL in the catalog plus
 the edge cases the live data does not happen to cover.
 
+The card ranking has the same shape: catalog_index.py sorts catalog-index.json at
+build time with rank_score(), and src/utils/ranking.js keeps rankScore() as the
+documented twin. Both are run over every indexed project (with its health entry)
+plus the edge cases below.
+
 Usage:
     python scripts/check_parity.py          # exits non-zero on any mismatch
 
@@ -24,9 +29,11 @@ import subprocess
 import sys
 
 from text_parsing import label_from_url, license_label, first_url
+from catalog_index import build_index, load_health_entries, rank_score
 
 CATALOG_PATH = os.path.join("public", "data", "catalog.json")
 PARSING_JS = os.path.abspath(os.path.join("src", "utils", "parsing.js"))
+RANKING_JS = os.path.abspath(os.path.join("src", "utils", "ranking.js"))
 
 # Shapes the catalog may not contain today but the rules must still agree on.
 # The malformed ones matter as much as the tidy ones: Python's urlparse accepts hosts
@@ -60,14 +67,29 @@ EXTRA_LICENSES = ["4.0", "1.0", "", "CC-BY 4.0", "https://example.com/",
                   "https://ex%mple.com/",            # malformed escape in the host
                   "https:///path"]
 
+# Health shapes for the ranking: missing, partial, penalised, boosted, zero scores.
+EXTRA_RANK_CASES = [
+    {},
+    {"quality_score": 55},
+    {"quality_score": 55, "health": None},
+    {"quality_score": 55, "health": {"availability": "unavailable"}},
+    {"quality_score": 55, "health": {"availability": "available", "activity_score": 0}},
+    {"quality_score": 55, "health": {"availability": "available", "activity_score": 100}},
+    {"quality_score": 0, "health": {"availability": "unavailable", "activity_score": 37.5}},
+    {"quality_score": 93, "health": {"availability": "available", "activity_score": None}},
+    {"health": {"activity_score": 66.7}},
+]
+
 NODE_SCRIPT = """
 import {{ readFileSync }} from 'fs'
 import {{ labelFromUrl, licenseLabel, firstUrl }} from '{parsing_js}'
-const {{ urls, licenses }} = JSON.parse(readFileSync(0, 'utf8'))
+import {{ rankScore }} from '{ranking_js}'
+const {{ urls, licenses, projects }} = JSON.parse(readFileSync(0, 'utf8'))
 process.stdout.write(JSON.stringify({{
   labelFromUrl: urls.map(labelFromUrl),
   licenseLabel: licenses.map(licenseLabel),
   firstUrl: licenses.map(firstUrl),
+  rankScore: projects.map(rankScore),
 }}))
 """
 
@@ -86,22 +108,23 @@ def collect_inputs(catalog):
     return sorted(urls), sorted(licenses)
 
 
-def main():
+def main(catalog=None):
     if not shutil.which("node"):
         print("check_parity: node not found, skipping")
         return 0
-    if not os.path.exists(CATALOG_PATH):
-        print(f"check_parity: {CATALOG_PATH} not found, run generate_catalog_data.py first")
-        return 1
-
-    with open(CATALOG_PATH, "r", encoding="utf-8") as f:
-        catalog = json.load(f)
+    if catalog is None:
+        if not os.path.exists(CATALOG_PATH):
+            print(f"check_parity: {CATALOG_PATH} not found, run generate_catalog_data.py first")
+            return 1
+        with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+            catalog = json.load(f)
     urls, licenses = collect_inputs(catalog)
+    projects = build_index(catalog, load_health_entries())["projects"] + EXTRA_RANK_CASES
 
     result = subprocess.run(
         ["node", "--input-type=module", "-e",
-         NODE_SCRIPT.format(parsing_js=PARSING_JS)],
-        input=json.dumps({"urls": urls, "licenses": licenses}),
+         NODE_SCRIPT.format(parsing_js=PARSING_JS, ranking_js=RANKING_JS)],
+        input=json.dumps({"urls": urls, "licenses": licenses, "projects": projects}),
         capture_output=True, text=True,
     )
     if result.returncode != 0:
@@ -113,11 +136,15 @@ def main():
         ("labelFromUrl", label_from_url, urls, js["labelFromUrl"]),
         ("licenseLabel", license_label, licenses, js["licenseLabel"]),
         ("firstUrl", first_url, licenses, js["firstUrl"]),
+        ("rankScore", rank_score, projects, js["rankScore"]),
     ]
 
     mismatches = 0
     for name, py_fn, inputs, expected in cases:
         bad = [(i, e, py_fn(i)) for i, e in zip(inputs, expected) if py_fn(i) != e]
+        if name == "rankScore":
+            # Report the project, not the whole index entry.
+            bad = [(i.get("id", i), e, got) for i, e, got in bad]
         print(f"  {'OK  ' if not bad else 'FAIL'} {name}: "
               f"{len(inputs) - len(bad)}/{len(inputs)} match")
         for value, want, got in bad[:10]:
@@ -126,7 +153,8 @@ def main():
 
     if mismatches:
         print(f"\ncheck_parity: {mismatches} mismatch(es). scripts/text_parsing.py and "
-              f"src/utils/parsing.js must agree -- they label the same links.")
+              f"src/utils/parsing.js must agree -- they label the same links -- as must "
+              f"scripts/catalog_index.py and src/utils/ranking.js, which rank the cards.")
         return 1
     print("\ncheck_parity: python and javascript agree")
     return 0
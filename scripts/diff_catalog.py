@@ -65,12 +65,16 @@ def diff_catalogs(old_catalog, new_catalog):
     common_ids = old_ids & new_ids
 
     # Detect changes in common projects
+    changed = []
     title_changes = []
     link_changes = []
     for pid in sorted(common_ids):
         old_p = old_catalog[pid]
         new_p = new_catalog[pid]
 
+        if old_p != new_p:
+            changed.append(pid)
+
         if old_p.get('title') != new_p.get('title'):
             title_changes.append((pid, old_p.get('title', ''), new_p.get('title', '')))
 
@@ -83,6 +87,9 @@ def diff_catalogs(old_catalog, new_catalog):
         'new_count': len(new_catalog),
         'added': [(pid, new_catalog[pid].get('title', pid)) for pid in sorted(added_ids)],
         'removed': [(pid, old_catalog[pid].get('title', pid)) for pid in sorted(removed_ids)],
+        # Ids present on both sides whose record differs in any field. The summary
+        # only reports titles and links; generate_api's changes feed needs all of them.
+        'changed': changed,
         'title_changes': title_changes,
         'link_changes': link_changes,
     }
@@ -151,25 +158,30 @@ def check_suspicious(diff):
     return False
 
 
-def main():
-    old_catalog = load_catalog(OLD_PATH)
-    new_catalog = load_catalog(NEW_PATH)
+def build_report(old_catalog, new_catalog):
+    """Return (markdown report, suspicious) for two id-keyed catalogs.
 
+    The report is exactly what main() prints, so build.py can write it to
+    change_summary.md without running this script as a subprocess.
+    """
     diff = diff_catalogs(old_catalog, new_catalog)
-    summary = format_summary(diff)
+    lines = [format_summary(diff)]
     suspicious = check_suspicious(diff)
 
-    print(summary)
-
     if suspicious:
         removed_pct = len(diff['removed']) / diff['old_count'] * 100
-        print(f'**FLAGGED**: {len(diff["removed"])} projects removed '
-              f'({removed_pct:.1f}% of {diff["old_count"]}), '
-              f'exceeds {REMOVAL_THRESHOLD*100:.0f}% threshold.')
-        print('This PR requires manual review before merging.')
-        sys.exit(1)
+        lines.append(f'**FLAGGED**: {len(diff["removed"])} projects removed '
+                     f'({removed_pct:.1f}% of {diff["old_count"]}), '
+                     f'exceeds {REMOVAL_THRESHOLD*100:.0f}% threshold.')
+        lines.append('This PR requires manual review before merging.')
 
-    sys.exit(0)
+    return '\n'.join(lines) + '\n', suspicious
+
+
+def main():
+    report, suspicious = build_report(load_catalog(OLD_PATH), load_catalog(NEW_PATH))
+    sys.stdout.write(report)
+    sys.exit(1 if suspicious else 0)
 
 
 if __name__ == '__main__':
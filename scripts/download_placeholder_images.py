@@ -7,10 +7,22 @@ Uses curated SDG-based search queries for much better image relevance.
 
 Supports Pexels and Unsplash APIs (both free).
 
+Projects are processed concurrently (--workers). All workers share one request
+budget per provider (PROVIDER_RATES, plus the hourly quota the provider reports
+in its rate-limit headers), and --time-budget caps the run's wall-clock time:
+projects not started by then are left for the next run.
+
+Search result pages are kept in data_sources/http_cache.sqlite for
+SEARCH_CACHE_TTL_HOURS. Projects under the same SDG draw from the same few
+queries in SDG_SEARCH_TERMS, so most searches are answered from the cache; each
+photo on a page is handed to one project only (claim_photo), so those projects
+still get different images.
+
 Usage:
     python download_placeholder_images.py --dry-run                    # preview queries
     python download_placeholder_images.py --force --provider both      # re-download all
     python download_placeholder_images.py --provider unsplash           # unsplash only
+    python download_placeholder_images.py --time-budget 120            # as build.py runs it
 
 Requirements:
     - requests, tqdm, python-dotenv
@@ -24,12 +36,16 @@ import json
 import argparse
 import logging
 import random
+import threading
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from dotenv import load_dotenv
 from urllib.parse import quote_plus
 
+from http_cache import HttpCache, image_search_cache_key
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -178,6 +194,147 @@ DATA_TYPE_MODIFIERS = {
 }
 
 
+# Search requests per second and burst size, per provider, shared by all workers.
+# Both providers also meter by the hour (Pexels 200/h, Unsplash 50/h on a demo
+# key) and report what is left in X-Ratelimit-Remaining; ProviderBudget stops
+# using a provider for the rest of the run once that reaches zero or it answers
+# 429, instead of spending every remaining tier on errors.
+PROVIDER_RATES = {
+    'pexels': (1.0, 3),
+    'unsplash': (0.5, 2),
+}
+# Photo downloads come from the providers' CDNs, which are not metered; this only
+# bounds how many are in flight at once.
+MAX_PARALLEL_DOWNLOADS = 4
+DOWNLOAD_CHUNK = 64 * 1024
+
+
+class ProviderBudget:
+    """Per-provider token buckets, quota state and the run's wall-clock deadline.
+
+    One instance (BUDGET) is shared by every worker thread. acquire() blocks until
+    the provider may be called, and returns False instead when the provider is out
+    of quota or the wait would run past the deadline.
+    """
+
+    def __init__(self, rates=PROVIDER_RATES):
+        self.rates = dict(rates)
+        self.lock = threading.Lock()
+        self.tokens = {name: float(burst) for name, (_rate, burst) in self.rates.items()}
+        self.updated = {name: time.monotonic() for name in self.rates}
+        self.exhausted = set()
+        self.deadline = None
+
+    def set_time_budget(self, seconds):
+        self.deadline = time.monotonic() + seconds if seconds else None
+
+    def time_left(self):
+        return True if self.deadline is None else time.monotonic() < self.deadline
+
+    def available(self, provider):
+        return provider not in self.exhausted
+
+    def acquire(self, provider):
+        rate, burst = self.rates.get(provider, (1.0, 1))
+        while True:
+            with self.lock:
+                if provider in self.exhausted:
+                    return False
+                now = time.monotonic()
+                self.tokens[provider] = min(
+                    float(burst), self.tokens.get(provider, burst) + (now - self.updated[provider]) * rate)
+                self.updated[provider] = now
+                if self.tokens[provider] >= 1:
+                    self.tokens[provider] -= 1
+                    return True
+                wait = (1 - self.tokens[provider]) / rate
+            if self.deadline is not None and time.monotonic() + wait > self.deadline:
+                return False
+            time.sleep(wait)
+
+    def record(self, provider, resp):
+        """Note the quota the provider reported; mark it exhausted when none is left."""
+        remaining = resp.headers.get('X-Ratelimit-Remaining')
+        if resp.status_code == 429 or (remaining is not None and remaining.strip() == '0'):
+            with self.lock:
+                if provider not in self.exhausted:
+                    logger.warning(f"{provider.capitalize()} quota used up; "
+                                   f"no more {provider} searches this run")
+                self.exhausted.add(provider)
+
+
+BUDGET = ProviderBudget()
+_download_slots = threading.BoundedSemaphore(MAX_PARALLEL_DOWNLOADS)
+
+# Stock search results change slowly; a month-old page still holds good photos.
+SEARCH_CACHE_TTL_HOURS = 24 * 30
+# Results per search request (the providers' maxima are 80 and 30). One request
+# buys a page that can serve that many projects.
+PEXELS_PER_PAGE = 40
+UNSPLASH_PER_PAGE = 30
+
+_search_cache = None
+# Guards _search_cache, CLAIMED_PHOTOS and SEARCH_STATS across worker threads.
+_search_lock = threading.Lock()
+# Page URLs of photos in use by a project (or handed to one during this run).
+CLAIMED_PHOTOS = set()
+SEARCH_STATS = {'requests': 0, 'cache_hits': 0}
+
+
+def get_search_cache():
+    """The shared HttpCache holding search result pages, opened on first use."""
+    global _search_cache
+    with _search_lock:
+        if _search_cache is None:
+            _search_cache = HttpCache()
+        return _search_cache
+
+
+def _budgeted_request(provider):
+    """A request function for HttpCache.fetch that spends the provider's budget.
+
+    Returns None (so fetch serves the cached page, however old) when the budget
+    refuses or the request fails outright.
+    """
+    def request(url, headers):
+        if not BUDGET.acquire(provider):
+            return None
+        try:
+            resp = requests.get(url, headers=headers, timeout=15)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"{provider.capitalize()} search request failed: {e}")
+            return None
+        BUDGET.record(provider, resp)
+        with _search_lock:
+            SEARCH_STATS['requests'] += 1
+        return resp
+    return request
+
+
+def cached_search(provider, query, url, headers):
+    """A provider's search result page for query as parsed JSON, or None.
+
+    Pages come from the api_metadata table of http_cache.sqlite when fetched within
+    SEARCH_CACHE_TTL_HOURS; past that (or on a miss) the provider is asked again
+    within the shared budget, and an out-of-budget or failed request falls back to
+    the stored page.
+    """
+    key = image_search_cache_key(provider, query)
+    body, resp = get_search_cache().fetch(key, url, headers, ttl_hours=SEARCH_CACHE_TTL_HOURS,
+                                          request=_budgeted_request(provider))
+    if resp is None and body is not None:
+        with _search_lock:
+            SEARCH_STATS['cache_hits'] += 1
+    elif resp is not None and resp.status_code >= 400:
+        logger.warning(f"{provider.capitalize()} search failed for '{query}': HTTP {resp.status_code}")
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Download placeholder images for data catalog projects.')
     parser.add_argument('--provider', choices=['pexels', 'unsplash', 'both'], default='pexels',
@@ -189,6 +346,11 @@ def parse_arguments():
                         help='Path to catalog JSON (default: public/data/catalog.json)')
     parser.add_argument('--pexels-key', type=str, help='Pexels API key (or set PEXELS_API_KEY)')
     parser.add_argument('--unsplash-key', type=str, help='Unsplash API key (or set UNSPLASH_API_KEY)')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Projects processed in parallel (default: 4)')
+    parser.add_argument('--time-budget', type=float, default=None, metavar='SECONDS',
+                        help='Stop starting new projects after this many seconds; the rest '
+                             'are picked up by the next run (default: no limit)')
     return parser.parse_args()
 
 
@@ -311,111 +473,137 @@ def build_search_query(project_info):
 
 
 def search_pexels(query, api_key):
-    """Search Pexels for landscape images. Returns image info dict or None."""
+    """Landscape photos on Pexels for query, as image info dicts (possibly empty)."""
     encoded = quote_plus(query)
-    url = f"https://api.pexels.com/v1/search?query={encoded}&per_page=15&orientation=landscape"
+    url = f"https://api.pexels.com/v1/search?query={encoded}&per_page={PEXELS_PER_PAGE}&orientation=landscape"
     headers = {"Authorization": api_key}
 
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
-        resp.raise_for_status()
-        photos = resp.json().get('photos', [])
-
+        page = cached_search('pexels', query, url, headers) or {}
         # Filter for reasonable dimensions
-        suitable = [p for p in photos if p['width'] >= 800 and p['height'] >= 400]
-        if not suitable:
-            return None
-
-        selected = random.choice(suitable)
-        return {
-            'download_url': selected['src']['large'],  # 940px wide
-            'page_url': selected['url'],
-            'photographer': selected['photographer'],
-            'photographer_url': selected['photographer_url'],
-            'width': selected['width'],
-            'height': selected['height'],
+        return [{
+            'download_url': p['src']['large'],  # 940px wide
+            'page_url': p['url'],
+            'photographer': p['photographer'],
+            'photographer_url': p['photographer_url'],
+            'width': p['width'],
+            'height': p['height'],
             'provider': 'pexels',
-        }
+        } for p in page.get('photos', []) if p['width'] >= 800 and p['height'] >= 400]
     except Exception as e:
         logger.warning(f"Pexels search failed for '{query}': {e}")
-        return None
+        return []
 
 
 def search_unsplash(query, api_key):
-    """Search Unsplash for landscape images. Returns image info dict or None."""
+    """Landscape photos on Unsplash for query, as image info dicts (possibly empty)."""
     encoded = quote_plus(query)
-    url = f"https://api.unsplash.com/search/photos?query={encoded}&per_page=15&orientation=landscape"
+    url = f"https://api.unsplash.com/search/photos?query={encoded}&per_page={UNSPLASH_PER_PAGE}&orientation=landscape"
     headers = {"Authorization": f"Client-ID {api_key}"}
 
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
-        resp.raise_for_status()
-        results = resp.json().get('results', [])
-
+        page = cached_search('unsplash', query, url, headers) or {}
         # Filter for reasonable dimensions
-        suitable = [r for r in results if r['width'] >= 800 and r['height'] >= 400]
-        if not suitable:
-            return None
-
-        selected = random.choice(suitable)
-        return {
-            'download_url': selected['urls']['regular'],  # 1080px wide
-            'page_url': selected['links']['html'],
-            'photographer': selected['user']['name'],
-            'photographer_url': selected['user']['links']['html'],
-            'width': selected['width'],
-            'height': selected['height'],
+        return [{
+            'download_url': r['urls']['regular'],  # 1080px wide
+            'page_url': r['links']['html'],
+            'photographer': r['user']['name'],
+            'photographer_url': r['user']['links']['html'],
+            'width': r['width'],
+            'height': r['height'],
             'provider': 'unsplash',
-        }
+        } for r in page.get('results', []) if r['width'] >= 800 and r['height'] >= 400]
     except Exception as e:
         logger.warning(f"Unsplash search failed for '{query}': {e}")
-        return None
+        return []
+
+
+def load_claimed_photos(projects_dir=None):
+    """Page URLs of the stock photos projects already use as placeholders."""
+    projects_dir = projects_dir or PROJECTS_DIR
+    claimed = set()
+    for project_dir in os.listdir(projects_dir) if os.path.isdir(projects_dir) else []:
+        path = os.path.join(projects_dir, project_dir, "images", "placeholder_metadata.json")
+        try:
+            with open(path, 'r') as f:
+                url = json.load(f).get('url')
+        except (OSError, ValueError, AttributeError):
+            continue
+        if url:
+            claimed.add(url)
+    return claimed
+
+
+def claim_photo(candidates, allow_reuse=False):
+    """Pick a random candidate no other project uses yet and reserve it.
 
+    Projects sharing an SDG often search the same query and read the same cached
+    page; claiming keeps them from all getting the same photo. With allow_reuse a
+    used photo is returned when every candidate is taken.
+    """
+    with _search_lock:
+        unused = [c for c in candidates if c['page_url'] not in CLAIMED_PHOTOS]
+        if not unused and not (allow_reuse and candidates):
+            return None
+        selected = random.choice(unused or candidates)
+        CLAIMED_PHOTOS.add(selected['page_url'])
+        return selected
 
-def search_images(query, provider, pexels_key, unsplash_key):
-    """Search for images using the specified provider(s)."""
+
+def search_images(query, provider, pexels_key, unsplash_key, allow_reuse=False):
+    """Search for images using the specified provider(s) and claim one.
+
+    Returns an image info dict, or None when no suitable photo is left for query
+    (see claim_photo).
+    """
     if provider == 'pexels' and pexels_key:
-        return search_pexels(query, pexels_key)
+        return claim_photo(search_pexels(query, pexels_key), allow_reuse)
     elif provider == 'unsplash' and unsplash_key:
-        return search_unsplash(query, unsplash_key)
+        return claim_photo(search_unsplash(query, unsplash_key), allow_reuse)
     elif provider == 'both':
         # Try Pexels first, fall back to Unsplash
         if pexels_key:
-            result = search_pexels(query, pexels_key)
+            result = claim_photo(search_pexels(query, pexels_key), allow_reuse)
             if result:
                 return result
         if unsplash_key:
-            return search_unsplash(query, unsplash_key)
+            return claim_photo(search_unsplash(query, unsplash_key), allow_reuse)
     return None
 
 
 def download_image(image_info, project_dir, query):
-    """Download an image and save it with metadata."""
+    """Download an image and save it with metadata.
+
+    The photo is streamed to a temporary file and only replaces the project's old
+    placeholder once it arrived in full, so a timeout leaves the previous image.
+    """
     if not image_info or not image_info.get('download_url'):
         return False
 
     images_dir = os.path.join(PROJECTS_DIR, project_dir, "images")
     os.makedirs(images_dir, exist_ok=True)
 
-    # Remove old placeholder if exists
-    for old in os.listdir(images_dir):
-        if old.startswith('placeholder_'):
-            os.remove(os.path.join(images_dir, old))
-
     # Determine file extension from URL
     download_url = image_info['download_url']
     ext_match = re.search(r'\.(jpe?g|png|webp)', download_url.split('?')[0], re.IGNORECASE)
     file_ext = f".{ext_match.group(1)}" if ext_match else '.jpg'
     filename = f"placeholder_image{file_ext}"
     filepath = os.path.join(images_dir, filename)
+    partial = os.path.join(images_dir, ".download.part")
 
     try:
-        resp = requests.get(download_url, stream=True, timeout=30)
-        resp.raise_for_status()
-
-        with open(filepath, 'wb') as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
+        with _download_slots:
+            with requests.get(download_url, stream=True, timeout=30) as resp:
+                resp.raise_for_status()
+                with open(partial, 'wb') as f:
+                    for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK):
+                        f.write(chunk)
+
+        # Remove old placeholder if exists
+        for old in os.listdir(images_dir):
+            if old.startswith('placeholder_'):
+                os.remove(os.path.join(images_dir, old))
+        os.replace(partial, filepath)
 
         # Save metadata with attribution
         metadata = {
@@ -437,6 +625,8 @@ def download_image(image_info, project_dir, query):
         return True
     except Exception as e:
         logger.error(f"Error downloading image for {project_dir}: {e}")
+        if os.path.exists(partial):
+            os.remove(partial)
         return False
 
 
@@ -448,6 +638,48 @@ def find_project_info(project_dir, catalog_projects):
     return None
 
 
+def providers_for(provider):
+    return ['pexels', 'unsplash'] if provider == 'both' else [provider]
+
+
+def acquire_image(project_dir, queries, provider, pexels_key, unsplash_key):
+    """Search the query tiers for one project and download the first hit.
+
+    Returns 'downloaded', 'failed', or 'deferred' when the time budget or every
+    provider's quota ran out before the project could be served; deferred projects
+    still have no image, so the next run picks them up.
+    """
+    def out_of_budget():
+        return not BUDGET.time_left() or not any(
+            BUDGET.available(p) for p in providers_for(provider))
+
+    if out_of_budget():
+        return 'deferred'
+    image_info = None
+    used_query = None
+    for i, query in enumerate(queries):
+        logger.info(f"[{project_dir}] Tier {i+1} query: '{query}'")
+        image_info = search_images(query, provider, pexels_key, unsplash_key)
+        if image_info:
+            used_query = query
+            break
+        if out_of_budget():
+            return 'deferred'
+    if not image_info:
+        # Every photo found is already some other project's; a shared photo beats
+        # none. The pages are cached by now, so this costs no quota.
+        for query in queries:
+            image_info = search_images(query, provider, pexels_key, unsplash_key, allow_reuse=True)
+            if image_info:
+                used_query = query
+                break
+
+    if not image_info:
+        logger.warning(f"No image found for {project_dir} after all tiers")
+        return 'failed'
+    return 'downloaded' if download_image(image_info, project_dir, used_query) else 'failed'
+
+
 def main():
     args = parse_arguments()
 
@@ -482,8 +714,9 @@ def main():
     success_count = 0
     skip_count = 0
     fail_count = 0
+    jobs = []
 
-    for project_dir in tqdm(project_dirs, desc="Processing projects"):
+    for project_dir in project_dirs:
         # Skip projects with custom (non-placeholder) images
         if has_custom_image(project_dir):
             logger.debug(f"Skipping {project_dir} - has custom image")
@@ -513,34 +746,43 @@ def main():
             print(f"  Queries: {queries}")
             continue
 
-        # Try each query tier until we get a result
-        image_info = None
-        used_query = None
-        for i, query in enumerate(queries):
-            logger.info(f"[{project_dir}] Tier {i+1} query: '{query}'")
-            image_info = search_images(query, args.provider, pexels_key, unsplash_key)
-            if image_info:
-                used_query = query
-                break
-            time.sleep(0.5)  # Brief pause between tiers
-
-        if not image_info:
-            logger.warning(f"No image found for {project_dir} after all tiers")
-            fail_count += 1
-            continue
-
-        if download_image(image_info, project_dir, used_query):
-            success_count += 1
-        else:
-            fail_count += 1
-
-        # Rate limit: ~1.5s between projects
-        time.sleep(1.5)
-
-    if not args.dry_run:
-        logger.info(f"Done. Downloaded: {success_count}, Skipped: {skip_count}, Failed: {fail_count}")
-    else:
-        logger.info(f"Dry run complete. Would process {len(project_dirs) - skip_count} projects.")
+        jobs.append((project_dir, queries))
+
+    if args.dry_run:
+        logger.info(f"Dry run complete. Would process {len(project_dirs) - skip_count - fail_count} projects.")
+        return
+
+    # Workers pace themselves through BUDGET (no fixed sleeps between tiers or
+    # projects); the time budget only stops new searches, so downloads already
+    # under way finish and the run overshoots it by at most one download.
+    BUDGET.set_time_budget(args.time_budget)
+    CLAIMED_PHOTOS.update(load_claimed_photos())
+    deferred_count = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {
+            executor.submit(acquire_image, project_dir, queries, args.provider,
+                            pexels_key, unsplash_key): project_dir
+            for project_dir, queries in jobs
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Processing projects"):
+            try:
+                outcome = future.result()
+            except Exception as e:
+                logger.error(f"Error processing {futures[future]}: {e}")
+                outcome = 'failed'
+            if outcome == 'downloaded':
+                success_count += 1
+            elif outcome == 'deferred':
+                deferred_count += 1
+            else:
+                fail_count += 1
+
+    if _search_cache is not None:
+        _search_cache.close()
+    logger.info(f"Search cache: {SEARCH_STATS['cache_hits']} hit(s), "
+                f"{SEARCH_STATS['requests']} API request(s)")
+    logger.info(f"Done. Downloaded: {success_count}, Skipped: {skip_count}, Failed: {fail_count}"
+                + (f", Deferred to next run: {deferred_count}" if deferred_count else ""))
 
 
 if __name__ == "__main__":
@@ -10,6 +10,10 @@ High-confidence data (licenses from structured APIs) is written directly into
 empty cells. Lower-confidence extractions (text from READMEs) are written as
 [Auto-enrichment] cell notes for human review.
 
+Source metadata for all selected projects is fetched first, concurrently
+(--workers, with per-platform limits in PLATFORM_LIMITS); extraction then runs
+over the results project by project.
+
 Usage:
     python scripts/enrich_data.py --dry-run                        # preview only
     python scripts/enrich_data.py --dry-run --use-llm              # with LLM extraction
@@ -18,7 +22,9 @@ Usage:
 
 Requirements:
     - requests, beautifulsoup4, python-dotenv, pandas, tqdm
-    - Optional: OPENROUTER_API_KEY in .env (for --use-llm)
+    - Optional: OPENROUTER_API_KEY in .env (for --use-llm), or LLM_BASE_URL for
+      any OpenAI-compatible endpoint (e.g. a local stub server; no key needed).
+      Completions are cached in data_sources/http_cache.sqlite.
 """
 
 import json
@@ -27,13 +33,17 @@ import re
 import sys
 import time
 import argparse
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
+from urllib.parse import urlparse
 from difflib import SequenceMatcher
 from html import unescape
 
 import requests
-import pandas as pd
 from tqdm import tqdm
 from dotenv import load_dotenv
 
@@ -43,7 +53,10 @@ from utils import (
     resolve_project_id,
     DEFAULT_CREDENTIALS_PATH,
     AUTO_ENRICHED_PREFIX,
+    load_sheet,
 )
+from http_cache import HttpCache, github_cache_key, hf_cache_key
+from sheet_snapshot import sheet_values
 
 # Inlined from generate_catalog_data.py to avoid its module-level argparse
 LICENSE_NORMALIZATION = {
@@ -109,6 +122,15 @@ parser.add_argument('--github-token', type=str, default=None,
                     help='GitHub API token for higher rate limits (or GITHUB_TOKEN env var)')
 parser.add_argument('--report', type=str, default='docs/enrichment_report.md',
                     help='Path for enrichment report output')
+parser.add_argument('--llm-workers', type=int, default=4,
+                    help='Max concurrent LLM requests (with --use-llm)')
+parser.add_argument('--llm-rate', type=float, default=1.0,
+                    help='Average LLM requests per second (token bucket; 0 = unlimited)')
+parser.add_argument('--workers', type=int, default=8,
+                    help='Concurrent metadata fetches across all platforms (per-platform limits still apply)')
+parser.add_argument('--api-cache-ttl', type=float, default=None,
+                    help='Hours cached GitHub/HF metadata is used without revalidating '
+                         '(default 24; 0 revalidates everything)')
 args = parser.parse_args()
 
 # ---------------------------------------------------------------------------
@@ -262,11 +284,64 @@ def parse_zenodo_url(url):
 # Platform fetchers
 # ---------------------------------------------------------------------------
 
-def _request_with_retry(url, headers=None, max_retries=2, delay=1.0):
-    """GET request with retry logic. Returns response or None."""
+# Metadata for all gap projects is fetched up front on a thread pool (see
+# fetch_all_metadata), so these keep each platform polite: (max requests in flight,
+# min seconds between request starts). Web pages outside the known platforms are
+# limited per host with the default.
+PLATFORM_LIMITS = {
+    'github': (4, 0.2),
+    'huggingface': (4, 0.3),
+    'zenodo': (2, 0.5),
+    'kaggle': (1, 1.0),
+}
+_DEFAULT_PLATFORM_LIMIT = (2, 0.5)
+
+
+class _PlatformLimiter:
+    """Per-platform concurrency cap and request spacing, shared by the fetch threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}
+
+    def _state(self, url):
+        key = classify_url(url)
+        if key not in PLATFORM_LIMITS:
+            key = (urlparse(url).hostname or '').lower()
+        with self._lock:
+            if key not in self._states:
+                limit, delay = PLATFORM_LIMITS.get(key, _DEFAULT_PLATFORM_LIMIT)
+                self._states[key] = {'sem': threading.BoundedSemaphore(limit),
+                                     'lock': threading.Lock(), 'delay': delay, 'next_at': 0.0}
+            return self._states[key]
+
+    @contextmanager
+    def slot(self, url):
+        state = self._state(url)
+        with state['sem']:
+            if state['delay']:
+                with state['lock']:
+                    wait = state['next_at'] - time.monotonic()
+                    if wait > 0:
+                        time.sleep(wait)
+                    state['next_at'] = time.monotonic() + state['delay']
+            yield
+
+
+_limiter = _PlatformLimiter()
+
+
+def _request_with_retry(url, headers=None, max_retries=2, delay=1.0, stream=False):
+    """GET request with retry logic. Returns response or None.
+
+    Each attempt waits for a slot from the URL's platform limiter; the backoff
+    between attempts does not hold one. With stream=True only the headers have been
+    read when this returns; the caller reads (and closes) the body.
+    """
     for attempt in range(max_retries + 1):
         try:
-            resp = requests.get(url, headers=headers or {}, timeout=30)
+            with _limiter.slot(url):
+                resp = requests.get(url, headers=headers or {}, timeout=30, stream=stream)
             return resp
         except requests.exceptions.RequestException as e:
             if attempt < max_retries:
@@ -277,19 +352,48 @@ def _request_with_retry(url, headers=None, max_retries=2, delay=1.0):
     return None
 
 
+# GitHub and HF API documents go through the on-disk cache that health_check.py
+# also fills (data_sources/http_cache.sqlite), so a repo looked at by either job is
+# revalidated with a conditional request instead of downloaded again. One instance
+# is shared by every fetch thread: separate connections would contend for SQLite's
+# write lock and fail with "database is locked".
+_api_cache = None
+_api_cache_lock = threading.Lock()
+
+
+def get_api_cache():
+    global _api_cache
+    with _api_cache_lock:
+        if _api_cache is None:
+            _api_cache = HttpCache()
+        return _api_cache
+
+
+def _cached_get(key, url, headers=None):
+    """(body, live response or None) for url via the API cache, with this script's retries."""
+    return get_api_cache().fetch(key, url, headers=headers, ttl_hours=args.api_cache_ttl,
+                                 request=lambda u, h: _request_with_retry(u, headers=h))
+
+
 def fetch_huggingface_metadata(url):
     """Fetch metadata from HuggingFace API."""
     hf_type, hf_id = parse_huggingface_url(url)
     if not hf_id:
         return None
 
-    api_url = f'https://huggingface.co/api/{hf_id}'
-    resp = _request_with_retry(api_url)
-    if not resp or resp.status_code != 200:
+    # The API namespaces models too (/api/models/org/name); hf_id only carries the
+    # datasets/ prefix.
+    repo_id = hf_id.removeprefix('datasets/')
+    api_url = f'https://huggingface.co/api/{hf_type}/{repo_id}'
+    body, resp = _cached_get(hf_cache_key(hf_type, repo_id), api_url)
+    if body is None:
         logger.debug(f"HF API failed for {hf_id}: {resp.status_code if resp else 'timeout'}")
         return None
 
-    data = resp.json()
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
     result = {
         'platform': 'HuggingFace',
         'url': url,
@@ -319,7 +423,6 @@ def fetch_huggingface_metadata(url):
     if readme_resp and readme_resp.status_code == 200:
         result['readme'] = readme_resp.text
 
-    time.sleep(0.5)
     return result
 
 
@@ -335,20 +438,25 @@ def fetch_github_metadata(url):
         headers['Authorization'] = f'token {token}'
 
     api_url = f'https://api.github.com/repos/{owner}/{repo}'
-    resp = _request_with_retry(api_url, headers=headers)
-    if not resp or resp.status_code != 200:
+    body, resp = _cached_get(github_cache_key(owner, repo), api_url, headers=headers)
+    if body is None:
         logger.debug(f"GitHub API failed for {owner}/{repo}: "
                      f"{resp.status_code if resp else 'timeout'}")
         return None
 
-    remaining = int(resp.headers.get('X-RateLimit-Remaining', 100))
-    if remaining < 10:
-        reset_time = int(resp.headers.get('X-RateLimit-Reset', 0))
-        wait = max(reset_time - time.time(), 0) + 1
-        logger.warning(f"GitHub rate limit low ({remaining}), waiting {wait:.0f}s")
-        time.sleep(min(wait, 60))
+    # Only a live response carries rate-limit headers; a cache hit cost nothing.
+    if resp is not None:
+        remaining = int(resp.headers.get('X-RateLimit-Remaining', 100))
+        if remaining < 10:
+            reset_time = int(resp.headers.get('X-RateLimit-Reset', 0))
+            wait = max(reset_time - time.time(), 0) + 1
+            logger.warning(f"GitHub rate limit low ({remaining}), waiting {wait:.0f}s")
+            time.sleep(min(wait, 60))
 
-    data = resp.json()
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
     result = {
         'platform': 'GitHub',
         'url': url,
@@ -365,11 +473,11 @@ def fetch_github_metadata(url):
 
     readme_url = f'https://api.github.com/repos/{owner}/{repo}/readme'
     readme_headers = {**headers, 'Accept': 'application/vnd.github.v3.raw'}
-    readme_resp = _request_with_retry(readme_url, headers=readme_headers)
-    if readme_resp and readme_resp.status_code == 200:
-        result['readme'] = readme_resp.text
+    readme, readme_resp = _cached_get(github_cache_key(owner, repo, 'readme'), readme_url,
+                                      headers=readme_headers)
+    if readme is not None:
+        result['readme'] = readme
 
-    time.sleep(0.3)
     return result
 
 
@@ -379,7 +487,8 @@ def fetch_zenodo_metadata(url):
     if not record_id:
         if 'doi.org' in url:
             try:
-                resp = requests.head(url, allow_redirects=True, timeout=10)
+                with _limiter.slot(url):
+                    resp = requests.head(url, allow_redirects=True, timeout=10)
                 if resp and 'zenodo.org' in resp.url:
                     record_id = parse_zenodo_url(resp.url)
             except requests.exceptions.RequestException:
@@ -416,10 +525,71 @@ def fetch_zenodo_metadata(url):
     if license_info:
         result['license'] = license_info.get('id', '')
 
-    time.sleep(0.5)
     return result
 
 
+# Scraped pages are streamed and read only as far as the extraction needs: past
+# </head> (title and meta descriptions) and SCRAPE_PARAGRAPHS closing </p> tags, and
+# never beyond SCRAPE_MAX_BYTES. Landing pages routinely ship megabytes of inlined
+# scripts and SVG after the part worth reading. License detection therefore only
+# sees the portion read.
+SCRAPE_MAX_BYTES = 1_000_000
+SCRAPE_PARAGRAPHS = 30
+_CHUNK_BYTES = 16384
+
+
+def _html_parser():
+    """BeautifulSoup tree builder: lxml when installed (several times faster), else stdlib."""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+
+def read_html_prefix(resp, max_bytes=SCRAPE_MAX_BYTES, paragraphs=SCRAPE_PARAGRAPHS):
+    """Read a streamed HTML response up to the point scraping needs; returns bytes.
+
+    Stops after </head> and `paragraphs` </p> tags have been seen, or at max_bytes,
+    whichever comes first, and closes the response. Tags are found on the raw bytes,
+    case-insensitively, including across chunk boundaries.
+    """
+    buf = bytearray()
+    lower = bytearray()
+    scanned = 0
+    head_done = False
+    seen = 0
+    try:
+        for chunk in resp.iter_content(_CHUNK_BYTES):
+            buf += chunk
+            lower += chunk.lower()
+            if len(buf) >= max_bytes:
+                del buf[max_bytes:]
+                break
+            # Re-scan a few bytes of the previous chunk so a tag split across two
+            # chunks is still found.
+            start = max(0, scanned - 6)
+            if not head_done and lower.find(b'</head', start) != -1:
+                head_done = True
+            seen += lower.count(b'</p>', start) - lower.count(b'</p>', start, scanned)
+            scanned = len(lower)
+            if head_done and seen >= paragraphs:
+                break
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"Stream interrupted after {len(buf)} bytes: {e}")
+    finally:
+        resp.close()
+    return bytes(buf)
+
+
+def _scrape_soup(resp, BeautifulSoup):
+    """Parse the prefix read_html_prefix keeps of a streamed response."""
+    # A charset in the header wins; otherwise let BeautifulSoup sniff <meta charset>.
+    declared = 'charset' in resp.headers.get('Content-Type', '').lower()
+    encoding = resp.encoding if declared else None
+    return BeautifulSoup(read_html_prefix(resp), _html_parser(), from_encoding=encoding)
+
+
 def fetch_kaggle_metadata(url):
     """Fetch metadata from Kaggle by scraping."""
     try:
@@ -432,11 +602,13 @@ def fetch_kaggle_metadata(url):
         'User-Agent': ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
                        'AppleWebKit/537.36'),
     }
-    resp = _request_with_retry(url, headers=headers)
+    resp = _request_with_retry(url, headers=headers, stream=True)
     if not resp or resp.status_code != 200:
+        if resp is not None:
+            resp.close()
         return None
 
-    soup = BeautifulSoup(resp.text, 'html.parser')
+    soup = _scrape_soup(resp, BeautifulSoup)
     result = {
         'platform': 'Kaggle',
         'url': url,
@@ -457,7 +629,6 @@ def fetch_kaggle_metadata(url):
                 result['license'] = m.group(1)
                 break
 
-    time.sleep(0.5)
     return result
 
 
@@ -481,15 +652,19 @@ def fetch_generic_metadata(url):
                        'Chrome/120.0.0.0 Safari/537.36'),
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
     }
-    resp = _request_with_retry(url, headers=headers)
+    resp = _request_with_retry(url, headers=headers, stream=True)
     if not resp or resp.status_code != 200:
+        if resp is not None:
+            resp.close()
         return None
 
+    # Decided from the headers, before any of the body is downloaded.
     content_type = resp.headers.get('Content-Type', '')
     if 'html' not in content_type and 'text' not in content_type:
+        resp.close()
         return None
 
-    soup = BeautifulSoup(resp.text, 'html.parser')
+    soup = _scrape_soup(resp, BeautifulSoup)
 
     # Remove script/style elements
     for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
@@ -533,12 +708,11 @@ def fetch_generic_metadata(url):
         'readme': main_content[:6000] if main_content else '',
     }
 
-    time.sleep(0.5)
     return result
 
 
-def fetch_metadata_for_project(project):
-    """Fetch metadata from all source links for a project. Returns list of metadata dicts."""
+def project_source_urls(project):
+    """A project's dataset, use-case and additional-resource URLs, deduplicated in order."""
     all_urls = []
     for link in project.get('dataset_links', []):
         all_urls.append(link.get('url', ''))
@@ -546,38 +720,56 @@ def fetch_metadata_for_project(project):
         all_urls.append(link.get('url', ''))
     for link in project.get('additional_resources', []):
         all_urls.append(link.get('url', ''))
+    return [url for url in dict.fromkeys(all_urls) if url]
 
+
+def fetch_url_metadata(url):
+    """Fetch metadata for one source URL with its platform's fetcher. None if nothing usable."""
     fetchers = {
         'huggingface': fetch_huggingface_metadata,
         'github': fetch_github_metadata,
         'zenodo': fetch_zenodo_metadata,
         'kaggle': fetch_kaggle_metadata,
     }
+    platform = classify_url(url)
+    fetcher = fetchers.get(platform)
+    if fetcher:
+        try:
+            return fetcher(url)
+        except Exception as e:
+            logger.debug(f"Error fetching {url}: {e}")
+    elif platform == 'other':
+        try:
+            return fetch_generic_metadata(url)
+        except Exception as e:
+            logger.debug(f"Error scraping {url}: {e}")
+    return None
+
+
+def fetch_metadata_for_project(project):
+    """Fetch metadata from all source links for a project. Returns list of metadata dicts."""
+    return [m for m in map(fetch_url_metadata, project_source_urls(project)) if m]
 
-    seen = set()
-    results = []
-    for url in all_urls:
-        if not url or url in seen:
-            continue
-        seen.add(url)
-        platform = classify_url(url)
-        fetcher = fetchers.get(platform)
-        if fetcher:
-            try:
-                metadata = fetcher(url)
-                if metadata:
-                    results.append(metadata)
-            except Exception as e:
-                logger.debug(f"Error fetching {url}: {e}")
-        elif platform == 'other':
-            try:
-                metadata = fetch_generic_metadata(url)
-                if metadata:
-                    results.append(metadata)
-            except Exception as e:
-                logger.debug(f"Error scraping {url}: {e}")
 
-    return results
+def fetch_all_metadata(projects, max_workers=8):
+    """Fetch metadata for every project's sources concurrently.
+
+    Each unique URL is fetched once however many projects link it, on a pool of
+    max_workers threads; PLATFORM_LIMITS keeps any one platform from seeing more
+    than its share. Returns {project id: [metadata dicts]} in the order
+    fetch_metadata_for_project would give. Projects sharing a URL get separate
+    copies of its metadata.
+    """
+    urls = list(dict.fromkeys(u for p in projects for u in project_source_urls(p)))
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(fetch_url_metadata, url): url for url in urls}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Fetching metadata"):
+            fetched[futures[future]] = future.result()
+    return {
+        p['id']: [dict(fetched[u]) for u in project_source_urls(p) if fetched.get(u)]
+        for p in projects
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -693,80 +885,211 @@ def _looks_like_yaml_frontmatter(text):
     return any(first_line.startswith(ind) for ind in yaml_indicators)
 
 
-def llm_extract(text, field_name, project_title, source_url):
-    """Use LLM via OpenRouter to extract a field from text. Returns string or ''."""
-    # Strip YAML frontmatter before sending to LLM
-    text = strip_yaml_frontmatter(text)
+LLM_SYSTEM_PROMPT = (
+    'You write content for a data catalog that showcases open datasets and AI '
+    'use cases for international development. The audience is development '
+    'practitioners, NGOs, government agencies, and innovators in developing '
+    'countries -- not ML researchers. Write in plain, direct language. '
+    'Focus on real-world impact and practical reuse. '
+    'Return only the content text, no commentary or formatting prefixes. '
+    'Write about whatever IS available in the source content -- cover as many '
+    'of the requested aspects as the source material allows, but do not '
+    'fabricate information that is not in the source. '
+    'If there is at least some relevant information, write about it. '
+    'Only respond with "NONE" if the source content has absolutely nothing '
+    'relevant to the requested topic.'
+)
+LLM_SOURCE_CHARS = 6000
+# Attempts per completion when the API answers 429 / 5xx or the request fails.
+LLM_MAX_ATTEMPTS = 4
 
-    api_key = os.environ.get('OPENROUTER_API_KEY', '')
-    base_url = os.environ.get('LLM_BASE_URL', 'https://openrouter.ai/api/v1')
-    model = os.environ.get('LLM_MODEL', 'openai/gpt-4o-mini')
 
-    if not api_key:
-        return ''
+def llm_settings():
+    """(api_key, base_url, model) from the environment.
+
+    LLM_BASE_URL points the client at any OpenAI-compatible endpoint -- including a
+    local stub server for testing -- and then no API key is required.
+    """
+    return (os.environ.get('OPENROUTER_API_KEY', ''),
+            os.environ.get('LLM_BASE_URL', 'https://openrouter.ai/api/v1'),
+            os.environ.get('LLM_MODEL', 'openai/gpt-4o-mini'))
 
+
+def llm_available():
+    return bool(os.environ.get('OPENROUTER_API_KEY') or os.environ.get('LLM_BASE_URL'))
+
+
+def _llm_messages(text, field_name, project_title, source_url):
+    """Chat messages for one extraction, or None when the field has no prompt."""
     prompt = LLM_PROMPTS.get(field_name, '')
     if not prompt:
-        return ''
+        return None
+    # Strip YAML frontmatter before sending to LLM
+    truncated = strip_yaml_frontmatter(text)[:LLM_SOURCE_CHARS]
+    return [
+        {'role': 'system', 'content': LLM_SYSTEM_PROMPT},
+        {'role': 'user', 'content': (
+            f'Project: {project_title}\n'
+            f'Source: {source_url}\n\n'
+            f'{prompt}\n\n'
+            f'Content:\n{truncated}'
+        )},
+    ]
 
-    truncated = text[:6000]
 
-    try:
-        resp = requests.post(
-            f'{base_url}/chat/completions',
-            headers={
-                'Authorization': f'Bearer {api_key}',
-                'Content-Type': 'application/json',
-            },
-            json={
-                'model': model,
-                'messages': [
-                    {'role': 'system', 'content': (
-                        'You write content for a data catalog that showcases open datasets and AI '
-                        'use cases for international development. The audience is development '
-                        'practitioners, NGOs, government agencies, and innovators in developing '
-                        'countries -- not ML researchers. Write in plain, direct language. '
-                        'Focus on real-world impact and practical reuse. '
-                        'Return only the content text, no commentary or formatting prefixes. '
-                        'Write about whatever IS available in the source content -- cover as many '
-                        'of the requested aspects as the source material allows, but do not '
-                        'fabricate information that is not in the source. '
-                        'If there is at least some relevant information, write about it. '
-                        'Only respond with "NONE" if the source content has absolutely nothing '
-                        'relevant to the requested topic.'
-                    )},
-                    {'role': 'user', 'content': (
-                        f'Project: {project_title}\n'
-                        f'Source: {source_url}\n\n'
-                        f'{prompt}\n\n'
-                        f'Content:\n{truncated}'
-                    )},
-                ],
-                'max_tokens': 800,
-                'temperature': 0.1,
-            },
-            timeout=30,
-        )
-        if resp.status_code == 200:
-            content = (resp.json()
-                       .get('choices', [{}])[0]
-                       .get('message', {})
-                       .get('content', ''))
-            if content.strip().upper() == 'NONE':
-                return ''
-            # Reject output that looks like YAML frontmatter
-            if _looks_like_yaml_frontmatter(content):
-                logger.debug(f"LLM returned YAML frontmatter for {field_name}, discarding")
-                return ''
-            return content.strip()
-        else:
-            logger.debug(f"LLM API returned {resp.status_code}: {resp.text[:200]}")
-            return ''
-    except Exception as e:
-        logger.debug(f"LLM extraction error: {e}")
+def llm_cache_key(base_url, model, field_name, messages):
+    """Disk-cache key: endpoint, model, field, a hash of the prompts and of the source text.
+
+    The endpoint is part of it because a model name alone does not identify the
+    model: 'llama3' behind a local server and behind a hosted gateway are different
+    weights, and switching LLM_BASE_URL must not serve the other one's answers. The
+    user message carries the truncated source text together with the title and URL
+    it is attributed to, so it is hashed whole.
+    """
+    prompt_hash = hashlib.sha256(
+        (messages[0]['content'] + '\n' + LLM_PROMPTS[field_name]).encode('utf-8')).hexdigest()
+    text_hash = hashlib.sha256(messages[1]['content'].encode('utf-8')).hexdigest()
+    return f"{base_url.rstrip('/')}|{model}|{field_name}|{prompt_hash[:16]}|{text_hash}"
+
+
+def _clean_llm_content(content, field_name):
+    if content.strip().upper() == 'NONE':
         return ''
-    finally:
-        time.sleep(1)
+    # Reject output that looks like YAML frontmatter
+    if _looks_like_yaml_frontmatter(content):
+        logger.debug(f"LLM returned YAML frontmatter for {field_name}, discarding")
+        return ''
+    return content.strip()
+
+
+class _TokenBucket:
+    """Allows `rate` acquisitions per second on average, in bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class LLMQueue:
+    """LLM completions with bounded concurrency, a shared rate limit and a disk cache.
+
+    Completions are cached in the http_cache file (llm_results) under llm_cache_key,
+    including "NONE" answers, so a re-run over unchanged sources makes no API calls
+    and never waits on the rate limit. Failures are not cached. At most `workers`
+    requests are in flight; every request first takes a token from a bucket refilled
+    at `rate` per second. A 429 or 5xx is retried with backoff, honouring Retry-After.
+    """
+
+    def __init__(self, cache, workers=4, rate=1.0, burst=None):
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.slots = threading.BoundedSemaphore(self.workers)
+        self.bucket = _TokenBucket(rate, burst or self.workers)
+        self.calls = 0
+        self.hits = 0
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def extract(self, text, field_name, project_title, source_url):
+        """The extracted field text, '' when there is none (or on failure)."""
+        messages = _llm_messages(text, field_name, project_title, source_url)
+        if messages is None or not llm_available():
+            return ''
+        api_key, base_url, model = llm_settings()
+        key = llm_cache_key(base_url, model, field_name, messages)
+        cached = self.cache.get_llm_result(key)
+        if cached is not None:
+            self._count('hits')
+            return cached
+
+        content = self._complete(base_url, api_key, model, messages)
+        if content is None:
+            return ''
+        result = _clean_llm_content(content, field_name)
+        self.cache.put_llm_result(key, model, field_name, result)
+        return result
+
+    def _complete(self, base_url, api_key, model, messages):
+        """The completion text, or None when every attempt failed."""
+        headers = {'Content-Type': 'application/json'}
+        if api_key:
+            headers['Authorization'] = f'Bearer {api_key}'
+        payload = {'model': model, 'messages': messages, 'max_tokens': 800, 'temperature': 0.1}
+        for attempt in range(LLM_MAX_ATTEMPTS):
+            self.bucket.acquire()
+            retry_after = None
+            with self.slots:
+                self._count('calls')
+                try:
+                    resp = requests.post(f'{base_url}/chat/completions', headers=headers,
+                                         json=payload, timeout=60)
+                except requests.exceptions.RequestException as e:
+                    logger.debug(f"LLM request error: {e}")
+                    resp = None
+            if resp is not None:
+                if resp.status_code == 200:
+                    try:
+                        return (resp.json()
+                                .get('choices', [{}])[0]
+                                .get('message', {})
+                                .get('content', '')) or ''
+                    except (ValueError, AttributeError, IndexError) as e:
+                        logger.debug(f"LLM response unreadable: {e}")
+                        return None
+                if resp.status_code != 429 and resp.status_code < 500:
+                    logger.debug(f"LLM API returned {resp.status_code}: {resp.text[:200]}")
+                    return None
+                try:
+                    retry_after = float(resp.headers.get('Retry-After', ''))
+                except ValueError:
+                    retry_after = None
+            if attempt + 1 < LLM_MAX_ATTEMPTS:
+                time.sleep(min(retry_after if retry_after is not None else 2 ** attempt, 60))
+        return None
+
+    def prefetch(self, jobs):
+        """Run extract() over jobs [(text, field, title, url)] concurrently to fill the cache."""
+        if not jobs:
+            return
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.extract, *job) for job in jobs]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="LLM extraction"):
+                future.result()
+
+
+_llm_queue = None
+
+
+def get_llm_queue():
+    global _llm_queue
+    if _llm_queue is None:
+        _llm_queue = LLMQueue(get_api_cache(), workers=args.llm_workers, rate=args.llm_rate)
+    return _llm_queue
+
+
+def llm_extract(text, field_name, project_title, source_url):
+    """Use LLM via OpenRouter to extract a field from text. Returns string or ''."""
+    return get_llm_queue().extract(text, field_name, project_title, source_url)
 
 
 # ---------------------------------------------------------------------------
@@ -811,6 +1134,53 @@ def extract_license(metadata_list, existing_license):
     return None
 
 
+def _llm_input(meta, project_context=''):
+    """The text sent to the LLM for one source: README (or API description) plus catalog context."""
+    # Combine README with API description for richer context
+    llm_input = meta.get('readme', '')
+    if not llm_input and meta.get('description'):
+        llm_input = meta['description']
+    if llm_input and project_context:
+        llm_input = f"Existing catalog info:\n{project_context}\n\nSource content:\n{llm_input}"
+    return llm_input
+
+
+def project_llm_context(project):
+    """Existing catalog fields given to the LLM as context for a project."""
+    ctx_parts = []
+    if project.get('description'):
+        ctx_parts.append(f"Description: {project['description'][:500]}")
+    if project.get('data_characteristics'):
+        ctx_parts.append(f"Data: {project['data_characteristics'][:300]}")
+    if project.get('model_characteristics'):
+        ctx_parts.append(f"Model: {project['model_characteristics'][:300]}")
+    return '\n'.join(ctx_parts)
+
+
+def first_llm_jobs(projects, metadata_by_project, target_fields=None):
+    """The LLM request extract_text_field makes first for each (project, missing text field).
+
+    That is the first source with usable text; later sources are only sent when the
+    first yields nothing, so they are left to run inline. Returns [(text, field,
+    title, url)] for LLMQueue.prefetch.
+    """
+    jobs = []
+    for project in projects:
+        title = project.get('title', project['id'])
+        context = project_llm_context(project)
+        for field in project.get('missing_fields', []):
+            if field not in LLM_PROMPTS or (target_fields and field not in target_fields):
+                continue
+            if (project.get(field) or '').strip():
+                continue
+            for meta in metadata_by_project.get(project['id'], []):
+                llm_input = _llm_input(meta, context)
+                if llm_input:
+                    jobs.append((llm_input, field, title, meta['url']))
+                    break
+    return jobs
+
+
 def extract_text_field(metadata_list, field_name, existing_value,
                        project_title='', use_llm=False, project_context=''):
     """Extract a text field from README content.
@@ -839,12 +1209,7 @@ def extract_text_field(metadata_list, field_name, existing_value,
 
     for meta in metadata_list:
         readme = meta.get('readme', '')
-        # Combine README with API description for richer context
-        llm_input = readme
-        if not llm_input and meta.get('description'):
-            llm_input = meta['description']
-        if llm_input and project_context:
-            llm_input = f"Existing catalog info:\n{project_context}\n\nSource content:\n{llm_input}"
+        llm_input = _llm_input(meta, project_context)
 
         # LLM extraction (best quality for unstructured content)
         if use_llm and llm_input and field_name in LLM_PROMPTS:
@@ -1122,16 +1487,41 @@ def generate_enrichment_report(results, freshness_data, cross_ref_mismatches,
 CELL_DISCLAIMER = AUTO_ENRICHED_PREFIX + "\n\n"
 
 
+# Ranges per values.batchGet request when re-reading cells before a write; the
+# ranges travel in the query string, so keep the URL well under server limits.
+RECHECK_CHUNK = 200
+
+
+def drop_filled_cells(sheet, cells, chunk_size=RECHECK_CHUNK):
+    """The entries of cells whose range is still empty in the live sheet.
+
+    The run's snapshot can predate a partner typing into a cell; this re-reads
+    exactly the target ranges (one batch_get per chunk) right before the write.
+    """
+    empty = []
+    for start in range(0, len(cells), chunk_size):
+        part = cells[start:start + chunk_size]
+        current = sheet.batch_get([c['range'] for c in part])
+        for cell, value_range in zip(part, current):
+            if not any(str(v).strip() for row in value_range for v in row):
+                empty.append(cell)
+    return empty
+
+
 def write_enrichment_to_sheet(results, discovered_resources,
                               excel_path, credentials_path):
     """Write enrichment directly into empty Google Sheet cells.
     License fields: written without disclaimer (factual structured data).
     Text fields: prefixed with disclaimer line.
-    Never overwrites non-empty cells.
+    Never overwrites non-empty cells: the snapshot picks the candidates, and each is
+    re-read from the live sheet just before writing (drop_filled_cells).
     """
     import gspread
     _client, _spreadsheet, sheet = get_gsheet_client(credentials_path)
-    headers = sheet.row_values(1)
+    # Headers and the empty-cell candidates come from this run's snapshot
+    # (shared with the run's other sheet readers)
+    all_values = sheet_values(sheet)
+    headers = all_values[0] if all_values else []
 
     header_to_idx = {}
     for i, h in enumerate(headers):
@@ -1150,16 +1540,13 @@ def write_enrichment_to_sheet(results, discovered_resources,
             logger.warning(f"Could not find sheet column for '{canonical}'")
 
     # Build project_id -> Excel row index mapping
-    df = pd.read_excel(excel_path)
+    df = load_sheet(excel_path)
     id_to_row_idx = {}
     for idx, row in df.iterrows():
         pid, _src, _err = resolve_project_id(row, row_idx=idx)
         if pid:
             id_to_row_idx[pid] = idx
 
-    # Read existing cell values
-    all_values = sheet.get_all_values()
-
     def get_cell_value(sheet_row, col_idx):
         r, c = sheet_row - 1, col_idx - 1
         if r < len(all_values) and c < len(all_values[r]):
@@ -1201,6 +1588,15 @@ def write_enrichment_to_sheet(results, discovered_resources,
             })
 
     # Execute writes
+    if batch_cells:
+        try:
+            candidates = len(batch_cells)
+            batch_cells = drop_filled_cells(sheet, batch_cells)
+            if len(batch_cells) < candidates:
+                print(f"  Skipped {candidates - len(batch_cells)} cell(s) filled in since the snapshot")
+        except Exception as e:
+            print(f"  Error re-reading target cells, writing nothing: {e}")
+            return
     if batch_cells:
         try:
             sheet.batch_update(batch_cells)
@@ -1220,8 +1616,8 @@ if __name__ == '__main__':
         print(f"Error: {args.input} not found. Run generate_catalog_data.py first.")
         sys.exit(1)
 
-    if args.use_llm and not os.environ.get('OPENROUTER_API_KEY'):
-        print("Warning: --use-llm set but OPENROUTER_API_KEY not found in .env")
+    if args.use_llm and not llm_available():
+        print("Warning: --use-llm set but neither OPENROUTER_API_KEY nor LLM_BASE_URL is set")
         print("LLM extraction will be skipped. Set the key in .env or environment.")
 
     # Parse filters
@@ -1259,9 +1655,15 @@ if __name__ == '__main__':
     cross_ref_mismatches = []
     all_discovered_resources = []
 
+    metadata_by_project = fetch_all_metadata(gaps, args.workers)
+    if args.use_llm and llm_available():
+        # Most projects are settled by the first source's completion; request those
+        # concurrently now so the extraction loop below reads them from the cache.
+        get_llm_queue().prefetch(first_llm_jobs(gaps, metadata_by_project, target_fields))
+
     for project in tqdm(gaps, desc="Enriching projects"):
         title = project.get('title', project['id'])
-        metadata_list = fetch_metadata_for_project(project)
+        metadata_list = metadata_by_project[project['id']]
 
         if not metadata_list:
             results.append({
@@ -1281,20 +1683,10 @@ if __name__ == '__main__':
                 extraction = extract_license(
                     metadata_list, project.get('license', ''))
             else:
-                # Build context from existing catalog fields
-                ctx_parts = []
-                if project.get('description'):
-                    ctx_parts.append(f"Description: {project['description'][:500]}")
-                if project.get('data_characteristics'):
-                    ctx_parts.append(f"Data: {project['data_characteristics'][:300]}")
-                if project.get('model_characteristics'):
-                    ctx_parts.append(f"Model: {project['model_characteristics'][:300]}")
-                project_context = '\n'.join(ctx_parts)
-
                 extraction = extract_text_field(
                     metadata_list, field, project.get(field, ''),
                     project_title=title, use_llm=args.use_llm,
-                    project_context=project_context)
+                    project_context=project_llm_context(project))
 
             if extraction:
                 enrichments[field] = extraction
@@ -1331,6 +1723,13 @@ if __name__ == '__main__':
             'enrichments': enrichments,
         })
 
+    if _llm_queue is not None:
+        print(f"LLM: {_llm_queue.calls} API request(s), {_llm_queue.hits} answer(s) from cache")
+
+    # Persist what the fetchers and the LLM queue cached for the next run.
+    if _api_cache is not None:
+        _api_cache.close()
+
     # Summary
     enriched = sum(1 for r in results if r.get('enrichments'))
     total_fields = sum(len(r.get('enrichments', {})) for r in results)
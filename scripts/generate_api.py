@@ -29,6 +29,22 @@ stamped into the payload as a build timestamp: `version` is a content hash, whic
 answers "has anything changed?" more precisely than a clock, and GitHub Pages'
 own Last-Modified/ETag headers date the file.
 
+Besides the three whole-catalogue documents, the same records are published sharded,
+so a partner mirroring one project does not download a megabyte to read it:
+
+  * v1/projects/<id>.json -- one record, versioned by its own content hash.
+  * v1/pages/<list>/<n>.json -- each list endpoint in pages of PAGE_SIZE records,
+    linked by `next`/`previous`. Pages omit the vocabularies; index.json has them.
+  * v1/versions.json -- id -> record version for every published record, so a sync
+    fetches this one small file and then only the records whose version moved.
+  * v1/changes.json -- the ids added, modified and removed by each of the last
+    CHANGES_HISTORY catalogue versions, diffed against the versions.json this run
+    replaces. A consumer that stored a version reads the entries after it; one whose
+    version has aged out of the feed falls back to versions.json.
+
+Shards of records that left the catalogue are deleted, so a 404 on
+projects/<id>.json means the same as the id missing from versions.json.
+
 Vite copies public/api/ into docs/ during `npm run build`; build.py runs this before
 that step, so no Vite or workflow configuration is involved.
 """
@@ -40,13 +56,24 @@ import os
 from string import Template
 
 from utils import (COUNTRY_ISO_MAP, SITE_BASE, AUTO_ENRICHED_PREFIX, CSP, FONT_HREF,
-                   ANALYTICS, is_auto_enriched)
+                   ANALYTICS, SERVED_JSON_SEPARATORS, is_auto_enriched)
 from text_parsing import license_parts, org_section_parts, parse_organizations
+from diff_catalog import diff_catalogs
 
 API_VERSION = "1.0"
 CATALOG_PATH = os.path.join("public", "data", "catalog.json")
 API_DIR = os.path.join("public", "api")
 OUTPUT_DIR = os.path.join(API_DIR, "v1")
+# The copy of OUTPUT_DIR that the last Vite build deployed; see previous_versions().
+DEPLOYED_DIR = os.path.join("docs", "api", "v1")
+
+# Records per list page. Twenty full records is ~100 KB pretty-printed: small enough
+# to page through on a slow connection, few enough requests to walk the catalogue.
+PAGE_SIZE = 20
+
+# Catalogue versions kept in changes.json. The catalogue is rebuilt a few times a
+# week at most, so this covers months for a consumer that polls rarely.
+CHANGES_HISTORY = 50
 
 # The metadata licence: what a consumer may do with these records. Distinct from
 # each record's `license`, which describes the third-party asset we point at and
@@ -168,15 +195,21 @@ $analytics
       <a href="v1/index.json">${base}api/v1/index.json</a>
     </div>
     <p class="prose"><code>index.json</code> describes the rest: counts, licenses, vocabularies and the
-    notes below. Every endpoint returns the same envelope, with the records under <code>projects</code>.</p>
+    notes below. The lists return the same envelope, with the records under <code>projects</code>.</p>
     <div class="scroll"><table>
       <thead><tr><th>Endpoint</th><th>Contents</th><th>Records</th></tr></thead>
       <tbody>
         <tr><td><a href="v1/catalog.json">v1/catalog.json</a></td><td class="note">Every published project</td><td class="num">$total_projects</td></tr>
         <tr><td><a href="v1/datasets.json">v1/datasets.json</a></td><td class="note">Projects that publish a dataset</td><td class="num">$total_datasets</td></tr>
         <tr><td><a href="v1/usecases.json">v1/usecases.json</a></td><td class="note">Projects that publish a use case</td><td class="num">$total_usecases</td></tr>
+        <tr><td><a href="v1/versions.json">v1/versions.json</a></td><td class="note">The version of every record, by <code>id</code></td><td class="num">$total_projects</td></tr>
+        <tr><td><a href="v1/projects/$example_id.json">v1/projects/<em>id</em>.json</a></td><td class="note">One project</td><td class="num">1</td></tr>
       </tbody>
     </table></div>
+    <p class="prose">The three lists are also split into pages of $page_size, starting at
+    <a href="v1/pages/catalog/1.json"><code>v1/pages/catalog/1.json</code></a> (likewise
+    <code>datasets</code> and <code>usecases</code>). Each page links to the <code>next</code> one
+    and leaves out the vocabularies, which <code>index.json</code> carries.</p>
   </section>
 
   <hr>
@@ -237,6 +270,7 @@ pilot_plus = [p <span class="c-key">for</span> p <span class="c-key">in</span> d
         <tr><td>content</td><td>text, provenance</td><td class="num">$cov_content</td><td class="note">Check provenance before showing it.</td></tr>
         <tr><td>contact</td><td>string</td><td class="num">$cov_contact</td><td class="note">Free text, usually an email address.</td></tr>
         <tr><td>image</td><td>string</td><td class="num">$cov_image</td><td class="note">Absolute URL. Some are stock placeholders.</td></tr>
+        <tr><td>version</td><td>string</td><td class="num">$total_projects</td><td class="note">Content hash of this record. Changes whenever any field does.</td></tr>
       </tbody>
     </table></div>
   </section>
@@ -249,6 +283,12 @@ pilot_plus = [p <span class="c-key">for</span> p <span class="c-key">in</span> d
     response carries a <code>version</code> content hash: fetch again and compare it to see whether anything
     changed. HTTP <code>Last-Modified</code> and <code>ETag</code> date the file. The catalog is rebuilt when
     someone triggers it, not on a schedule, so checking daily is ample.</p>
+    <p class="prose">To mirror only what changed, fetch <a href="v1/changes.json"><code>v1/changes.json</code></a>.
+    It lists the ids added, modified and removed by each of the last $changes_history catalog versions,
+    newest first. Take the entries after the <code>version</code> you stored and fetch
+    <code>v1/projects/<em>id</em>.json</code> for the ids they name. If your version is no longer in the
+    feed, compare every record's <code>version</code> in <a href="v1/versions.json"><code>v1/versions.json</code></a>
+    with the ones you stored instead. An id that is no longer listed has left the catalog.</p>
   </section>
 
   <hr>
@@ -375,7 +415,11 @@ def build_links(project):
 
 
 def build_record(project):
-    """Reshape one catalog project into a published API record."""
+    """Reshape one catalog project into a published API record.
+
+    The record carries its own content hash as `version`, which is what
+    versions.json and the changes feed compare.
+    """
     countries, regions = split_places(project.get("countries") or [])
 
     kind = []
@@ -396,7 +440,7 @@ def build_record(project):
         for key in ("data_characteristics", "model_characteristics", "how_to_use")
     }
 
-    return {
+    record = {
         "id": project["id"],
         # The slug churns when a title is edited; the canonical URL is built from the
         # current one so a consumer always has a link that resolves, while `id`
@@ -426,6 +470,8 @@ def build_record(project):
         "content": content,
         "image": absolute_url(project.get("image")),
     }
+    record["version"] = record_version(record)
+    return record
 
 
 def build_vocabularies(records, catalog):
@@ -468,8 +514,19 @@ def catalog_version(records, vocabularies):
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
 
 
+def record_version(record):
+    """Content hash of one published record, same form as catalog_version.
+
+    The record's own `version` field is left out of the hash, so it can be computed
+    before or after the field is set.
+    """
+    fields = {key: value for key, value in record.items() if key != "version"}
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
 def envelope(records, vocabularies, description, version):
-    """Wrap records in the shared envelope every record endpoint returns."""
+    """Wrap records in the shared envelope every whole-list endpoint returns."""
     return {
         "api_version": API_VERSION,
         "description": description,
@@ -483,6 +540,174 @@ def envelope(records, vocabularies, description, version):
     }
 
 
+def page_url(name, number):
+    return f"{SITE_BASE}api/v1/pages/{name}/{number}.json"
+
+
+def paginate(name, records, description, version):
+    """Split one list endpoint into PAGE_SIZE pages, each linked to its neighbours.
+
+    `count` stays the size of the whole list, so a consumer knows what to expect
+    from page one. An empty list still gets its (empty) first page, so the first-page
+    URL advertised in index.json always resolves.
+    """
+    pages = [records[i:i + PAGE_SIZE] for i in range(0, len(records), PAGE_SIZE)] or [[]]
+    for number, chunk in enumerate(pages, start=1):
+        yield number, {
+            "api_version": API_VERSION,
+            "description": description,
+            "source": SITE_BASE,
+            "documentation": SITE_BASE + "api/v1/index.json",
+            "license": METADATA_LICENSE,
+            "version": version,
+            "count": len(records),
+            "page": number,
+            "pages": len(pages),
+            "page_size": PAGE_SIZE,
+            "next": page_url(name, number + 1) if number < len(pages) else None,
+            "previous": page_url(name, number - 1) if number > 1 else None,
+            "projects": chunk,
+        }
+
+
+def record_document(record):
+    """Envelope of a single-record shard. `version` is the record's own hash, not
+    the catalogue's, so a shard only changes when its record does."""
+    return {
+        "api_version": API_VERSION,
+        "source": SITE_BASE,
+        "documentation": SITE_BASE + "api/v1/index.json",
+        "license": METADATA_LICENSE,
+        "version": record["version"],
+        "project": record,
+    }
+
+
+def read_json(path):
+    """Parsed JSON at path, or None when it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def previous_versions(output_dir, changes_path):
+    """The versions.json this run replaces, for update_changes; None on a first build.
+
+    When output_dir's copy is missing or unreadable (a checkout that only restored
+    part of public/api/, a hand-edit gone wrong) the deployed copy under docs/ is the
+    last state consumers saw, so the diff is taken against it. Without either, what
+    this version changed is unknown and update_changes restarts the feed's history
+    (see unbroken_history): every consumer holding an older version then finds it
+    unlisted and resynchronises from versions.json. That is correct but costs them a
+    full sync, so it is reported rather than silent.
+    """
+    previous = read_json(os.path.join(output_dir, "versions.json"))
+    if previous is not None:
+        return previous
+    if os.path.normpath(output_dir) == os.path.normpath(OUTPUT_DIR):
+        previous = read_json(os.path.join(DEPLOYED_DIR, "versions.json"))
+        if previous is not None:
+            print(f"  Warning: {output_dir}/versions.json missing or unreadable; "
+                  f"diffing against the deployed {DEPLOYED_DIR}/versions.json")
+            return previous
+    if read_json(changes_path) is not None:
+        print(f"  Warning: {output_dir}/versions.json missing or unreadable and no deployed "
+              f"copy to fall back on; changes.json restarts its history, so consumers "
+              f"on older versions resynchronise")
+    return None
+
+
+def unbroken_history(history, version):
+    """The newest entries of history that chain back from version without a gap.
+
+    Consumers apply the entries after the version they hold, so an entry may only be
+    listed when every newer version has one too: were the entry for some version V
+    missing, a consumer holding V's predecessor would find its own version newest in
+    the feed and take itself to be current. Cutting the history at the first gap
+    tells that consumer (and any older one) to resynchronise instead.
+    """
+    chain = []
+    expected = version
+    for entry in history:
+        if entry.get("version") != expected:
+            break
+        chain.append(entry)
+        expected = entry.get("previous_version")
+    return chain
+
+
+def entries_after(feed, held):
+    """The entries a consumer holding catalogue version held applies, oldest first.
+
+    The procedure the API guide describes: nothing when held is the feed's version,
+    the entries newer than the one for held when it is listed, and None -- fetch
+    versions.json and resynchronise -- when it is not.
+    """
+    if held == feed.get("version"):
+        return []
+    history = feed.get("history", [])
+    for i, entry in enumerate(history):
+        if entry.get("version") == held:
+            return list(reversed(history[:i]))
+    return None
+
+
+def update_changes(path, previous, version, versions):
+    """Prepend this version's entry to the changes feed at path; return the feed.
+
+    previous is the versions.json document being replaced (None on a first build).
+    The diff goes through diff_catalog.diff_catalogs, the same comparison build.py
+    runs on catalog.json, with each side reduced to {id: {"version": ...}}. An
+    unchanged catalogue version leaves the file untouched, so rebuilding without
+    data changes adds no entry and no git churn. Without a previous document the
+    history cannot say what this version changed and is restarted (unbroken_history).
+    """
+    feed = read_json(path) or {}
+    history = feed.get("history", [])
+    if previous and previous.get("version") not in (None, version):
+        old = {pid: {"version": v} for pid, v in previous.get("projects", {}).items()}
+        new = {pid: {"version": v} for pid, v in versions.items()}
+        diff = diff_catalogs(old, new)
+        history = [{
+            "version": version,
+            "previous_version": previous["version"],
+            "added": [pid for pid, _title in diff["added"]],
+            "modified": diff["changed"],
+            "removed": [pid for pid, _title in diff["removed"]],
+        }] + history
+    elif feed.get("version") == version:
+        return feed
+
+    feed = {
+        "api_version": API_VERSION,
+        "version": version,
+        "description": (
+            "Ids added, modified and removed by each catalogue version, newest first. "
+            "Apply the entries after the version you hold; if it is not listed, "
+            "resynchronise from versions.json."
+        ),
+        "record_url": SITE_BASE + "api/v1/projects/{id}.json",
+        "versions": SITE_BASE + "api/v1/versions.json",
+        "history": unbroken_history(history, version)[:CHANGES_HISTORY],
+    }
+    write_json(path, feed)
+    return feed
+
+
+def prune_json(directory, keep):
+    """Delete *.json files in directory that are not in keep; return how many."""
+    removed = 0
+    if not os.path.isdir(directory):
+        return removed
+    for name in os.listdir(directory):
+        if name.endswith(".json") and name not in keep:
+            os.remove(os.path.join(directory, name))
+            removed += 1
+    return removed
+
+
 def write_docs_page(records, vocabularies, path):
     """Render the human-readable API page from the records themselves.
 
@@ -516,6 +741,9 @@ def write_docs_page(records, vocabularies, path):
         analytics=ANALYTICS,
         font_href=FONT_HREF,
         total_projects=total,
+        example_id=records[0]["id"] if records else "ui_1",
+        page_size=PAGE_SIZE,
+        changes_history=CHANGES_HISTORY,
         total_datasets=recorded(lambda r: "dataset" in r["kind"]),
         total_usecases=recorded(lambda r: "usecase" in r["kind"]),
         unlicensed=total - fields["cov_license"],
@@ -533,13 +761,15 @@ def write_docs_page(records, vocabularies, path):
 
 def write_json(path, payload):
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, ensure_ascii=False)
+        json.dump(payload, f, separators=SERVED_JSON_SEPARATORS, ensure_ascii=False)
         f.write("\n")
 
 
-def generate_api(catalog_path=CATALOG_PATH, output_dir=OUTPUT_DIR):
-    with open(catalog_path, "r", encoding="utf-8") as f:
-        catalog = json.load(f)
+def generate_api(catalog_path=CATALOG_PATH, output_dir=OUTPUT_DIR, catalog=None):
+    # build.py's in-process pipeline passes the catalog it already holds.
+    if catalog is None:
+        with open(catalog_path, "r", encoding="utf-8") as f:
+            catalog = json.load(f)
 
     records = [build_record(p) for p in catalog["projects"]]
     vocabularies = build_vocabularies(records, catalog)
@@ -562,6 +792,47 @@ def generate_api(catalog_path=CATALOG_PATH, output_dir=OUTPUT_DIR):
             envelope(subset, vocabularies, description, version),
         )
 
+    # Sharded copies of the same records: one file per record, and paged lists.
+    versions = {r["id"]: r["version"] for r in records}
+    projects_dir = os.path.join(output_dir, "projects")
+    os.makedirs(projects_dir, exist_ok=True)
+    for record in records:
+        write_json(os.path.join(projects_dir, record["id"] + ".json"),
+                   record_document(record))
+    stale = prune_json(projects_dir, {rid + ".json" for rid in versions})
+
+    page_counts = {}
+    pages_root = os.path.join(output_dir, "pages")
+    for filename, (subset, description) in endpoints.items():
+        name = filename[:-len(".json")]
+        list_dir = os.path.join(pages_root, name)
+        os.makedirs(list_dir, exist_ok=True)
+        written = set()
+        for number, page in paginate(name, subset, description, version):
+            write_json(os.path.join(list_dir, f"{number}.json"), page)
+            written.add(f"{number}.json")
+        stale += prune_json(list_dir, written)
+        page_counts[filename] = len(written)
+
+    versions_path = os.path.join(output_dir, "versions.json")
+    changes_path = os.path.join(output_dir, "changes.json")
+    held = (read_json(changes_path) or {}).get("version")
+    changes = update_changes(changes_path, previous_versions(output_dir, changes_path),
+                             version, versions)
+    # A consumer that synced from the feed this run replaces must either be brought
+    # to this version by the entries after its own or be told to resynchronise.
+    pending = entries_after(changes, held) if held else None
+    if pending is not None and held != version and (
+            not pending or pending[-1]["version"] != version):
+        raise RuntimeError(f"changes.json would leave consumers on {held} behind {version}")
+    write_json(versions_path, {
+        "api_version": API_VERSION,
+        "version": version,
+        "count": len(versions),
+        "record_url": SITE_BASE + "api/v1/projects/{id}.json",
+        "projects": versions,
+    })
+
     index = {
         "api_version": API_VERSION,
         "version": version,
@@ -577,9 +848,22 @@ def generate_api(catalog_path=CATALOG_PATH, output_dir=OUTPUT_DIR):
                 "url": SITE_BASE + "api/v1/" + filename,
                 "description": description,
                 "count": len(subset),
+                "first_page": page_url(filename[:-len(".json")], 1),
+                "pages": page_counts[filename],
             }
             for filename, (subset, description) in endpoints.items()
         ],
+        "records": {
+            "url": SITE_BASE + "api/v1/projects/{id}.json",
+            "versions": SITE_BASE + "api/v1/versions.json",
+            "changes": SITE_BASE + "api/v1/changes.json",
+            "description": (
+                "One file per record. versions.json maps every published id to its "
+                "record version; changes.json lists the ids each catalogue version "
+                "added, modified or removed. Fetch only the records that changed."
+            ),
+        },
+        "page_size": PAGE_SIZE,
         "counts": {
             "projects": len(records),
             "datasets": len(datasets),
@@ -593,10 +877,14 @@ def generate_api(catalog_path=CATALOG_PATH, output_dir=OUTPUT_DIR):
             "previously reachable by."
         ),
         "freshness": (
-            "There are no per-record dates: the source carries none, so incremental "
-            "sync is not possible. `version` is a content hash -- re-fetch and compare "
-            "it to detect any change. HTTP Last-Modified and ETag date the file. The "
-            "catalogue is rebuilt manually, not on a schedule."
+            "There are no per-record dates: the source carries none. `version` is a "
+            "content hash of the whole catalogue, and every record carries its own "
+            "`version` hash. To sync incrementally, read changes.json for the ids "
+            "added, modified or removed since the catalogue version you hold and "
+            "fetch projects/{id}.json for those; if your version has aged out of the "
+            "feed, compare record versions in versions.json instead. HTTP "
+            "Last-Modified and ETag date the file. The catalogue is rebuilt manually, "
+            "not on a schedule."
         ),
         "caveats": [
             "Membership is derived from link presence, not authored: a project is "
@@ -622,7 +910,14 @@ def generate_api(catalog_path=CATALOG_PATH, output_dir=OUTPUT_DIR):
     print(f"  - index.json     ({len(records)} projects, {len(datasets)} datasets, "
           f"{len(usecases)} use cases)")
     for filename, (subset, _description) in endpoints.items():
-        print(f"  - {filename:<14} ({len(subset)} records)")
+        print(f"  - {filename:<14} ({len(subset)} records, {page_counts[filename]} pages)")
+    print(f"  - projects/      ({len(records)} record files)")
+    if changes["history"] and changes["history"][0]["version"] == version:
+        latest = changes["history"][0]
+        print(f"  - changes.json   (+{len(latest['added'])} added, "
+              f"{len(latest['modified'])} modified, -{len(latest['removed'])} removed)")
+    if stale:
+        print(f"  - removed {stale} stale shard(s)")
     licensed = sum(1 for r in records if r["license"])
     print(f"  - {licensed}/{len(records)} records carry a license")
     return index
@@ -7,6 +7,7 @@ import sys
 import argparse
 from collections import Counter
 from utils import (
+    SERVED_JSON_SEPARATORS,
     normalize_for_directory,
     resolve_project_id,
     PROJECTS_DIR,
@@ -16,8 +17,12 @@ from utils import (
     merge_access_note_link_columns,
     documents_dir_has_files,
     is_auto_enriched,
+    ProjectTree,
+    load_sheet,
 )
 from text_parsing import label_from_url, label_from_resource_url
+from image_derivatives import load_manifest as load_derivatives_manifest, project_srcset
+from asset_store import load_asset_map, asset_url
 
 # Parse command line arguments
 parser = argparse.ArgumentParser(description='Generate catalog JSON from Excel file.')
@@ -131,11 +136,18 @@ def label_links(links, resource_style=False):
     return labeled
 
 
+# Patterns for the list-valued sheet fields. clean_country_list and the columnar
+# transforms used by generate_catalog_json share them, so the two cannot drift apart.
+SDG_PATTERN = r'SDG\s*(\d+)'
+DATA_TYPE_SEPARATORS = r'[,;]'
+COUNTRY_SEPARATORS = r',|\s+and\s+|;'
+
+
 def clean_country_list(country_text):
     """Split country text into clean list, handling slash-separated region qualifiers."""
     if not country_text or not isinstance(country_text, str):
         return []
-    parts = re.split(r',|\s+and\s+|;', country_text)
+    parts = re.split(COUNTRY_SEPARATORS, country_text)
     countries = []
     for part in parts:
         country = part.strip()
@@ -253,54 +265,148 @@ def parse_maturity_tags(maturity_string):
     return reached_stages
 
 
-def get_project_image(project_id):
-    """Find the first image in the project's images directory."""
-    images_dir = os.path.join(PROJECTS_DIR, project_id, "images")
-    
-    if os.path.exists(images_dir) and os.path.isdir(images_dir):
-        image_files = [f for f in os.listdir(images_dir) 
-                      if f.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp'))]
-        if image_files:
-            return f"/projects/{project_id}/images/{image_files[0]}"
-    
-    return None
+def text_column(df, name):
+    """Column as an object Series with '' for missing or non-string cells.
+
+    Mirrors the row-wise `isinstance(value, str)` guards: numbers and NaN contribute
+    nothing to the list-valued fields derived from these columns.
+    """
+    if name not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    col = df[name].astype(object)
+    return col.where(col.map(lambda v: isinstance(v, str)), '')
+
+
+def cleaned_column(df, name):
+    """Columnar clean_str(str(value)): every cell stringified, stripped, 'nan' -> ''."""
+    if name not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    col = df[name].astype(object).map(str).str.strip()
+    return col.where(col != 'nan', '')
+
+
+def _collect(parts, index):
+    """Regroup an exploded Series into one list per original row (empty where none)."""
+    grouped = parts.groupby(level=0, sort=False).agg(list)
+    return grouped.reindex(index).map(lambda v: v if isinstance(v, list) else [])
+
+
+def sdg_lists(domain):
+    """Per-row ['SDG n', ...] from Domain/SDG text, in match order; only SDGs 1-17."""
+    numbers = domain.str.findall(SDG_PATTERN, flags=re.IGNORECASE).explode().dropna()
+    numbers = numbers.astype(int)
+    numbers = numbers[(numbers >= 1) & (numbers <= 17)]
+    return _collect('SDG ' + numbers.astype(str), domain.index)
+
+
+def data_type_lists(data_type):
+    """Per-row data types: split on , or ; and strip, dropping empty parts."""
+    parts = data_type.str.split(DATA_TYPE_SEPARATORS, regex=True).explode().str.strip()
+    return _collect(parts[parts.fillna('') != ''], data_type.index)
+
+
+def country_lists(country_text):
+    """Columnar clean_country_list: split, strip, keep the part before any '/'."""
+    parts = country_text.str.split(COUNTRY_SEPARATORS, regex=True).explode().str.strip()
+    parts = parts[parts.fillna('') != '']
+    parts = parts.str.split('/').str[0].str.strip()
+    return _collect(parts[parts != ''], country_text.index)
+
+
+def maturity_tag_lists(maturity):
+    """Columnar parse_maturity_tags over already-cleaned maturity strings."""
+    lowered = maturity.str.lower().str.strip()
+    reached = [
+        lowered.str.contains('|'.join(re.escape(p) for p in stage['patterns']), regex=True)
+        for stage in MATURITY_STAGES
+    ]
+    keys = [stage['key'] for stage in MATURITY_STAGES]
+    return pd.Series(
+        [[k for k, hit in zip(keys, hits) if hit] for hits in zip(*reached)],
+        index=maturity.index, dtype=object,
+    )
+
+
+def get_project_image(project_id, tree=None, derivatives=None, asset_map=None):
+    """Find the first image in the project's images directory.
+
+    Returns (url, srcset): url is the image's content-addressed blob when asset_map
+    (asset_store.py) has one, else its path under /projects/. srcset is the image's
+    entry in the image_derivatives.py manifest (intrinsic width/height plus resized
+    WebP/AVIF variants) when derivatives holds that manifest and the image has one,
+    else None.
+    """
+    tree = tree or ProjectTree(names=[project_id])
+    image_files = tree.images(project_id)
+    if image_files:
+        url = f"/projects/{project_id}/images/{image_files[0]}"
+        path = os.path.join(tree.projects_dir, project_id, 'images', image_files[0])
+        return asset_url(url, asset_map), project_srcset(url, path, derivatives)
+
+    return None, None
 
 
-def get_hosted_documents(project_id):
+def get_hosted_documents(project_id, tree=None, asset_map=None):
     """
     List files under public/projects/<id>/documents/ for access-note projects.
-    Returns [{'name': str, 'url': str}, ...] with site-relative URLs.
+    Returns [{'name': str, 'url': str}, ...] with site-relative URLs (blob URLs when
+    asset_map has them; the list keeps the order of the original paths).
     """
-    documents_dir = os.path.join(PROJECTS_DIR, project_id, "documents")
-    if not os.path.isdir(documents_dir):
-        return []
+    tree = tree or ProjectTree(names=[project_id])
 
     items = []
-    for root, _dirs, files in os.walk(documents_dir):
-        files = sorted(f for f in files if f and not f.startswith("."))
-        for filename in files:
-            full_path = os.path.join(root, filename)
-            if not os.path.isfile(full_path):
-                continue
-            rel = os.path.relpath(full_path, os.path.join(PROJECTS_DIR, project_id))
-            rel_posix = rel.replace(os.sep, "/")
-            url_path = f"/projects/{project_id}/{rel_posix}"
-            display = filename.rsplit(".", 1)[0].replace("_", " ").strip() or filename
-            items.append({"name": display, "url": url_path})
+    for rel_posix in tree.documents(project_id):
+        filename = rel_posix.rsplit("/", 1)[-1]
+        url_path = f"/projects/{project_id}/{rel_posix}"
+        display = filename.rsplit(".", 1)[0].replace("_", " ").strip() or filename
+        items.append({"name": display, "url": url_path})
 
     items.sort(key=lambda x: x["url"].lower())
+    for item in items:
+        item["url"] = asset_url(item["url"], asset_map)
     return items
 
 
-def migrate_project_directories_if_needed():
-    """Rename title-based project dirs to stable ui_X names if needed."""
-    try:
-        df = pd.read_excel(args.input)
-    except Exception:
-        return
+def write_detail_files(catalog_data, catalog_path):
+    """Write projects/<id>.json, one full record per project, next to catalog_path.
+
+    The catalog page lists projects from the slim catalog-index.json (built by
+    catalog_index.py) and the detail panel fetches these when it opens; most of
+    catalog.json is prose that only the panel shows. catalog.json itself stays
+    complete: the API, SEO pages, checks and full-text search read it.
+
+    Files of projects that left the catalog are deleted, so a stale ?project=
+    link falls back to the index entry instead of old content.
+    """
+    detail_dir = os.path.join(os.path.dirname(catalog_path), 'projects')
+    os.makedirs(detail_dir, exist_ok=True)
+    current = set()
+    for project in catalog_data['projects']:
+        filename = f"{project['id']}.json"
+        current.add(filename)
+        with open(os.path.join(detail_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(project, f, separators=SERVED_JSON_SEPARATORS, ensure_ascii=False)
+    for filename in os.listdir(detail_dir):
+        if filename.endswith('.json') and filename not in current:
+            os.remove(os.path.join(detail_dir, filename))
+    return detail_dir
+
+
+def migrate_project_directories_if_needed(df=None, tree=None):
+    """Rename title-based project dirs to stable ui_X names if needed.
+
+    tree, when given, is the ProjectTree the caller goes on to use; renamed
+    directories are re-indexed in it.
+    """
+    if df is None:
+        try:
+            df = load_sheet(args.input)
+        except Exception:
+            return
     if not os.path.isdir(PROJECTS_DIR):
         return
-    existing_dirs = set(os.listdir(PROJECTS_DIR))
+    # A copy: the loop below keeps it current as it moves directories.
+    existing_dirs = set(tree.names()) if tree is not None else set(os.listdir(PROJECTS_DIR))
     for _, row in df.iterrows():
         project_id = row.get('Project ID', '')
         if pd.isna(project_id) or not str(project_id).strip():
@@ -318,17 +424,32 @@ def migrate_project_directories_if_needed():
                     shutil.move(old_path, new_path)
                     existing_dirs.discard(old)
                     existing_dirs.add(target)
+                    if tree is not None:
+                        tree.discard(old)
+                        tree.refresh_project(target)
                     print(f"Migrated directory: '{old}' -> '{target}'")
                     break
 
 
-def generate_catalog_json():
-    """Generate catalog JSON from Excel file."""
-    migrate_project_directories_if_needed()
+def generate_catalog_json(df=None, tree=None):
+    """Generate catalog JSON from Excel file.
+
+    df is the workbook when the caller already holds it (build.py's in-process
+    pipeline shares one parse across stages); it is copied, never modified. When
+    omitted, the workbook is read from --input. tree is a ProjectTree of
+    public/projects; one is built here when the caller has none to share.
+    """
+    tree = tree or ProjectTree()
+    migrate_project_directories_if_needed(df, tree)
+    derivatives = load_derivatives_manifest()
+    asset_map = load_asset_map()
 
     try:
-        df = pd.read_excel(args.input)
-        print(f"Successfully loaded data from {args.input}")
+        if df is None:
+            df = load_sheet(args.input)
+            print(f"Successfully loaded data from {args.input}")
+        else:
+            df = df.copy()
         print(f"DataFrame columns: {list(df.columns)}")
         
         # Clean text columns
@@ -342,6 +463,29 @@ def generate_catalog_json():
         
         maturity_column = resolve_column(df, MATURITY_COLUMNS, 'maturity')
 
+        # Columnar pass: the list-valued and cleaned text fields for every row at once,
+        # with pandas string methods. The loop below keeps only genuinely per-project
+        # logic (id resolution, link rules, titles, filesystem lookups).
+        empty = pd.Series('', index=df.index, dtype=object)
+        license_text = cleaned_column(df, 'License')
+        columns = {
+            'sdgs': sdg_lists(text_column(df, 'Domain/SDG')),
+            'data_types': data_type_lists(text_column(df, 'Data Type')),
+            'countries': country_lists(text_column(df, 'Country Team')),
+            'maturity': cleaned_column(df, maturity_column) if maturity_column else empty,
+            'license': license_text.str.lower().map(LICENSE_NORMALIZATION).fillna(license_text),
+            'description': cleaned_column(df, 'Description - What can be done with this? What is this about?'),
+            'contact': cleaned_column(df, 'Point of Contact/Communities'),
+            'organizations': cleaned_column(df, 'Organizations Involved'),
+            'editor': cleaned_column(df, 'Authors'),
+            'data_characteristics': cleaned_column(df, 'Data - Key Characteristics'),
+            'model_characteristics': cleaned_column(df, 'Model/Use-Case - Key Characteristics'),
+            'how_to_use': cleaned_column(df, 'Deep Dive - How can you concretely work with this and build on this?'),
+        }
+        columns['maturity_tags'] = maturity_tag_lists(columns['maturity'])
+        derived = [dict(zip(columns, values))
+                   for values in zip(*(col.tolist() for col in columns.values()))]
+
         # Calculate statistics
         dataset_count = 0
         usecase_count = 0
@@ -355,7 +499,7 @@ def generate_catalog_json():
         all_countries = set()
         fragile_ids = []
         
-        for index, row in df.iterrows():
+        for index, row, fields in zip(df.index, df.to_dict('records'), derived):
             dataset_link_text = row.get('Dataset Link', '')
             usecase_link_text = row.get('Model/Use-Case Links', '')
 
@@ -375,7 +519,7 @@ def generate_catalog_json():
             has_usecase_link = len(usecase_urls) > 0
 
             # Resolve project ID before access-note / exclusion rules
-            normalized_project_id, id_source, error_msg = resolve_project_id(row, row_idx=index)
+            normalized_project_id, id_source, error_msg = resolve_project_id(row, row_idx=index, tree=tree)
             if error_msg or not normalized_project_id:
                 print(f"Row {index}: Skipping - {error_msg}")
                 continue
@@ -395,7 +539,7 @@ def generate_catalog_json():
                 merged_note = merge_access_note_link_columns(
                     dataset_link_text, usecase_link_text
                 ).strip()
-                has_documents = documents_dir_has_files(normalized_project_id)
+                has_documents = documents_dir_has_files(normalized_project_id, tree)
                 if merged_note:
                     access_note_kind = "documents" if has_documents else "info"
                     access_note_markdown = merged_note
@@ -413,8 +557,7 @@ def generate_catalog_json():
             # Count countries. Build the filter vocabulary from the same cleaned
             # values the project carries, so every filter option matches at least
             # one project and every project value is offered as a filter.
-            country_text = row.get('Country Team', '')
-            project_countries = clean_country_list(country_text)
+            project_countries = fields['countries']
             valid_countries.update(project_countries)
             all_countries.update(project_countries)
             
@@ -436,39 +579,20 @@ def generate_catalog_json():
             else:
                 title = f"Project {normalized_project_id}"
             
-            # Extract SDGs
-            domain = row.get('Domain/SDG', '')
-            sdgs = []
-            if isinstance(domain, str):
-                # Extract SDG numbers
-                sdg_matches = re.findall(r'SDG\s*(\d+)', domain, re.IGNORECASE)
-                for num in sdg_matches:
-                    sdg_num = int(num)
-                    if 1 <= sdg_num <= 17:
-                        sdg_label = f"SDG {sdg_num}"
-                        sdgs.append(sdg_label)
-                        all_sdgs.add(sdg_label)
-            
-            # Extract data types
-            data_type_text = row.get('Data Type', '')
-            data_types = []
-            if isinstance(data_type_text, str) and data_type_text:
-                types = re.split(r'[,;]', data_type_text)
-                data_types = [t.strip() for t in types if t.strip()]
-                all_data_types.update(data_types)
+            sdgs = fields['sdgs']
+            all_sdgs.update(sdgs)
+            data_types = fields['data_types']
+            all_data_types.update(data_types)
             
             # Get project image
-            image = get_project_image(normalized_project_id)
+            image, image_srcset = get_project_image(normalized_project_id, tree, derivatives,
+                                                    asset_map)
             
             # Check for Lacuna dataset
             lacuna_dataset = row.get('Lacuna Dataset', '')
             is_lacuna = isinstance(lacuna_dataset, str) and not pd.isna(lacuna_dataset) and \
                        lacuna_dataset.strip().lower() in ['yes', 'y', 'true', '1']
             
-            # Parse maturity tags
-            maturity_string = clean_str(str(row.get(maturity_column, ''))) if maturity_column else ''
-            maturity_tags = parse_maturity_tags(maturity_string)
-            
             # Parse additional resources column
             # Only entries with a valid URL are included (plain text notes are skipped).
             additional_resources_raw = row.get('Link to additional Resources (Paper, Publications, etc)', '')
@@ -478,10 +602,13 @@ def generate_catalog_json():
                     extract_links_allow_site_paths(additional_resources_raw.strip()),
                     resource_style=True,
                 )
+                # Labelled from the readable path first, then pointed at its blob.
+                for resource in additional_resources:
+                    resource['url'] = asset_url(resource['url'], asset_map)
 
             has_access_note = access_note_kind is not None
             hosted_documents = (
-                get_hosted_documents(normalized_project_id) if has_access_note else []
+                get_hosted_documents(normalized_project_id, tree, asset_map) if has_access_note else []
             )
 
             # Compute URL slug (stable ID + cosmetic title hint)
@@ -503,7 +630,7 @@ def generate_catalog_json():
                 'slug': slug,
                 'aliases': sorted(aliases),
                 'title': str(title),
-                'description': clean_str(str(row.get('Description - What can be done with this? What is this about?', ''))),
+                'description': fields['description'],
                 'dataset_links': dataset_urls,
                 'usecase_links': usecase_urls,
                 'access_note_kind': access_note_kind,
@@ -513,19 +640,20 @@ def generate_catalog_json():
                 'sdgs': sdgs,
                 'data_types': data_types,
                 'countries': project_countries,
-                'license': normalize_license(str(row.get('License', ''))),
-                'contact': clean_str(str(row.get('Point of Contact/Communities', ''))),
-                'organizations': clean_str(str(row.get('Organizations Involved', ''))),
-                'editor': clean_str(str(row.get('Authors', ''))),
+                'license': fields['license'],
+                'contact': fields['contact'],
+                'organizations': fields['organizations'],
+                'editor': fields['editor'],
                 'is_lacuna': is_lacuna,
                 'has_dataset': has_dataset_link,
                 'has_usecase': has_usecase_link,
                 'image': image,
-                'data_characteristics': clean_str(str(row.get('Data - Key Characteristics', ''))),
-                'model_characteristics': clean_str(str(row.get('Model/Use-Case - Key Characteristics', ''))),
-                'how_to_use': clean_str(str(row.get('Deep Dive - How can you concretely work with this and build on this?', ''))),
-                'maturity': maturity_string,
-                'maturity_tags': maturity_tags,
+                'image_srcset': image_srcset,
+                'data_characteristics': fields['data_characteristics'],
+                'model_characteristics': fields['model_characteristics'],
+                'how_to_use': fields['how_to_use'],
+                'maturity': fields['maturity'],
+                'maturity_tags': fields['maturity_tags'],
                 'additional_resources': additional_resources
             }
 
@@ -589,9 +717,11 @@ def generate_catalog_json():
         # Write JSON file
         os.makedirs(os.path.dirname(args.output), exist_ok=True)
         with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(catalog_data, f, indent=2, ensure_ascii=False)
+            json.dump(catalog_data, f, separators=SERVED_JSON_SEPARATORS, ensure_ascii=False)
+        detail_dir = write_detail_files(catalog_data, args.output)
         
         print(f"Successfully generated {args.output}")
+        print(f"  - {detail_dir}/<id>.json (detail panel)")
         print(f"  - {project_count} projects")
         print(f"  - {dataset_count} datasets")
         print(f"  - {usecase_count} use cases")
@@ -3,20 +3,31 @@ import pandas as pd
 import json
 import re
 from collections import Counter
-from utils import resolve_project_id, row_included_for_catalog_or_insights, COUNTRY_ISO_MAP
+from utils import resolve_project_id, row_included_for_catalog_or_insights, COUNTRY_ISO_MAP, ProjectTree, load_sheet, SERVED_JSON_SEPARATORS
 
 # Parse command line arguments
 parser = argparse.ArgumentParser(description='Generate insights data JSON from data catalog.')
 parser.add_argument('--input', type=str, default="docs/data_catalog.xlsx", help='Path to the input Excel file')
 parser.add_argument('--output', type=str, default="public/data/insights.json", help='Path to the output JSON file')
 parser.add_argument('--project-count', type=int, help='Total project count from catalog page')
-args = parser.parse_args()
+# Parse CLI args only when run directly; build.py imports this module for its
+# in-process pipeline, and must not have its own argv parsed here.
+if __name__ == "__main__":
+    args = parser.parse_args()
+else:
+    args = parser.parse_args([])
+
 
+def analyze_data(excel_path, df=None, tree=None):
+    """Analyze the Excel data and extract insights.
 
-def analyze_data(excel_path):
-    """Analyze the Excel data and extract insights."""
+    Pass df to reuse an already-loaded workbook instead of reading excel_path, and
+    tree to reuse a ProjectTree of public/projects.
+    """
     try:
-        df = pd.read_excel(excel_path)
+        tree = tree or ProjectTree()
+        if df is None:
+            df = load_sheet(excel_path)
         print(f"Loaded {len(df)} rows from {excel_path}")
         
         country_iso_map = COUNTRY_ISO_MAP
@@ -29,11 +40,11 @@ def analyze_data(excel_path):
         sdg_counts = Counter()  # Global SDG counts
         
         for index, row in df.iterrows():
-            if not row_included_for_catalog_or_insights(row, row_idx=index):
+            if not row_included_for_catalog_or_insights(row, row_idx=index, tree=tree):
                 continue
 
             # Count this project
-            normalized_project_id, id_source, error_msg = resolve_project_id(row, row_idx=index)
+            normalized_project_id, id_source, error_msg = resolve_project_id(row, row_idx=index, tree=tree)
             if normalized_project_id and not error_msg:
                 project_ids.add(normalized_project_id)
             
@@ -118,29 +129,36 @@ def analyze_data(excel_path):
         return None
 
 
-def generate_insights_json():
-    """Generate insights JSON file."""
+def generate_insights_json(df=None, project_count=None, tree=None):
+    """Generate insights JSON file.
+
+    df, project_count and tree let build.py pass the shared workbook, the catalog's
+    project count and its ProjectTree in-process; otherwise --input and
+    --project-count apply.
+    """
     
     # Analyze the data
-    insights = analyze_data(args.input)
+    insights = analyze_data(args.input, df, tree)
     if not insights:
         print("Failed to analyze data, exiting.")
-        return
+        return None
     
     # Use project count from catalog if provided
-    if args.project_count:
-        insights['total_projects'] = args.project_count
+    project_count = project_count or args.project_count
+    if project_count:
+        insights['total_projects'] = project_count
     
     # Write JSON file
     import os
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
     
     with open(args.output, 'w', encoding='utf-8') as f:
-        json.dump(insights, f, indent=2, ensure_ascii=False)
+        json.dump(insights, f, separators=SERVED_JSON_SEPARATORS, ensure_ascii=False)
     
     print(f"Generated insights data at {args.output}")
     print(f"  - {insights['total_projects']} projects")
     print(f"  - {insights['total_countries']} countries covered")
+    return insights
 
 
 if __name__ == "__main__":
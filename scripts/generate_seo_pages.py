@@ -17,15 +17,25 @@ docs/404.html, whose location.replace() to the site root costs the visit its ref
 and its ?utm_* query before analytics can read them -- so a shared insights link would
 report as untracked direct traffic. Every URL worth sharing is now a served document.
 
-Output is deterministic (depends only on catalog.json), so re-running without data
-changes produces byte-identical files and no git churn.
+Output is deterministic (depends only on catalog.json), and a page is only written
+when its bytes differ from the file already in docs/, so re-running without data
+changes touches no file -- no mtime churn for downstream caches, no git churn. The
+sitemap gives each page the <lastmod> of the build that last changed it: pages that
+changed get today's date, the rest keep the date from the previous sitemap.
+
+Large catalogues are rendered on a process pool (PARALLEL_MIN_PAGES, --workers);
+writing stays in this process.
 
 Run AFTER `npm run build` (needs docs/assets/index.{js,css}); build.py invokes it.
 """
 
+import argparse
 import html
 import json
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from string import Template
 
 from utils import SITE_BASE, SITE_NAME, CSP, ANALYTICS, FONT_HREF
@@ -34,6 +44,12 @@ DEFAULT_OG_IMAGE = SITE_BASE + "img/fair_forward.png"
 CATALOG_PATH = os.path.join("public", "data", "catalog.json")
 DOCS_DIR = "docs"
 
+# Below this many projects the pages are rendered in-process: starting worker
+# processes costs more than rendering a few hundred pages of string templates.
+PARALLEL_MIN_PAGES = 300
+# Projects per task sent to a worker, so pickling overhead stays small.
+RENDER_CHUNKSIZE = 64
+
 
 
 MATURITY_LABELS = {
@@ -165,6 +181,23 @@ def abs_url(site_root_path):
     return SITE_BASE.rstrip("/") + "/" + str(site_root_path or "").lstrip("/")
 
 
+def render_image(image, srcset, alt):
+    """The cover as <img>, wrapped in <picture> with the resized WebP/AVIF variants
+    (image_derivatives.py) when the catalog lists them. width/height are the
+    original's, so the browser reserves the box before the file arrives."""
+    img = '<img src="{}" alt="{}"'.format(esc(rel_asset(image)), esc(alt))
+    if not srcset or not srcset.get("sources"):
+        return img + ">"
+    img += ' width="{}" height="{}" loading="lazy">'.format(srcset["width"], srcset["height"])
+    sources = "".join(
+        '<source type="{}" srcset="{}" sizes="(max-width: 720px) 100vw, 720px">'.format(
+            esc(source["type"]),
+            esc(", ".join("{} {}w".format(rel_asset(v["url"]), v["width"]) for v in source["srcset"])))
+        for source in srcset["sources"]
+    )
+    return "<picture>{}{}</picture>".format(sources, img)
+
+
 def render_prose(text):
     """Escape free text and preserve paragraph/line breaks as HTML."""
     text = str(text or "").strip()
@@ -221,7 +254,7 @@ def build_body(project):
     if meta_line:
         parts.append('        <p class="seo-meta">{}</p>'.format(meta_line))
     if image:
-        parts.append('        <img src="{}" alt="{}">'.format(esc(rel_asset(image)), esc(title)))
+        parts.append("        " + render_image(image, project.get("image_srcset"), title))
     if project.get("description"):
         parts.append(render_prose(project["description"]))
     parts.append(render_section(project.get("data_characteristics"), "Data characteristics"))
@@ -280,71 +313,146 @@ def build_insights_page(project_count):
     )
 
 
-def build_sitemap(slugs):
-    # lastmod is intentionally omitted to keep output deterministic (no date churn).
+def build_sitemap(slugs, lastmod=None):
     # Only URLs that return HTTP 200 are listed: the homepage, /insights/ (written just
     # below) and the project pages that were actually written (the caller passes their
-    # slugs).
+    # slugs). lastmod maps a URL to the date its page last changed; URLs without one
+    # (the homepage, pages unchanged since before lastmod was recorded) omit the tag
+    # rather than claim a date, so the sitemap only changes when a page does.
+    lastmod = lastmod or {}
     urls = [SITE_BASE, SITE_BASE + "insights/"]
     urls += [SITE_BASE + "projects/" + slug + "/" for slug in slugs]
-    body = "\n".join("  <url><loc>{}</loc></url>".format(esc(u)) for u in urls)
+    body = "\n".join(
+        "  <url><loc>{}</loc>{}</url>".format(
+            esc(u), "<lastmod>{}</lastmod>".format(lastmod[u]) if u in lastmod else "")
+        for u in urls)
     return ('<?xml version="1.0" encoding="UTF-8"?>\n'
             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
             + body + "\n</urlset>\n")
 
 
+_SITEMAP_ENTRY = re.compile(r"<url><loc>([^<]*)</loc>(?:<lastmod>([^<]*)</lastmod>)?</url>")
+
+
+def read_lastmod(path):
+    """URL -> lastmod date from the sitemap a previous build wrote (empty if none)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return {}
+    return {html.unescape(loc): date for loc, date in _SITEMAP_ENTRY.findall(text) if date}
+
+
+def write_if_changed(path, text):
+    """Write text to path unless the file already holds exactly those bytes.
+
+    Returns True when the file was (re)written. Leaving an identical file alone keeps
+    its mtime, so Pages, the CDN and the deploy diff all see it as unchanged.
+    """
+    data = text.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def render_project(project):
+    """(slug, page html, error) for one project; runs in worker processes."""
+    slug = project.get("slug") or project.get("id")
+    if not slug:
+        return None, None, "no slug/id"
+    try:
+        return slug, build_page(project), None
+    except Exception as exc:  # one bad project must not break the whole build
+        return slug, None, str(exc)
+
+
+def render_all(projects, workers=None):
+    """render_project over projects, in order; on a process pool for large catalogues.
+
+    workers=None picks in-process below PARALLEL_MIN_PAGES and one worker per CPU
+    above; 1 forces in-process rendering.
+    """
+    if workers is None:
+        workers = 1 if len(projects) < PARALLEL_MIN_PAGES else (os.cpu_count() or 1)
+    if workers <= 1:
+        return [render_project(p) for p in projects]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render_project, projects, chunksize=RENDER_CHUNKSIZE))
+
+
 def build_robots():
     return ("User-agent: *\nAllow: /\nSitemap: " + SITE_BASE + "sitemap.xml\n")
 
 
-def main():
+def main(catalog=None, workers=None):
+    """Write every changed page; returns an exit code.
+
+    catalog skips re-reading CATALOG_PATH; workers is passed to render_all.
+    """
     print("\n" + "=" * 60)
     print("  Generating SEO pages (per-project HTML + sitemap)")
     print("=" * 60)
 
-    if not os.path.exists(CATALOG_PATH):
-        print("ERROR: {} not found; run generate_catalog_data.py first.".format(CATALOG_PATH))
-        return 1
-    with open(CATALOG_PATH, "r", encoding="utf-8") as f:
-        catalog = json.load(f)
+    if catalog is None:
+        if not os.path.exists(CATALOG_PATH):
+            print("ERROR: {} not found; run generate_catalog_data.py first.".format(CATALOG_PATH))
+            return 1
+        with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+            catalog = json.load(f)
 
     projects = catalog.get("projects") or []
-    written_slugs = []
+    sitemap_path = os.path.join(DOCS_DIR, "sitemap.xml")
+    lastmod = read_lastmod(sitemap_path)
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    page_slugs = []
+    changed = 0
     failed = 0
-    for project in projects:
-        slug = project.get("slug") or project.get("id")
-        if not slug:
-            print("  Skipping project with no slug/id: {}".format(project.get("title")))
+    for project, (slug, page, error) in zip(projects, render_all(projects, workers)):
+        if error:
+            if slug:
+                print("  Failed to generate page for {}: {}".format(slug, error))
+            else:
+                print("  Skipping project with no slug/id: {}".format(project.get("title")))
             failed += 1
             continue
         try:
-            out_dir = os.path.join(DOCS_DIR, "projects", slug)
-            os.makedirs(out_dir, exist_ok=True)
-            with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
-                f.write(build_page(project))
-            written_slugs.append(slug)
-        except Exception as exc:  # one bad project must not break the whole build
-            print("  Failed to generate page for {}: {}".format(slug, exc))
+            if write_if_changed(os.path.join(DOCS_DIR, "projects", slug, "index.html"), page):
+                lastmod[SITE_BASE + "projects/" + slug + "/"] = today
+                changed += 1
+            page_slugs.append(slug)
+        except OSError as exc:
+            print("  Failed to write page for {}: {}".format(slug, exc))
             failed += 1
 
     # A real file for /insights, so shared links to it keep their referrer and ?utm_*
     # instead of being laundered through the 404 redirect shim.
-    insights_dir = os.path.join(DOCS_DIR, "insights")
-    os.makedirs(insights_dir, exist_ok=True)
-    with open(os.path.join(insights_dir, "index.html"), "w", encoding="utf-8") as f:
-        f.write(build_insights_page(len(projects)))
-
-    # Sitemap lists only the pages actually written, so every <loc> returns HTTP 200.
-    with open(os.path.join(DOCS_DIR, "sitemap.xml"), "w", encoding="utf-8") as f:
-        f.write(build_sitemap(written_slugs))
-    with open(os.path.join(DOCS_DIR, "robots.txt"), "w", encoding="utf-8") as f:
-        f.write(build_robots())
-
-    print("Wrote {} project pages ({} failed), insights page, sitemap.xml ({} urls), "
-          "robots.txt".format(len(written_slugs), failed, len(written_slugs) + 2))
+    if write_if_changed(os.path.join(DOCS_DIR, "insights", "index.html"),
+                        build_insights_page(len(projects))):
+        lastmod[SITE_BASE + "insights/"] = today
+
+    # Sitemap lists only pages that exist after this run, so every <loc> returns HTTP 200.
+    write_if_changed(sitemap_path, build_sitemap(page_slugs, lastmod))
+    write_if_changed(os.path.join(DOCS_DIR, "robots.txt"), build_robots())
+
+    print("Generated {} project pages ({} changed, {} failed), insights page, sitemap.xml "
+          "({} urls), robots.txt".format(len(page_slugs), changed, failed, len(page_slugs) + 2))
     return 0
 
 
 if __name__ == "__main__":
     import sys
-    sys.exit(main())
+    parser = argparse.ArgumentParser(
+        description='Write per-project SEO pages, /insights/, sitemap.xml and robots.txt into docs/.')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Render on this many processes (default: one per CPU for '
+                             f'catalogues of {PARALLEL_MIN_PAGES}+ projects, else in-process)')
+    cli_args = parser.parse_args()
+    sys.exit(main(workers=cli_args.workers))
@@ -14,7 +14,9 @@ Archival platforms (Zenodo, Harvard Dataverse) are intentionally frozen and perm
 so they are surfaced as a positive "stable_archive", never penalised for being old.
 
 Network/API failures degrade gracefully: a failed enrichment call is skipped for that link, and
-the entry still gets its availability plus whatever context is derivable.
+the entry still gets its availability plus whatever context is derivable. With GITHUB_TOKEN
+set, GitHub repos are resolved up front in batched GraphQL queries (prefetch_github); REST
+remains the path for anonymous runs and for any batch that fails.
 
 Output: public/data/health.json and docs/data/health.json (the same dual-location pattern
 catalog.json uses), so the live site picks up the signal without an app rebuild.
@@ -26,7 +28,9 @@ import re
 import argparse
 from datetime import datetime, timezone
 
-from utils import check_urls
+from utils import check_urls, SERVED_JSON_SEPARATORS
+from http_cache import HttpCache, github_cache_key, hf_cache_key, is_fresh, METADATA_TTL_HOURS
+from catalog_index import generate_index
 
 parser = argparse.ArgumentParser(description='Compute per-entry health/sustainability signals.')
 parser.add_argument('--input', type=str, default='public/data/catalog.json',
@@ -34,6 +38,11 @@ parser.add_argument('--input', type=str, default='public/data/catalog.json',
 parser.add_argument('--outputs', type=str, nargs='+',
                     default=['public/data/health.json', 'docs/data/health.json'],
                     help='Output paths for health.json (written to each)')
+parser.add_argument('--url-cache-ttl', type=float, default=None,
+                    help='Hours a successful link check stays cached (default 24; 0 re-checks every link)')
+parser.add_argument('--api-cache-ttl', type=float, default=None,
+                    help='Hours GitHub/HF metadata is used without revalidating (default 24; '
+                         '0 revalidates every repo)')
 parser.add_argument('--timestamp', type=str, default=os.environ.get('RUN_TIMESTAMP', ''),
                     help='Run date (YYYY-MM-DD); defaults to today (UTC)')
 args = parser.parse_args()
@@ -56,6 +65,10 @@ _ACCESS_RESTRICTED = {401, 403, 405, 406, 409, 429}
 _UNRELIABLE_404_HOSTS = ('kaggle.com',)
 
 GITHUB_API = 'https://api.github.com/repos/{owner}/{repo}'
+GITHUB_GRAPHQL = 'https://api.github.com/graphql'
+# Repositories resolved per GraphQL query; GitHub caps a query's node count, and 100
+# small repository lookups stay far below it.
+GITHUB_BATCH_SIZE = 100
 HF_API = 'https://huggingface.co/api/{kind}/{repo_id}'
 
 # GitHub path segments that are not user/repo pairs.
@@ -160,10 +173,138 @@ def days_since(iso_date):
         return None
 
 
-def fetch_github(owner, repo, cache):
-    """Fetch {pushed_at, archived, days_since_commit} for a repo, cached. None on failure."""
+def _load_json(body):
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return None
+
+
+def _github_result(key, pushed_at, archived, stars):
+    return {
+        'repo': key,
+        'pushed_at': pushed_at,
+        'archived': bool(archived),
+        'days_since_commit': days_since(pushed_at),
+        'stars': stars,
+    }
+
+
+def _graphql_string(value):
+    # JSON string escaping is valid GraphQL string syntax.
+    return json.dumps(value)
+
+
+# The GraphQL fields prefetch_github asks for, and how each lands in the REST repo
+# document it stores: enrich_data.fetch_github_metadata reads description, topics
+# and license from the same api_metadata entry, so the stored body must carry them.
+_GITHUB_GRAPHQL_FIELDS = ('pushedAt isArchived stargazerCount description '
+                          'repositoryTopics(first: 20) { nodes { topic { name } } } '
+                          'licenseInfo { spdxId }')
+
+
+def _github_rest_body(node):
+    """A GraphQL repository node as the subset of the REST document readers use."""
+    license_info = node.get('licenseInfo') or {}
+    topics = ((node.get('repositoryTopics') or {}).get('nodes')) or []
+    return json.dumps({
+        'pushed_at': node.get('pushedAt'),
+        'archived': node.get('isArchived'),
+        'stargazers_count': node.get('stargazerCount'),
+        'description': node.get('description'),
+        'topics': [t['topic']['name'] for t in topics if t and t.get('topic')],
+        'license': {'spdx_id': license_info['spdxId']} if license_info.get('spdxId') else None,
+    })
+
+
+def prefetch_github(repos, cache, store, ttl_hours=None):
+    """Resolve many repos with batched GraphQL queries into cache (the fetch_github memo).
+
+    Needs GITHUB_TOKEN (GraphQL has no anonymous access); without one this does
+    nothing and every repo goes through fetch_github's REST call. Repos whose
+    api_metadata entry (github_cache_key) is still within ttl_hours are skipped:
+    fetch_github serves them from the store without a request. Each query asks for
+    up to GITHUB_BATCH_SIZE of the rest, so a few hundred repos cost a handful of
+    requests, and every answer is written back under the same key as a REST-shaped
+    document, where the next run and enrich_data.py find it. A repo GraphQL reports
+    as NOT_FOUND (deleted, private) is memoised as None and dropped from the store,
+    like a REST 404. Any other missing answer (rate limit, timeout, an SSO-protected
+    org) proves nothing about the repo: it is left out of cache, so fetch_github asks
+    REST and serves the stored body if that fails too. When a whole batch fails, its
+    repos fall back to REST the same way.
+
+    cache is keyed by github_cache_key, which folds case as GitHub does.
+    """
+    token = os.environ.get('GITHUB_TOKEN')
+    if ttl_hours is None:
+        ttl_hours = METADATA_TTL_HOURS
+    pending = []
+    for owner, repo in dict.fromkeys(repos):
+        if github_cache_key(owner, repo) in cache:
+            continue
+        stored = store.get_metadata(github_cache_key(owner, repo))
+        if stored and is_fresh(stored['checked_at'], ttl_hours):
+            continue
+        pending.append((owner, repo))
+    if not token or not pending:
+        return 0
     import requests
-    key = f'{owner}/{repo}'
+
+    headers = {'Authorization': f'Bearer {token}',
+               'User-Agent': 'FairForward-DataCatalog/1.0'}
+    resolved = 0
+    for start in range(0, len(pending), GITHUB_BATCH_SIZE):
+        batch = pending[start:start + GITHUB_BATCH_SIZE]
+        fields = '\n'.join(
+            f'r{i}: repository(owner: {_graphql_string(owner)}, name: {_graphql_string(repo)}) '
+            f'{{ {_GITHUB_GRAPHQL_FIELDS} }}'
+            for i, (owner, repo) in enumerate(batch))
+        try:
+            resp = requests.post(GITHUB_GRAPHQL, json={'query': f'query {{\n{fields}\n}}'},
+                                 headers=headers, timeout=30)
+            payload = resp.json() if resp.status_code == 200 else {}
+            data = payload.get('data')
+            not_found = {str(error.get('path', [''])[0]) for error in payload.get('errors') or []
+                         if isinstance(error, dict) and error.get('type') == 'NOT_FOUND'
+                         and error.get('path')}
+        except (requests.exceptions.RequestException, ValueError, AttributeError):
+            data = None
+        if not isinstance(data, dict):
+            print(f'  GitHub GraphQL batch of {len(batch)} failed; using REST for those repos')
+            continue
+        for i, (owner, repo) in enumerate(batch):
+            node = data.get(f'r{i}')
+            key = github_cache_key(owner, repo)
+            if node:
+                cache[key] = _github_result(f'{owner}/{repo}', node.get('pushedAt'),
+                                            node.get('isArchived'), node.get('stargazerCount'))
+                store.put_metadata(key, GITHUB_API.format(owner=owner, repo=repo),
+                                   _github_rest_body(node))
+            elif f'r{i}' in not_found:
+                cache[key] = None
+                store.forget_metadata(key)
+            else:
+                continue
+            resolved += 1
+    return resolved
+
+
+def github_repos(entry):
+    """(owner, repo) of every GitHub link build_entry_health may read, in link order.
+
+    It reads the first one that resolves, so when the first repo is gone the next is
+    looked up; all of them are prefetched.
+    """
+    return [gh for gh in (parse_github(url) for url in in_scope_urls(entry)) if gh]
+
+
+def fetch_github(owner, repo, cache, store):
+    """Fetch {pushed_at, archived, days_since_commit} for a repo, cached. None on failure.
+
+    cache memoises within the run under github_cache_key (as prefetch_github fills
+    it); store is the on-disk HttpCache shared across runs.
+    """
+    key = github_cache_key(owner, repo)
     if key in cache:
         return cache[key]
 
@@ -173,52 +314,39 @@ def fetch_github(owner, repo, cache):
     if token:
         headers['Authorization'] = f'Bearer {token}'
 
+    body, _ = store.fetch(key, GITHUB_API.format(owner=owner, repo=repo),
+                          headers=headers, ttl_hours=args.api_cache_ttl)
+    data = _load_json(body)
     result = None
-    try:
-        resp = requests.get(GITHUB_API.format(owner=owner, repo=repo),
-                            headers=headers, timeout=10)
-        if resp.status_code == 200:
-            data = resp.json()
-            pushed_at = data.get('pushed_at')
-            result = {
-                'repo': key,
-                'pushed_at': pushed_at,
-                'archived': bool(data.get('archived')),
-                'days_since_commit': days_since(pushed_at),
-                'stars': data.get('stargazers_count'),
-            }
-    except (requests.exceptions.RequestException, ValueError):
-        result = None
+    if isinstance(data, dict):
+        result = _github_result(f'{owner}/{repo}', data.get('pushed_at'), data.get('archived'),
+                                data.get('stargazers_count'))
 
     cache[key] = result
     return result
 
 
-def fetch_hf(kind, repo_id, cache):
+def fetch_hf(kind, repo_id, cache, store):
     """Fetch {downloads, likes, last_modified} for an HF asset, cached. None on failure."""
-    import requests
     key = f'{kind}/{repo_id}'
     if key in cache:
         return cache[key]
 
     headers = {'User-Agent': 'FairForward-DataCatalog/1.0'}
+    body, _ = store.fetch(hf_cache_key(kind, repo_id), HF_API.format(kind=kind, repo_id=repo_id),
+                          headers=headers, ttl_hours=args.api_cache_ttl)
+    data = _load_json(body)
     result = None
-    try:
-        resp = requests.get(HF_API.format(kind=kind, repo_id=repo_id),
-                            headers=headers, timeout=10)
-        if resp.status_code == 200:
-            data = resp.json()
-            last_modified = data.get('lastModified')
-            result = {
-                'id': repo_id,
-                'kind': kind,
-                'downloads': data.get('downloads'),
-                'likes': data.get('likes'),
-                'last_modified': last_modified,
-                'days_since_modified': days_since(last_modified),
-            }
-    except (requests.exceptions.RequestException, ValueError):
-        result = None
+    if isinstance(data, dict):
+        last_modified = data.get('lastModified')
+        result = {
+            'id': repo_id,
+            'kind': kind,
+            'downloads': data.get('downloads'),
+            'likes': data.get('likes'),
+            'last_modified': last_modified,
+            'days_since_modified': days_since(last_modified),
+        }
 
     cache[key] = result
     return result
@@ -296,7 +424,7 @@ def compute_activity(context, github, hf):
     return round(100 * sum(value * w for value, w in parts) / total_weight)
 
 
-def build_entry_health(entry, link_results, checked_at, gh_cache, hf_cache):
+def build_entry_health(entry, link_results, checked_at, gh_cache, hf_cache, store):
     """Assemble the health record for one catalog entry, or None if it has no in-scope links."""
     urls = in_scope_urls(entry)
     if not urls:
@@ -315,11 +443,11 @@ def build_entry_health(entry, link_results, checked_at, gh_cache, hf_cache):
         if github is None:
             gh = parse_github(url)
             if gh:
-                github = fetch_github(gh[0], gh[1], gh_cache)
+                github = fetch_github(gh[0], gh[1], gh_cache, store)
         if hf is None:
             parsed = parse_hf(url)
             if parsed:
-                hf = fetch_hf(parsed[0], parsed[1], hf_cache)
+                hf = fetch_hf(parsed[0], parsed[1], hf_cache, store)
 
     context = compute_context(has_archive, github, hf)
 
@@ -350,30 +478,42 @@ def main():
     for p in projects:
         all_urls.extend(in_scope_urls(p))
     print(f'Checking reachability of {len(set(all_urls))} unique links...')
-    link_results = check_urls(all_urls)
+    link_results = check_urls(all_urls, ttl_hours=args.url_cache_ttl)
 
     gh_cache, hf_cache = {}, {}
     entries = {}
-    for p in projects:
-        pid = p.get('id')
-        if not pid:
-            continue
-        record = build_entry_health(p, link_results, checked_at, gh_cache, hf_cache)
-        if record:
-            entries[pid] = record
+    with HttpCache() as store:
+        repos = [gh for p in projects for gh in github_repos(p)]
+        batched = prefetch_github(repos, gh_cache, store, args.api_cache_ttl)
+        if batched:
+            print(f'  Resolved {batched} GitHub repos via batched GraphQL')
+        for p in projects:
+            pid = p.get('id')
+            if not pid:
+                continue
+            record = build_entry_health(p, link_results, checked_at, gh_cache, hf_cache, store)
+            if record:
+                entries[pid] = record
 
     available = sum(1 for r in entries.values() if r['availability'] == 'available')
     print(f'  {len(entries)} entries with links | {available} available, '
           f'{len(entries) - available} unavailable')
 
     output = {'generated_at': checked_at, 'entries': entries}
+    # This job publishes health.json outside the build, so it refreshes what is
+    # derived from it itself: the ranked catalog-index.json next to each copy (the
+    # catalog page reads health from there).
     for path in args.outputs:
         directory = os.path.dirname(path)
         if directory:
             os.makedirs(directory, exist_ok=True)
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
+            json.dump(output, f, ensure_ascii=False, separators=SERVED_JSON_SEPARATORS)
         print(f'  Wrote {path}')
+        catalog_path = os.path.join(directory, 'catalog.json')
+        if os.path.exists(catalog_path):
+            index_path = os.path.join(directory, 'catalog-index.json')
+            generate_index(catalog_path=catalog_path, health_path=path, output_path=index_path)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,246 @@
+"""
+Persistent cache for network lookups that the build and the scheduled jobs repeat.
+
+Lives in one SQLite file under data_sources/ so it survives between runs. The file is
+git-ignored; the CI workflows restore the newest copy with actions/cache before they
+run and save it again afterwards, so the sheet sync and the health check share it
+without it churning through history. Every table is keyed by the thing being looked up and records when it
+was last checked, so callers decide freshness with their own TTL.
+
+Tables:
+  url_checks -- link reachability for utils.check_urls: last good status plus the
+                ETag / Last-Modified validators the server sent, so a re-check can be
+                a conditional request answered with a bodyless 304.
+  api_metadata -- GitHub / Hugging Face API documents (repo metadata, READMEs) that
+                health_check.py and enrich_data.py both read, keyed by platform and
+                repo id ('github:owner/repo', 'hf:models/org/name'), with the ETag /
+                Last-Modified validators and when the body was fetched. Also
+                download_placeholder_images.py's Pexels / Unsplash search result
+                pages, keyed 'image_search:<provider>:<query>'.
+  llm_results  -- enrich_data.py's LLM completions, keyed by endpoint, model and a hash of
+                prompt, field and source text (enrich_data.llm_cache_key). They never expire:
+                any change to what would be sent changes the key.
+
+Only successful checks are stored. A failure is re-probed on the next run rather
+than remembered: link checks see transient outages and bot-detection blocks, and a
+cached failure would keep a healthy link flagged for a whole TTL.
+
+API metadata is revalidated rather than re-downloaded once it is older than its TTL.
+GitHub answers a conditional request for an unchanged repo with a 304 and does not
+count that against the rate limit, which is what keeps unauthenticated runs (60
+requests an hour) working as the catalogue grows. When the API refuses or fails --
+rate limited, 5xx, timeout -- the stored body is served stale: a week-old star
+count is better than no health signal. A 404/410 drops the entry.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_PATH = os.path.join("data_sources", "http_cache.sqlite")
+
+# How long a successful link check stays trusted before it is re-probed. The sheet
+# sync runs several times a day and reuses its own recent checks; the weekly health
+# check uses the same TTL (pass --url-cache-ttl 0 to re-probe every link), so it
+# only reuses checks from the past day. Failures are never cached and always re-probed.
+URL_CHECK_TTL_HOURS = 24
+
+# How long an API document is used without asking the API again. Past this it is
+# revalidated with a conditional request, which is cheap when nothing changed.
+METADATA_TTL_HOURS = 24
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS url_checks (
+    url TEXT PRIMARY KEY,
+    status INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS api_metadata (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    body TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS llm_results (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    field TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class HttpCache:
+    """Thin wrapper over the SQLite cache file.
+
+    One instance may be shared by worker threads (enrich_data.py fetches concurrently):
+    statements are serialised on a lock, and fetch() holds it only around the lookups,
+    never across the network request. Every write is committed straight away, so a
+    connection never sits on SQLite's write lock and a crash loses nothing already
+    stored.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+    def _execute(self, sql, params=(), fetch=False):
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            if fetch:
+                row = cursor.fetchone()
+                return dict(row) if row else None
+            self.conn.commit()
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- url_checks ---------------------------------------------------------------
+
+    def get_url_check(self, url):
+        """Return the stored check for url as a dict, or None."""
+        return self._execute(
+            "SELECT url, status, etag, last_modified, checked_at FROM url_checks WHERE url = ?",
+            (url,), fetch=True,
+        )
+
+    def put_url_check(self, url, status, etag=None, last_modified=None, checked_at=None):
+        self._execute(
+            "INSERT OR REPLACE INTO url_checks (url, status, etag, last_modified, checked_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (url, status, etag, last_modified, checked_at or time.time()),
+        )
+
+    def forget_url_check(self, url):
+        self._execute("DELETE FROM url_checks WHERE url = ?", (url,))
+
+    # -- api_metadata -------------------------------------------------------------
+
+    def get_metadata(self, key):
+        """Return the stored API document for key as a dict, or None."""
+        return self._execute(
+            "SELECT key, url, body, etag, last_modified, fetched_at, checked_at "
+            "FROM api_metadata WHERE key = ?",
+            (key,), fetch=True,
+        )
+
+    def put_metadata(self, key, url, body, etag=None, last_modified=None, fetched_at=None):
+        now = fetched_at or time.time()
+        self._execute(
+            "INSERT OR REPLACE INTO api_metadata "
+            "(key, url, body, etag, last_modified, fetched_at, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, url, body, etag, last_modified, now, now),
+        )
+
+    def touch_metadata(self, key, checked_at=None):
+        """Mark a stored document as confirmed unchanged (a 304) without refetching it."""
+        self._execute("UPDATE api_metadata SET checked_at = ? WHERE key = ?",
+                      (checked_at or time.time(), key))
+
+    def forget_metadata(self, key):
+        self._execute("DELETE FROM api_metadata WHERE key = ?", (key,))
+
+    def fetch(self, key, url, headers=None, ttl_hours=None, request=None, timeout=10):
+        """GET url through the api_metadata table; returns (body, response).
+
+        body is the response text (fresh, revalidated or stale -- see the module
+        docstring), or None when there is nothing usable. response is the live
+        requests.Response, or None when the stored copy was within ttl_hours and no
+        request was made; callers read rate-limit headers from it. request, if given,
+        is called as request(url, headers) and returns a Response or None (enrich_data
+        passes its retrying GET); by default a single requests.get is made.
+        """
+        if ttl_hours is None:
+            ttl_hours = METADATA_TTL_HOURS
+        stored = self.get_metadata(key)
+        if stored and is_fresh(stored['checked_at'], ttl_hours):
+            return stored['body'], None
+
+        headers = dict(headers or {})
+        if stored and stored['etag']:
+            headers['If-None-Match'] = stored['etag']
+        elif stored and stored['last_modified']:
+            headers['If-Modified-Since'] = stored['last_modified']
+
+        if request is None:
+            import requests
+
+            def request(u, h):
+                try:
+                    return requests.get(u, headers=h, timeout=timeout)
+                except requests.exceptions.RequestException:
+                    return None
+
+        resp = request(url, headers)
+        if resp is None:
+            return (stored['body'] if stored else None), None
+        if resp.status_code == 304 and stored:
+            self.touch_metadata(key)
+            return stored['body'], resp
+        if resp.status_code == 200:
+            self.put_metadata(key, url, resp.text, resp.headers.get('ETag'),
+                              resp.headers.get('Last-Modified'))
+            return resp.text, resp
+        if resp.status_code in (404, 410):
+            self.forget_metadata(key)
+            return None, resp
+        return (stored['body'] if stored else None), resp
+
+    # -- llm_results --------------------------------------------------------------
+
+    def get_llm_result(self, key):
+        """Return the cached completion text for key ('' is a cached "nothing found"), or None."""
+        row = self._execute("SELECT result FROM llm_results WHERE key = ?", (key,), fetch=True)
+        return row['result'] if row else None
+
+    def put_llm_result(self, key, model, field, result):
+        self._execute(
+            "INSERT OR REPLACE INTO llm_results (key, model, field, result, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, model, field, result, time.time()),
+        )
+
+
+def github_cache_key(owner, repo, resource='repo'):
+    """api_metadata key for a GitHub repo document. GitHub names are case-insensitive."""
+    suffix = '' if resource == 'repo' else f':{resource}'
+    return f"github:{owner}/{repo}".lower() + suffix
+
+
+def hf_cache_key(kind, repo_id):
+    """api_metadata key for a Hugging Face asset; kind is 'models' | 'datasets' | 'spaces'."""
+    return f"hf:{kind}/{repo_id}"
+
+
+def image_search_cache_key(provider, query):
+    """api_metadata key for a stock photo search; queries differing only in case or
+    spacing share a page."""
+    return f"image_search:{provider}:{' '.join(query.lower().split())}"
+
+
+def is_fresh(checked_at, ttl_hours):
+    """True when a record checked at checked_at (epoch seconds) is within ttl_hours."""
+    return ttl_hours > 0 and (time.time() - checked_at) < ttl_hours * 3600
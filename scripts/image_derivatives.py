@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Resized WebP/AVIF copies of each project's cover image, for responsive <img>/CSS.
+
+The cover generate_catalog_data.py publishes is the first file in
+public/projects/<id>/images/, and those are full-resolution JPEGs and PNGs: stock
+placeholders saved by download_placeholder_images.py at the provider's full size,
+and partner photos straight off a camera. Cards render them a few hundred pixels
+wide, so a phone on the catalog page downloaded megabytes per row of cards.
+
+For every cover this writes one file per width in WIDTHS (never wider than the
+original) and per format: WebP always, AVIF when the installed Pillow can encode
+it (Pillow >= 11.3, or the pillow-avif-plugin package). Orientation from EXIF is
+applied to the pixels and the EXIF block itself (camera model, GPS position, ...)
+is not copied; the ICC profile is kept so colours stay as the partner shot them.
+
+Outputs are content-addressed: public/img/derived/<sha256[:16]>-<width>.<ext>,
+keyed by the source file's bytes. A renamed project directory or a placeholder
+shared by two projects therefore reuses the same files, and a source is only
+decoded again when its bytes change (or DERIVATIVES_VERSION is bumped after a
+change to the encoder settings). manifest.json records each cover's sha256 and,
+per source hash, the intrinsic size and the variants -- nothing tied to the
+checkout (the size/mtime memo that spares re-hashing is utils.FileHashMemo's
+local, git-ignored file), so it only changes when a cover does. get_project_image()
+reads it to publish
+`image_srcset` next to `image`. The original stays the `image` field: it is what
+og:image, the API and browsers without WebP use.
+
+Pillow is optional. Without it this prints a notice and leaves the existing
+manifest and files alone, so a checkout without Pillow still builds the catalog
+with whatever derivatives were committed last.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+from utils import ProjectTree, FileHashMemo
+
+DERIVED_DIR = os.path.join('public', 'img', 'derived')
+MANIFEST_PATH = os.path.join(DERIVED_DIR, 'manifest.json')
+# Site-root URL of DERIVED_DIR (public/ is served at the root).
+DERIVED_URL = '/img/derived'
+
+# Card thumbnails are ~360 CSS px wide (x2 on high-DPI phones); the detail panel's
+# cover rail is the widest place a cover is shown.
+WIDTHS = (320, 640, 1280)
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+# Bump when the settings above change so every cached derivative is rebuilt.
+DERIVATIVES_VERSION = 1
+
+# Preferred first: the browser takes the first type it supports.
+FORMATS = (
+    ('avif', 'image/avif'),
+    ('webp', 'image/webp'),
+)
+
+
+def load_pillow():
+    """(Image, ImageOps) from Pillow, or (None, None) when it is not installed."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None, None
+    try:
+        import pillow_avif  # noqa: F401  (registers the AVIF plugin on older Pillow)
+    except ImportError:
+        pass
+    return Image, ImageOps
+
+
+def available_formats(Image):
+    """The FORMATS entries the installed Pillow can write."""
+    Image.init()
+    return [(ext, mime) for ext, mime in FORMATS if ext.upper() in Image.SAVE]
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """The manifest, or an empty one when it is missing, unreadable or outdated."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'version': DERIVATIVES_VERSION, 'sources': {}, 'images': {}}
+    manifest.setdefault('sources', {})
+    manifest.setdefault('images', {})
+    return manifest
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def target_widths(width):
+    """WIDTHS that do not upscale; the original width when it is below all of them."""
+    widths = [w for w in WIDTHS if w < width]
+    return widths + [width] if not widths or width <= WIDTHS[-1] else widths
+
+
+def variant_name(digest, width, ext):
+    return f"{digest[:16]}-{width}.{ext}"
+
+
+def _prepare(img, ImageOps):
+    """Upright pixels in a mode both encoders take, without the EXIF block."""
+    img = ImageOps.exif_transpose(img)
+    has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+    img = img.convert('RGBA' if has_alpha else 'RGB')
+    return img
+
+
+def render_derivatives(path, digest, formats, Image, ImageOps, output_dir=DERIVED_DIR):
+    """Write every variant of one source; returns its manifest entry.
+
+    Variants already on disk are kept: their name is derived from the source bytes,
+    so an existing file is the same output.
+    """
+    with Image.open(path) as src:
+        icc_profile = src.info.get('icc_profile')
+        img = _prepare(src, ImageOps)
+    width, height = img.size
+    sources = []
+    for ext, mime in formats:
+        srcset = []
+        for w in target_widths(width):
+            h = max(1, round(height * w / width))
+            name = variant_name(digest, w, ext)
+            out = os.path.join(output_dir, name)
+            if not os.path.exists(out):
+                resized = img if w == width else img.resize((w, h), Image.LANCZOS)
+                resized.info = {}
+                options = {'quality': AVIF_QUALITY if ext == 'avif' else WEBP_QUALITY}
+                if icc_profile:
+                    options['icc_profile'] = icc_profile
+                tmp = out + '.tmp'
+                resized.save(tmp, format=ext.upper(), **options)
+                os.replace(tmp, out)
+            srcset.append({'url': f"{DERIVED_URL}/{name}", 'width': w, 'height': h})
+        sources.append({'type': mime, 'srcset': srcset})
+    return {'width': width, 'height': height, 'sources': sources}
+
+
+def cover_images(tree):
+    """(site URL, file path) of each project's cover, as get_project_image picks it."""
+    covers = []
+    for name in sorted(tree.projects):
+        images = tree.images(name)
+        if images:
+            covers.append((f"/projects/{name}/images/{images[0]}",
+                           os.path.join(tree.projects_dir, name, 'images', images[0])))
+    return covers
+
+
+def prune(manifest, output_dir=DERIVED_DIR):
+    """Delete derived files no manifest entry points at; returns how many."""
+    keep = {os.path.basename(MANIFEST_PATH)}
+    for entry in manifest['images'].values():
+        for source in entry['sources']:
+            keep.update(v['url'].rsplit('/', 1)[-1] for v in source['srcset'])
+    removed = 0
+    for name in os.listdir(output_dir):
+        if name not in keep:
+            os.remove(os.path.join(output_dir, name))
+            removed += 1
+    return removed
+
+
+def generate_derivatives(tree=None, output_dir=DERIVED_DIR, manifest_path=MANIFEST_PATH):
+    """Bring DERIVED_DIR and its manifest in line with the current covers.
+
+    Returns the manifest, or None when Pillow is not installed (nothing changed).
+    """
+    Image, ImageOps = load_pillow()
+    if Image is None:
+        print("  Pillow not installed; keeping existing image derivatives "
+              "(pip install Pillow to regenerate)")
+        return None
+    formats = available_formats(Image)
+    if not any(ext == 'webp' for ext, _ in formats):
+        print("  This Pillow build cannot write WebP; keeping existing image derivatives")
+        return None
+    tree = tree or ProjectTree()
+    old = load_manifest(manifest_path)
+    fresh = old.get('version') == DERIVATIVES_VERSION
+    manifest = {'version': DERIVATIVES_VERSION, 'sources': {}, 'images': {}}
+    memo = FileHashMemo()
+    os.makedirs(output_dir, exist_ok=True)
+    rendered = reused = failed = 0
+    for url, path in cover_images(tree):
+        digest = memo.sha256(path)
+        manifest['sources'][url] = digest
+        if digest in manifest['images']:
+            continue
+        cached = old['images'].get(digest) if fresh else None
+        if cached and all(os.path.exists(os.path.join(output_dir, v['url'].rsplit('/', 1)[-1]))
+                          for s in cached['sources'] for v in s['srcset']):
+            manifest['images'][digest] = cached
+            reused += 1
+            continue
+        try:
+            manifest['images'][digest] = render_derivatives(
+                path, digest, formats, Image, ImageOps, output_dir)
+            rendered += 1
+        except (OSError, ValueError) as e:
+            # A truncated or unsupported file keeps its original as the only image.
+            print(f"  Skipping {url}: {e}")
+            failed += 1
+    memo.save()
+    if manifest != old:
+        save_manifest(manifest, manifest_path)
+    removed = prune(manifest, output_dir)
+    print(f"Image derivatives: {rendered} rendered, {reused} cached, {failed} failed, "
+          f"{removed} stale file(s) removed ({', '.join(ext for ext, _ in formats)})")
+    return manifest
+
+
+def project_srcset(url, path, manifest):
+    """The manifest entry for the cover at url (file at path), or None.
+
+    Looked up by URL first; a cover whose directory was renamed since the stage ran
+    is found again by hashing the file.
+    """
+    if not url or not manifest or not manifest.get('images'):
+        return None
+    digest = manifest.get('sources', {}).get(url)
+    if not isinstance(digest, str) or digest not in manifest['images']:
+        try:
+            digest = file_sha256(path)
+        except OSError:
+            return None
+    return manifest['images'].get(digest)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Write resized WebP/AVIF copies of project cover images to public/img/derived.')
+    parser.parse_args()
+    generate_derivatives()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+One fetch of the Google Sheet per run, kept in a deduplicated backup store.
+
+The sheet used to be read in full by build_and_sync.py (plus a CSV backup), again
+by backup_google_sheet.py, and again by validate_data.py and enrich_data.py before
+they wrote back to it. Now the first reader in a run calls get_all_values() once
+and adds the grid (header row, explanation row, then one row per project) to the
+store in data_sources/google_sheets_backup/. Later readers in the same run call
+sheet_values(), which returns that run's snapshot and only fetches (and stores) a
+new one when there is none. A run is identified explicitly: build_and_sync.py sets
+SHEET_SNAPSHOT_RUN (a fresh id, unless the caller already set one) before it takes
+its snapshot, the scripts it starts inherit it, and take_snapshot() records which
+state that run saw in RUN_STATE_PATH, a local file under the git-ignored
+data_sources/sheet_cache/. A script run on its own, outside any run, always
+fetches.
+
+Callers that write back into cells must not trust a snapshot for "is this cell
+still empty?": a partner may have typed into it since. They re-read the cells they
+are about to write (enrich_data.write_enrichment_to_sheet does).
+
+The store grows with edits to the sheet, not with the number of runs:
+
+  manifest.json     one entry per distinct sheet state: its sha256, the file that
+                    holds it, and when it was first seen.
+  base_<ts>_<hash>.json.gz
+                    a full copy of the grid.
+  delta_<ts>_<hash>.json.gz
+                    the grid as row-level edits against a base: runs of base rows
+                    to copy plus the rows that differ.
+
+A snapshot identical to the newest entry changes nothing, so a run over an
+unchanged sheet leaves the committed store as it was; one identical to an older
+state (an edit that was reverted) reuses that state's file.
+Anything else is written as a delta against the current base, or as a new base
+every BASE_INTERVAL deltas or when the delta stops being small. Restoring any
+state therefore reads at most two files, and every restore is checked against the
+recorded hash.
+
+CLI:
+    python scripts/sheet_snapshot.py list
+    python scripts/sheet_snapshot.py restore 2026-06-26 --output sheet.csv
+    python scripts/sheet_snapshot.py import-csv data_sources/google_sheets_backup/sheet_backup_*.csv
+"""
+
+import argparse
+import csv
+import difflib
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+SNAPSHOT_DIR = os.path.join('data_sources', 'google_sheets_backup')
+MANIFEST_NAME = 'manifest.json'
+
+# Environment variable naming the current run; see the module docstring.
+RUN_ENV = 'SHEET_SNAPSHOT_RUN'
+# Which state the current run saw. Local and git-ignored: it only links the steps
+# of one run on one machine.
+RUN_STATE_PATH = os.path.join('data_sources', 'sheet_cache', 'snapshot_run.json')
+
+# A new full base after this many deltas against the current one...
+BASE_INTERVAL = 30
+# ...or as soon as a delta's payload exceeds this fraction of the base's.
+BASE_DELTA_RATIO = 0.5
+
+_TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+_LEGACY_CSV_RE = re.compile(r'(\d{8})(?:_(\d{6}))?\.csv$')
+
+
+def values_hash(values):
+    """sha256 hex digest of a get_all_values() grid."""
+    return hashlib.sha256(_dumps(values)).hexdigest()
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _parse_time(text):
+    return datetime.strptime(text, _TIME_FORMAT).replace(tzinfo=timezone.utc)
+
+
+# -- files ------------------------------------------------------------------------
+
+def _write_gz(path, data):
+    with open(path, 'wb') as f:
+        f.write(gzip.compress(_dumps(data), compresslevel=9, mtime=0))
+
+
+def _read_gz(path):
+    with open(path, 'rb') as f:
+        return json.loads(gzip.decompress(f.read()).decode('utf-8'))
+
+
+def load_manifest(directory=SNAPSHOT_DIR):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'format': 1, 'entries': []}
+
+
+def _save_manifest(manifest, directory):
+    path = os.path.join(directory, MANIFEST_NAME)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+# -- deltas -----------------------------------------------------------------------
+
+def make_delta(base, values):
+    """Row-level edit script turning base into values.
+
+    A list of ops: ["copy", start, end] takes base[start:end]; ["rows", [...]] adds
+    the given rows. Inserted, deleted and moved-down rows cost nothing beyond the
+    rows that actually changed.
+    """
+    base_keys = [_dumps(row) for row in base]
+    value_keys = [_dumps(row) for row in values]
+    matcher = difflib.SequenceMatcher(None, base_keys, value_keys, autojunk=False)
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append(['copy', i1, i2])
+        elif j2 > j1:
+            ops.append(['rows', values[j1:j2]])
+    return ops
+
+
+def apply_delta(base, ops):
+    values = []
+    for op in ops:
+        if op[0] == 'copy':
+            values.extend(base[op[1]:op[2]])
+        else:
+            values.extend(op[1])
+    return values
+
+
+# -- store ------------------------------------------------------------------------
+
+def _entry_values(entry, directory, cache=None):
+    """Reconstruct an entry's grid and check it against the recorded hash."""
+    cache = {} if cache is None else cache
+
+    def load(name):
+        if name not in cache:
+            cache[name] = _read_gz(os.path.join(directory, name))
+        return cache[name]
+
+    doc = load(entry['file'])
+    if entry['kind'] == 'base':
+        values = doc['values']
+    else:
+        values = apply_delta(load(doc['base'])['values'], doc['ops'])
+    if values_hash(values) != entry['sha256']:
+        raise ValueError(f"Snapshot {entry['file']} does not match its recorded hash")
+    return values
+
+
+def add_snapshot(values, title='', directory=SNAPSHOT_DIR, taken_at=None):
+    """Add a grid to the store; returns the snapshot dict.
+
+    The dict has taken_at, sha256, title, values, and path (the file holding the
+    state) plus 'stored': 'base' | 'delta' | 'unchanged' | 'reverted'.
+    """
+    taken_at = taken_at or _now()
+    stamp = taken_at.strftime(_TIME_FORMAT)
+    digest = values_hash(values)
+    os.makedirs(directory, exist_ok=True)
+    manifest = load_manifest(directory)
+    entries = manifest['entries']
+
+    def result(entry, stored):
+        return {'taken_at': stamp, 'sha256': digest, 'title': title, 'values': values,
+                'path': os.path.join(directory, entry['file']), 'stored': stored}
+
+    if entries and entries[-1]['sha256'] == digest:
+        return result(entries[-1], 'unchanged')
+
+    entry = {'sha256': digest, 'title': title, 'rows': len(values), 'first_seen': stamp}
+    previous = next((e for e in reversed(entries) if e['sha256'] == digest), None)
+    if previous is not None:
+        entry.update(kind=previous['kind'], file=previous['file'])
+        entries.append(entry)
+        _save_manifest(manifest, directory)
+        return result(entry, 'reverted')
+
+    name_stamp = taken_at.strftime('%Y%m%d_%H%M%S')
+    base_entry = next((e for e in reversed(entries) if e['kind'] == 'base'), None)
+    ops = None
+    if base_entry is not None:
+        since_base = {e['file'] for e in entries[entries.index(base_entry) + 1:]
+                      if e['kind'] == 'delta'}
+        if len(since_base) < BASE_INTERVAL:
+            base_values = _entry_values(base_entry, directory)
+            ops = make_delta(base_values, values)
+            if len(_dumps(ops)) > BASE_DELTA_RATIO * len(_dumps(base_values)):
+                ops = None
+
+    if ops is None:
+        entry.update(kind='base', file=f'base_{name_stamp}_{digest[:12]}.json.gz')
+        _write_gz(os.path.join(directory, entry['file']), {'values': values})
+    else:
+        entry.update(kind='delta', file=f'delta_{name_stamp}_{digest[:12]}.json.gz')
+        _write_gz(os.path.join(directory, entry['file']),
+                  {'base': base_entry['file'], 'ops': ops})
+    entries.append(entry)
+    _save_manifest(manifest, directory)
+    return result(entry, entry['kind'])
+
+
+def snapshot_at(when=None, directory=SNAPSHOT_DIR):
+    """The sheet as stored at datetime when (default: newest), or None if none yet.
+
+    A state applies from its first_seen until the next state was seen.
+    """
+    entries = load_manifest(directory)['entries']
+    if when is not None:
+        stamp = when.strftime(_TIME_FORMAT)
+        entries = [e for e in entries if e['first_seen'] <= stamp]
+    if not entries:
+        return None
+    entry = entries[-1]
+    return {'taken_at': entry['first_seen'], 'sha256': entry['sha256'],
+            'title': entry.get('title', ''), 'values': _entry_values(entry, directory),
+            'path': os.path.join(directory, entry['file'])}
+
+
+def new_run_id():
+    """An id for SHEET_SNAPSHOT_RUN, unique per sync run."""
+    return f"{_now().strftime('%Y%m%dT%H%M%SZ')}-{os.getpid()}"
+
+
+def _record_run(run_id, digest, directory, path=RUN_STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'run': run_id, 'sha256': digest, 'directory': directory}, f)
+
+
+def run_snapshot(run_id, path=RUN_STATE_PATH):
+    """The snapshot run_id took, or None when that run took none (or no run is set).
+
+    Read from the store the run wrote to, which may be a --backup-dir elsewhere.
+    """
+    if not run_id:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get('run') != run_id:
+        return None
+    directory = state.get('directory') or SNAPSHOT_DIR
+    entry = next((e for e in reversed(load_manifest(directory)['entries'])
+                  if e['sha256'] == state.get('sha256')), None)
+    if entry is None:
+        return None
+    return {'taken_at': entry['first_seen'], 'sha256': entry['sha256'],
+            'title': entry.get('title', ''), 'values': _entry_values(entry, directory),
+            'path': os.path.join(directory, entry['file'])}
+
+
+def take_snapshot(sheet, directory=SNAPSHOT_DIR):
+    """Fetch the sheet's values (one API read) and store them; returns the snapshot.
+
+    Within a run (SHEET_SNAPSHOT_RUN set) the snapshot becomes the run's snapshot.
+    """
+    values = sheet.get_all_values()
+    snapshot = add_snapshot(values, sheet.title, directory)
+    run_id = os.environ.get(RUN_ENV)
+    if run_id:
+        _record_run(run_id, snapshot['sha256'], directory)
+    print(f"Sheet snapshot: {len(values)} rows, {snapshot['stored']} "
+          f"({os.path.basename(snapshot['path'])})")
+    return snapshot
+
+
+def sheet_values(sheet, directory=SNAPSHOT_DIR):
+    """The sheet's values: the current run's snapshot if it took one, else a fresh fetch."""
+    snapshot = run_snapshot(os.environ.get(RUN_ENV))
+    if snapshot is not None:
+        print(f"  Using this run's sheet snapshot {snapshot['sha256'][:12]}")
+        return snapshot['values']
+    return take_snapshot(sheet, directory)['values']
+
+
+# -- CLI --------------------------------------------------------------------------
+
+def _parse_when(text):
+    """A date (end of that day, UTC) or a full timestamp."""
+    for fmt, end_of_day in (('%Y-%m-%d', True), ('%Y-%m-%dT%H:%M:%S', False),
+                            ('%Y-%m-%d %H:%M:%S', False)):
+        try:
+            when = datetime.strptime(text.rstrip('Z'), fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        return when.replace(hour=23, minute=59, second=59) if end_of_day else when
+    raise argparse.ArgumentTypeError(f"not a date or timestamp: {text}")
+
+
+def _legacy_csv_time(path):
+    m = _LEGACY_CSV_RE.search(os.path.basename(path))
+    if not m:
+        return None
+    return datetime.strptime(m.group(1) + (m.group(2) or '000000'),
+                             '%Y%m%d%H%M%S').replace(tzinfo=timezone.utc)
+
+
+def cmd_list(cli_args):
+    entries = load_manifest(cli_args.dir)['entries']
+    if not entries:
+        print(f"No snapshots in {cli_args.dir}")
+        return
+    for e, following in zip(entries, entries[1:] + [None]):
+        until = following['first_seen'] if following else 'now'
+        print(f"{e['first_seen']}  ->  {until:<20}  {e['sha256'][:12]}  "
+              f"{e['rows']:>4} rows  {e['kind']:<5}  {e['file']}")
+    files = {e['file'] for e in entries}
+    size = sum(os.path.getsize(os.path.join(cli_args.dir, f)) for f in files)
+    print(f"{len(entries)} state(s) in {len(files)} file(s), {size / 1024:.0f} KiB")
+
+
+def cmd_restore(cli_args):
+    snapshot = snapshot_at(cli_args.when, cli_args.dir)
+    if snapshot is None:
+        print(f"No snapshot at or before {cli_args.when.strftime(_TIME_FORMAT)}", file=sys.stderr)
+        sys.exit(1)
+    out = open(cli_args.output, 'w', newline='', encoding='utf-8') if cli_args.output else sys.stdout
+    try:
+        csv.writer(out).writerows(snapshot['values'])
+    finally:
+        if cli_args.output:
+            out.close()
+    if cli_args.output:
+        print(f"Restored snapshot {snapshot['sha256'][:12]} (first seen {snapshot['taken_at']}, "
+              f"{len(snapshot['values'])} rows) to {cli_args.output}")
+
+
+def cmd_import_csv(cli_args):
+    entries = load_manifest(cli_args.dir)['entries']
+    newest = _parse_time(entries[-1]['first_seen']) if entries else None
+    dated = sorted((t, p) for p in cli_args.files if (t := _legacy_csv_time(p)) is not None)
+    counts = {}
+    for taken_at, path in dated:
+        if newest is not None and taken_at <= newest:
+            print(f"  Skipping {path}: older than the newest stored snapshot")
+            continue
+        with open(path, newline='', encoding='utf-8') as f:
+            values = list(csv.reader(f))
+        stored = add_snapshot(values, '', cli_args.dir, taken_at)['stored']
+        counts[stored] = counts.get(stored, 0) + 1
+        newest = taken_at
+    print(f"Imported {sum(counts.values())} CSV backup(s): "
+          + ', '.join(f'{n} {kind}' for kind, n in sorted(counts.items())))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Inspect and restore the Google Sheet backup store.')
+    parser.add_argument('--dir', default=SNAPSHOT_DIR, help='Backup store directory')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help='List stored sheet states').set_defaults(func=cmd_list)
+    restore = sub.add_parser('restore', help='Write the sheet as it was at a date/time as CSV')
+    restore.add_argument('when', type=_parse_when,
+                         help='YYYY-MM-DD (end of that day, UTC) or YYYY-MM-DDTHH:MM:SS')
+    restore.add_argument('--output', help='CSV path (default: stdout)')
+    restore.set_defaults(func=cmd_restore)
+    importer = sub.add_parser('import-csv', help='Add legacy sheet_backup_*.csv files to the store')
+    importer.add_argument('files', nargs='+', help='CSV backups named ..._YYYYMMDD[_HHMMSS].csv')
+    importer.set_defaults(func=cmd_import_csv)
+    cli_args = parser.parse_args()
+    cli_args.func(cli_args)
@@ -9,6 +9,12 @@ PROJECTS_DIR = os.path.join("public", "projects")
 SITE_BASE = "https://fair-forward.github.io/datasets/"  # authoritative base, trailing slash
 SITE_NAME = "FAIR Forward"                              # keep in sync with src/utils/site.js
 
+# JSON the site fetches (catalog.json and its shards, the catalog index, insights,
+# health, the API) is written without whitespace: indentation was a fifth of
+# catalog.json's bytes, and Pages compresses what is left on the fly. Reading the
+# files is a `python -m json.tool` away; build inputs and caches stay indented.
+SERVED_JSON_SEPARATORS = (",", ":")
+
 # Web analytics: Umami Cloud, EU region. Cookieless and stores no personal data, so the
 # site needs no consent banner; what it does collect is described at /privacy/.
 #
@@ -85,6 +91,183 @@ def get_gsheet_client(credentials_path=None):
     return client, spreadsheet, sheet
 
 
+# Requests per spreadsheets.batchUpdate call. The API takes more, but one very large
+# body is slow to apply and all-or-nothing; a few hundred per call keeps each one
+# quick while still turning a nightly run into a handful of write requests.
+SHEETS_BATCH_CHUNK = 500
+# Status codes worth retrying: per-minute write quota, and transient server errors.
+_SHEETS_RETRY_STATUSES = {429, 500, 502, 503}
+
+
+def sheets_batch_update(spreadsheet, requests, chunk_size=SHEETS_BATCH_CHUNK,
+                        max_attempts=5, base_delay=2.0):
+    """Send Sheets API requests via spreadsheet.batch_update in chunks, with backoff.
+
+    A chunk rejected with a quota (429) or server error is retried after an
+    exponentially growing, jittered delay; any other error is raised. Returns the
+    number of batchUpdate calls made.
+    """
+    import random
+    import time
+    import gspread
+
+    calls = 0
+    for start in range(0, len(requests), chunk_size):
+        body = {'requests': requests[start:start + chunk_size]}
+        for attempt in range(max_attempts):
+            try:
+                spreadsheet.batch_update(body)
+                calls += 1
+                break
+            except gspread.exceptions.APIError as e:
+                status = getattr(getattr(e, 'response', None), 'status_code', None)
+                if status not in _SHEETS_RETRY_STATUSES or attempt + 1 == max_attempts:
+                    raise
+                delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
+                print(f"  Sheets API returned {status}; retrying in {delay:.1f}s")
+                time.sleep(delay)
+    return calls
+
+
+# Columnar copy of the normalized sheet (data_catalog.xlsx as pd.read_excel returns
+# it). openpyxl parsing is the slowest read in the build and every stage used to
+# repeat it; build_and_sync.py writes this copy right after the workbook and all
+# readers go through load_sheet(). Parquet when pyarrow is installed, otherwise a
+# pandas pickle -- either way exactly the frame read_excel gave, dtypes included.
+# It is a local cache (git-ignored), validated against the workbook on every load.
+SHEET_CACHE_DIR = os.path.join("data_sources", "sheet_cache")
+
+
+def _sheet_cache_format():
+    try:
+        import pyarrow  # noqa: F401
+        return "parquet"
+    except ImportError:
+        return "pickle"
+
+
+def _sheet_cache_paths(excel_path):
+    stem = os.path.splitext(os.path.basename(excel_path))[0]
+    base = os.path.join(SHEET_CACHE_DIR, stem)
+    return base + ".parquet", base + ".pkl", base + ".meta.json"
+
+
+def _file_sha256(path):
+    import hashlib
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_sheet_cache(df, excel_path):
+    """Store df (as read from excel_path) as the columnar copy of that workbook."""
+    import json
+    parquet_path, pickle_path, meta_path = _sheet_cache_paths(excel_path)
+    os.makedirs(SHEET_CACHE_DIR, exist_ok=True)
+    fmt = _sheet_cache_format()
+    if fmt == "parquet":
+        df.to_parquet(parquet_path, index=False)
+    else:
+        df.to_pickle(pickle_path)
+    st = os.stat(excel_path)
+    meta = {"source": excel_path, "format": fmt, "sha256": _file_sha256(excel_path),
+            "size": st.st_size, "mtime_ns": st.st_mtime_ns, "pandas": pd.__version__}
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def _read_sheet_cache(excel_path):
+    """The cached frame for excel_path, or None when missing, stale or unreadable.
+
+    Fresh means same size and mtime as recorded, or -- after a checkout or copy that
+    only touched the mtime -- the same sha256.
+    """
+    import json
+    parquet_path, pickle_path, meta_path = _sheet_cache_paths(excel_path)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        st = os.stat(excel_path)
+    except (OSError, ValueError):
+        return None
+    if meta.get("pandas") != pd.__version__ or meta.get("format") != _sheet_cache_format():
+        return None
+    if (meta.get("size"), meta.get("mtime_ns")) != (st.st_size, st.st_mtime_ns):
+        if meta.get("sha256") != _file_sha256(excel_path):
+            return None
+        meta["mtime_ns"] = st.st_mtime_ns
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+    try:
+        if meta["format"] == "parquet":
+            return pd.read_parquet(parquet_path)
+        return pd.read_pickle(pickle_path)
+    except Exception:
+        return None
+
+
+def load_sheet(excel_path):
+    """The normalized sheet as a DataFrame, from the columnar copy when it is current.
+
+    Falls back to pd.read_excel (and refreshes the copy) when the copy is missing or
+    the workbook changed since it was written.
+    """
+    df = _read_sheet_cache(excel_path)
+    if df is not None:
+        return df
+    df = pd.read_excel(excel_path)
+    try:
+        write_sheet_cache(df, excel_path)
+    except Exception as e:
+        print(f"  Note: could not write the columnar sheet copy ({e})")
+    return df
+
+
+# sha256 of the files under public/ that the asset store and the image derivatives
+# hash, memoised by (size, mtime_ns). Local and git-ignored: mtimes differ on every
+# checkout, so recording them in a committed manifest would rewrite it on every CI
+# run. The committed manifests carry only what the content determines.
+FILE_HASH_MEMO_PATH = os.path.join("data_sources", "file_hashes.json")
+
+
+class FileHashMemo:
+    """sha256 per file path, re-read only when the file's size or mtime changed."""
+
+    def __init__(self, path=FILE_HASH_MEMO_PATH):
+        import json
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.changed = False
+
+    def sha256(self, path):
+        st = os.stat(path)
+        key = path.replace(os.sep, "/")
+        known = self.entries.get(key)
+        if known and known.get("size") == st.st_size and known.get("mtime_ns") == st.st_mtime_ns:
+            return known["sha256"]
+        digest = _file_sha256(path)
+        self.entries[key] = {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        self.changed = True
+        return digest
+
+    def save(self):
+        import json
+        if not self.changed:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        self.changed = False
+
+
 def normalize_sheet_link_cell(value):
     """Strip and normalize Dataset Link / Model Use-Case cell values."""
     if value is None or (isinstance(value, float) and pd.isna(value)):
@@ -131,30 +314,138 @@ _BROWSER_HEADERS = {
 }
 
 
-def _request_url(url, headers, timeout=10):
-    """HEAD a URL (GET fallback on 403/405). Returns (url, status_code, error_name)."""
+# Per-host (concurrent requests, seconds between request starts) for check_urls. These
+# hosts serve most catalogue links and rate-limit or bot-block bursts from one client,
+# which shows up as false "broken link" reports. Subdomains share their parent's limit.
+HOST_LIMITS = {
+    'github.com': (2, 0.5),
+    'huggingface.co': (2, 0.5),
+    'kaggle.com': (1, 1.0),
+}
+_DEFAULT_HOST_LIMIT = (4, 0.0)
+
+
+def _host_key(url):
+    """The HOST_LIMITS entry a URL falls under, else its own lowercased host."""
+    from urllib.parse import urlparse
+    host = (urlparse(url).hostname or '').lower()
+    for known in HOST_LIMITS:
+        if host == known or host.endswith('.' + known):
+            return known
+    return host
+
+
+def _request_url(url, headers, timeout=10, session=None):
+    """HEAD a URL (GET fallback on 403/405).
+
+    Returns (url, status_code, error_name, validators), where validators holds the
+    response's ETag / Last-Modified (None when absent) for the URL check cache.
+    session, when given, supplies a shared connection pool.
+    """
     import requests
+    http = session or requests
     try:
-        resp = requests.head(url, timeout=timeout, allow_redirects=True, headers=headers)
+        resp = http.head(url, timeout=timeout, allow_redirects=True, headers=headers)
         if resp.status_code in (403, 405):
-            resp = requests.get(url, timeout=timeout, allow_redirects=True,
-                                stream=True, headers=headers)
+            resp = http.get(url, timeout=timeout, allow_redirects=True,
+                            stream=True, headers=headers)
             resp.close()
-        return url, resp.status_code, None
+        validators = {'etag': resp.headers.get('ETag'),
+                      'last_modified': resp.headers.get('Last-Modified')}
+        return url, resp.status_code, None, validators
     except requests.exceptions.RequestException as e:
-        return url, None, type(e).__name__
+        return url, None, type(e).__name__, {}
+
 
+async def _probe_urls(urls, cached, max_workers):
+    """Probe urls concurrently; returns {url: (status, error, validators)}.
+
+    One event loop schedules every request. Blocking requests calls run on a bounded
+    thread pool (max_workers in flight overall) over one pooled Session, and each host
+    gets its own semaphore and minimum spacing from HOST_LIMITS. A URL that fails the
+    quick check is retried with browser headers straight away, inside the same loop,
+    rather than after every other URL has finished.
+    """
+    import asyncio
+    import requests
+    from concurrent.futures import ThreadPoolExecutor
+
+    loop = asyncio.get_running_loop()
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    hosts = {}
+
+    def host_state(url):
+        key = _host_key(url)
+        if key not in hosts:
+            limit, delay = HOST_LIMITS.get(key, _DEFAULT_HOST_LIMIT)
+            hosts[key] = {'sem': asyncio.Semaphore(limit), 'lock': asyncio.Lock(),
+                          'delay': delay, 'next_at': 0.0}
+        return hosts[key]
+
+    async def fetch(executor, url, headers):
+        state = host_state(url)
+        async with state['sem']:
+            if state['delay']:
+                async with state['lock']:
+                    wait = state['next_at'] - loop.time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    state['next_at'] = loop.time() + state['delay']
+            return await loop.run_in_executor(executor, _request_url, url, headers, 10, session)
+
+    async def check(executor, url):
+        _, status, error, validators = await fetch(
+            executor, url, _conditional_headers(_QUICK_HEADERS, cached.get(url)))
+        if error or (status and status >= 400):
+            # Bot detection produces many false negatives on the first pass.
+            _, status, error, validators = await fetch(executor, url, _BROWSER_HEADERS)
+        return url, (status, error, validators)
 
-def check_urls(urls, max_workers=10):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            pairs = await asyncio.gather(*(check(executor, u) for u in urls))
+        finally:
+            session.close()
+    return dict(pairs)
+
+
+def _conditional_headers(headers, cached):
+    """Add If-None-Match / If-Modified-Since from a cached check, if it has validators."""
+    if not cached or not (cached.get('etag') or cached.get('last_modified')):
+        return headers
+    headers = dict(headers)
+    if cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+    return headers
+
+
+def check_urls(urls, max_workers=10, cache_path=None, ttl_hours=None):
     """Check a collection of http(s) URLs for reachability.
 
-    Two passes: a quick concurrent check, then a browser-header retry for anything that
-    failed (bot detection produces many false negatives on the first pass). Unsafe schemes
-    and non-http URLs are skipped.
+    Each URL gets a quick check, then a browser-header retry if that failed (bot
+    detection produces many false negatives on the first pass). Requests run on one
+    event loop with per-host concurrency limits and spacing (HOST_LIMITS), so a large
+    batch never hammers a single host; max_workers caps requests in flight overall.
+    Unsafe schemes and non-http URLs are skipped.
+
+    Successful checks persist in the http_cache SQLite file (cache_path, default
+    data_sources/http_cache.sqlite). A URL checked OK within ttl_hours (default
+    http_cache.URL_CHECK_TTL_HOURS) is answered from the cache without a request; an
+    older one is re-checked conditionally, and a 304 counts as still OK. ttl_hours=0
+    re-probes everything. Failures are never cached, so they are always re-probed.
 
     Returns dict: {url: {'ok': bool, 'status': int|None, 'error': str|None}}.
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    import asyncio
+    from http_cache import HttpCache, CACHE_PATH, URL_CHECK_TTL_HOURS, is_fresh
+
+    if ttl_hours is None:
+        ttl_hours = URL_CHECK_TTL_HOURS
 
     unique = [u for u in dict.fromkeys(urls)
               if isinstance(u, str) and u.startswith('http') and _is_safe_url(u)]
@@ -162,23 +453,40 @@ def check_urls(urls, max_workers=10):
     if not unique:
         return results
 
-    failed = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_request_url, u, _QUICK_HEADERS): u for u in unique}
-        for future in as_completed(futures):
-            url, status, error = future.result()
-            if error or (status and status >= 400):
-                failed.append(url)
-            else:
-                results[url] = {'ok': True, 'status': status, 'error': None}
-
-    if failed:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(_request_url, u, _BROWSER_HEADERS): u for u in failed}
-            for future in as_completed(futures):
-                url, status, error = future.result()
-                ok = not error and not (status and status >= 400)
-                results[url] = {'ok': ok, 'status': status, 'error': error}
+    cache = HttpCache(cache_path or CACHE_PATH)
+    cached = {}
+    to_probe = []
+    for u in unique:
+        entry = cache.get_url_check(u)
+        if entry and is_fresh(entry['checked_at'], ttl_hours):
+            results[u] = {'ok': True, 'status': entry['status'], 'error': None}
+        else:
+            cached[u] = entry
+            to_probe.append(u)
+    if len(to_probe) < len(unique):
+        print(f"  {len(unique) - len(to_probe)} URL(s) answered from the check cache "
+              f"(checked OK within {ttl_hours}h)")
+
+    def record(url, status, error, validators):
+        """Store an outcome; returns the result dict. 304 means unchanged since a good check."""
+        if status == 304 and cached.get(url):
+            status = cached[url]['status']
+            validators = {'etag': validators.get('etag') or cached[url]['etag'],
+                          'last_modified': validators.get('last_modified') or cached[url]['last_modified']}
+        ok = not error and not (status and status >= 400)
+        if ok:
+            cache.put_url_check(url, status, validators.get('etag'), validators.get('last_modified'))
+        else:
+            cache.forget_url_check(url)
+        return {'ok': ok, 'status': status, 'error': error}
+
+    try:
+        if to_probe:
+            outcomes = asyncio.run(_probe_urls(to_probe, cached, max_workers))
+            for url, (status, error, validators) in outcomes.items():
+                results[url] = record(url, status, error, validators)
+    finally:
+        cache.close()
 
     return results
 
@@ -246,24 +554,133 @@ def merge_access_note_link_columns(dataset_text, usecase_text):
     return "\n\n".join(parts)
 
 
-def documents_dir_has_files(project_id):
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+
+class ProjectTree:
+    """Index of public/projects, built with one scandir pass per project directory.
+
+    Per project it records the image files in images/ (in directory order, which
+    get_project_image relies on), every file under documents/ (paths relative to the
+    project directory, POSIX separators) and the normalized stems of the root-level
+    *.txt title markers, plus a stem -> directories map. Catalog generation, insights,
+    build.py and build_and_sync used to list these directories per project or per
+    sheet row; they now share one instance and look things up in dictionaries.
+
+    Code that moves or creates project directories keeps the index current with
+    refresh_project() / discard(). names limits the scan to those projects, for
+    one-off lookups that should not pay for the whole tree.
+    """
+
+    def __init__(self, projects_dir=PROJECTS_DIR, names=None):
+        self.projects_dir = projects_dir
+        self.projects = {}
+        self._stem_dirs = {}
+        if names is None:
+            self.refresh()
+        else:
+            for name in names:
+                self.refresh_project(name)
+
+    def refresh(self):
+        """Rescan every project directory."""
+        self.projects = {}
+        self._stem_dirs = {}
+        try:
+            with os.scandir(self.projects_dir) as entries:
+                names = [e.name for e in entries if e.is_dir()]
+        except OSError:
+            names = []
+        for name in names:
+            self.refresh_project(name)
+
+    def refresh_project(self, name):
+        """Rescan one project directory (or drop it from the index if it is gone)."""
+        self.discard(name)
+        root = os.path.join(self.projects_dir, name)
+        if not name or not os.path.isdir(root):
+            return
+        images, documents, stems = [], [], set()
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith('.txt'):
+                        stem = normalize_for_directory(entry.name[:-4])
+                        if stem:
+                            stems.add(stem)
+        except OSError:
+            pass
+        try:
+            with os.scandir(os.path.join(root, 'images')) as entries:
+                images = [e.name for e in entries
+                          if e.is_file() and e.name.lower().endswith(IMAGE_EXTENSIONS)]
+        except OSError:
+            pass
+        # os.walk is scandir-based; its top-down order is kept so ties in the
+        # case-insensitive sort of hosted documents resolve as they always have.
+        for dirpath, _dirs, files in os.walk(os.path.join(root, 'documents')):
+            for filename in sorted(files):
+                rel = os.path.relpath(os.path.join(dirpath, filename), root)
+                documents.append(rel.replace(os.sep, '/'))
+        self.projects[name] = {'images': images, 'documents': documents, 'txt_stems': stems}
+        for stem in stems:
+            self._stem_dirs.setdefault(stem, []).append(name)
+
+    def discard(self, name):
+        entry = self.projects.pop(name, None)
+        if entry:
+            for stem in entry['txt_stems']:
+                dirs = self._stem_dirs.get(stem, [])
+                if name in dirs:
+                    dirs.remove(name)
+
+    def __contains__(self, name):
+        return name in self.projects
+
+    def names(self):
+        """Live, read-only view of the indexed directory names.
+
+        No copy: resolve_project_id() asks for it once per sheet row. Callers that
+        modify the result or need it frozen take set(tree.names()).
+        """
+        return self.projects.keys()
+
+    def images(self, name):
+        return self.projects.get(name, {}).get('images', [])
+
+    def documents(self, name, include_hidden=False):
+        docs = self.projects.get(name, {}).get('documents', [])
+        if include_hidden:
+            return docs
+        return [d for d in docs if not d.rsplit('/', 1)[-1].startswith('.')]
+
+    def txt_stems(self, name):
+        return self.projects.get(name, {}).get('txt_stems', set())
+
+    def dirs_with_stem(self, stem):
+        """Project directories holding a title marker whose stem is exactly stem."""
+        return list(self._stem_dirs.get(stem, []))
+
+    def stems(self):
+        """(directory, stem) pairs for every title marker, in directory order."""
+        return [(name, stem) for name, entry in self.projects.items()
+                for stem in sorted(entry['txt_stems'])]
+
+    def image_paths(self):
+        """Every indexed image as a path under projects_dir."""
+        return {os.path.join(self.projects_dir, name, 'images', f)
+                for name, entry in self.projects.items() for f in entry['images']}
+
+
+def documents_dir_has_files(project_id, tree=None):
     """True if public/projects/<id>/documents/ exists and contains at least one non-hidden file."""
     if not project_id:
         return False
-    doc_dir = os.path.join(PROJECTS_DIR, project_id, "documents")
-    if not os.path.isdir(doc_dir):
-        return False
-    try:
-        for _root, _dirs, files in os.walk(doc_dir):
-            for f in files:
-                if f and not f.startswith("."):
-                    return True
-    except OSError:
-        pass
-    return False
+    tree = tree or ProjectTree(names=[project_id])
+    return bool(tree.documents(project_id))
 
 
-def row_included_for_catalog_or_insights(row, row_idx=None):
+def row_included_for_catalog_or_insights(row, row_idx=None, tree=None):
     """
     Match catalog inclusion: http link(s), any non-empty text in link columns,
     or documents/ with files (after resolve).
@@ -277,10 +694,10 @@ def row_included_for_catalog_or_insights(row, row_idx=None):
         return True
 
     normalized_project_id, _src, error_msg = resolve_project_id(
-        row, row_idx=row_idx
+        row, row_idx=row_idx, tree=tree
     )
     if not error_msg and normalized_project_id and documents_dir_has_files(
-        normalized_project_id
+        normalized_project_id, tree
     ):
         return True
     return False
@@ -313,7 +730,7 @@ def normalize_for_directory(text, max_words=6, max_length=50):
     
     return normalized
 
-def resolve_project_id(row, projects_dir=PROJECTS_DIR, row_idx=None):
+def resolve_project_id(row, projects_dir=PROJECTS_DIR, row_idx=None, tree=None):
     """
     Resolve project ID with smart fallback logic:
     1. Try Project ID from column (if exists and directory exists)
@@ -321,6 +738,9 @@ def resolve_project_id(row, projects_dir=PROJECTS_DIR, row_idx=None):
     3. Try Use Case Speaking Title
     4. Try OnSite Name
     5. Try Project ID as final fallback
+
+    tree: a ProjectTree of projects_dir, to use its directory names instead of
+    listing the directory again for every row.
     
     Returns: (normalized_id, source, error_message)
     """
@@ -333,7 +753,10 @@ def resolve_project_id(row, projects_dir=PROJECTS_DIR, row_idx=None):
     if not os.path.exists(projects_dir):
         os.makedirs(projects_dir, exist_ok=True)
     
-    existing_dirs = set(os.listdir(projects_dir)) if os.path.exists(projects_dir) else set()
+    if tree is not None:
+        existing_dirs = tree.names()
+    else:
+        existing_dirs = set(os.listdir(projects_dir)) if os.path.exists(projects_dir) else set()
     
     # Priority 1: Project ID (always use if available - stable identifier)
     if project_id and not pd.isna(project_id):
@@ -3,19 +3,28 @@ import os
 import re
 import argparse
 from datetime import datetime
-from utils import KNOWN_COUNTRIES, DEFAULT_CREDENTIALS_PATH, get_gsheet_client, check_urls
+from utils import (KNOWN_COUNTRIES, DEFAULT_CREDENTIALS_PATH, get_gsheet_client, check_urls,
+                   sheets_batch_update)
+from sheet_snapshot import sheet_values
 from generate_catalog_data import KNOWN_LICENSE_VALUES
 
 parser = argparse.ArgumentParser(description='Validate catalog data and generate quality report.')
 parser.add_argument('--input', type=str, default="public/data/catalog.json", help='Path to catalog JSON')
 parser.add_argument('--output', type=str, default="docs/data_quality_report.md", help='Path to output report')
 parser.add_argument('--check-urls', action='store_true', help='Validate that all HTTP URLs resolve (makes network requests)')
+parser.add_argument('--url-cache-ttl', type=float, default=None,
+                    help='Hours a successful URL check stays cached (default 24; 0 re-checks every URL)')
 parser.add_argument('--write-notes', action='store_true', help='Write quality notes to Google Sheet cells')
 parser.add_argument('--credentials', type=str, default=DEFAULT_CREDENTIALS_PATH,
                     help='Path to Google Sheets credentials (only used with --write-notes)')
 parser.add_argument('--excel', type=str, default="docs/data_catalog.xlsx",
                     help='Path to Excel file (for row mapping with --write-notes)')
-args = parser.parse_args()
+# Parse CLI args only when run directly; build.py imports this module for its
+# in-process pipeline, and must not have its own argv parsed here.
+if __name__ == "__main__":
+    args = parser.parse_args()
+else:
+    args = parser.parse_args([])
 
 # Column names in the Google Sheet / Excel
 COL_LICENSE = 'License'
@@ -66,10 +75,14 @@ COLUMN_ALIASES = {
 }
 
 
-def validate_catalog(catalog_path):
-    """Run all validation checks and return structured issues."""
-    with open(catalog_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def validate_catalog(catalog_path, data=None):
+    """Run all validation checks and return structured issues.
+
+    Pass data to validate an already-loaded catalog instead of reading catalog_path.
+    """
+    if data is None:
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
 
     projects = data.get('projects', [])
     issues = {
@@ -152,8 +165,11 @@ def _url_likely_cause(status):
     return f"Network error ({status})"
 
 
-def validate_urls(projects):
-    """Check all HTTP URLs in the catalog for accessibility."""
+def validate_urls(projects, ttl_hours=None):
+    """Check all HTTP URLs in the catalog for accessibility.
+
+    ttl_hours overrides how long a successful check stays cached (see utils.check_urls).
+    """
     url_map = {}  # url -> [project_titles]
     for p in projects:
         title = p.get('title', p.get('id', '?'))
@@ -167,7 +183,7 @@ def validate_urls(projects):
         return []
 
     print(f"\n  Checking {len(url_map)} unique URLs...")
-    results = check_urls(url_map.keys())
+    results = check_urls(url_map.keys(), ttl_hours=ttl_hours)
 
     broken = []
     for url, res in results.items():
@@ -337,20 +353,20 @@ def write_report(projects, issues, output_path):
     print(f"Quality report written to {output_path}")
 
 
-def build_row_notes(excel_path, broken_urls=None):
-    """Read Excel and build per-row quality notes keyed by Excel row index.
+def build_row_notes(excel_path, broken_urls=None, df=None):
+    """Read Excel (unless df is given) and build per-row quality notes keyed by Excel row index.
 
     Returns dict: {row_index: {column_name: note_text}}
     Row indices are 0-based (matching df.iterrows), and map to sheet row = idx + 3
     (1-indexed + header row + explanation row).
     """
-    import pandas as pd
-    from utils import resolve_project_id, extract_http_links
+    from utils import resolve_project_id, extract_http_links, load_sheet
 
     broken_set = {item['url'] for item in (broken_urls or [])}
     broken_info = {item['url']: item for item in (broken_urls or [])}
 
-    df = pd.read_excel(excel_path)
+    if df is None:
+        df = load_sheet(excel_path)
     row_notes = {}
 
     for idx, row in df.iterrows():
@@ -441,11 +457,76 @@ def build_row_notes(excel_path, broken_urls=None):
     return row_notes
 
 
+NOTE_PREFIX = "[Auto-check] "
+
+
+def split_note(note):
+    """(human part, auto-check part) of a cell note.
+
+    The auto-check text is always written last, after any note a person left, so
+    everything before NOTE_PREFIX is theirs.
+    """
+    if NOTE_PREFIX not in note:
+        return note, ''
+    human, _, auto = note.partition(NOTE_PREFIX)
+    return human.rstrip(), NOTE_PREFIX + auto
+
+
+def diff_sheet_notes(desired, existing_grid):
+    """Notes to write, {(sheet_row, col_idx): full note}, given the auto-check texts wanted.
+
+    desired maps 1-based cells to auto-check text (without NOTE_PREFIX); existing_grid
+    is Worksheet.get_notes() output, or None when it could not be read. A cell is
+    included only if its note would change: the human part is kept and the auto-check
+    part replaced. Cells that still carry an auto-check note but are no longer flagged
+    are reset to their human part ('' clears the note). Without a grid every desired
+    note is written and nothing can be cleaned up.
+    """
+    def existing(row, col):
+        if existing_grid is None:
+            return ''
+        r, c = row - 1, col - 1
+        if r < len(existing_grid) and c < len(existing_grid[r]):
+            return existing_grid[r][c] or ''
+        return ''
+
+    changes = {}
+    for (row, col), text in desired.items():
+        current = existing(row, col)
+        human, _auto = split_note(current)
+        note = (human + "\n\n" if human else '') + NOTE_PREFIX + text
+        if existing_grid is None or note != current:
+            changes[(row, col)] = note
+
+    for r, cells in enumerate(existing_grid or []):
+        for c, current in enumerate(cells):
+            cell = (r + 1, c + 1)
+            if cell in desired or not current or NOTE_PREFIX not in current:
+                continue
+            changes[cell] = split_note(current)[0]
+    return changes
+
+
+def _note_request(sheet_id, row, col, note):
+    """updateCells request setting one cell's note (1-based row/col; '' clears it)."""
+    return {
+        'updateCells': {
+            'range': {
+                'sheetId': sheet_id,
+                'startRowIndex': row - 1, 'endRowIndex': row,
+                'startColumnIndex': col - 1, 'endColumnIndex': col,
+            },
+            'rows': [{'values': [{'note': note}]}],
+            'fields': 'note',
+        }
+    }
+
+
 def write_notes_to_sheet(row_notes, credentials_path):
-    """Write quality feedback as cell notes to the Google Sheet using batch API."""
-    import gspread
-    _client, _spreadsheet, sheet = get_gsheet_client(credentials_path)
-    headers = sheet.row_values(1)
+    """Write quality feedback as cell notes to the Google Sheet, changed cells only."""
+    _client, spreadsheet, sheet = get_gsheet_client(credentials_path)
+    values = sheet_values(sheet)
+    headers = values[0] if values else []
 
     # Build a lookup from actual sheet header -> 1-based column index
     header_to_idx = {}
@@ -465,75 +546,66 @@ def write_notes_to_sheet(row_notes, credentials_path):
         if canonical not in col_indices:
             print(f"  WARNING: Could not find sheet column for '{canonical}'")
 
-    # First, batch-clear any previous auto-check notes so we start clean.
-    # Then batch-write all new notes in one API call.
-    # This avoids per-cell get_note + update_note (which hits rate limits).
-
-    note_prefix = "[Auto-check] "
-
-    # Read all existing notes in one call (returns list-of-lists)
-    existing_notes_grid = []
+    # Read all existing notes in one call (returns list-of-lists) and write only the
+    # cells whose note would actually change, in as few batchUpdate calls as possible.
+    existing_notes_grid = None
     try:
         existing_notes_grid = sheet.get_notes(default_empty_value='')
-    except Exception:
-        pass  # If get_notes fails, proceed without checking existing
-
-    def get_existing_note(sheet_row, col_idx):
-        """Look up an existing note from the grid (1-based row/col)."""
-        r = sheet_row - 1  # convert to 0-based
-        c = col_idx - 1
-        if r < len(existing_notes_grid) and c < len(existing_notes_grid[r]):
-            return existing_notes_grid[r][c]
-        return ''
+    except Exception as e:
+        print(f"  Could not read existing notes ({e}); writing every note")
 
-    # Build batch notes dict: {cell_A1_notation: note_text}
-    batch_notes = {}
+    desired = {}
     for row_idx, notes in row_notes.items():
         sheet_row = row_idx + 3  # +1 for 1-indexing, +1 for header, +1 for explanation row
         for col_name, note_text in notes.items():
             col_idx = col_indices.get(col_name)
-            if col_idx is None:
-                continue
-            cell = gspread.utils.rowcol_to_a1(sheet_row, col_idx)
-            full_note = note_prefix + note_text
-
-            # If cell has an existing note that is NOT auto-check, preserve it
-            existing = get_existing_note(sheet_row, col_idx)
-            if existing and note_prefix not in existing:
-                full_note = existing + "\n\n" + full_note
+            if col_idx is not None:
+                desired[(sheet_row, col_idx)] = note_text
 
-            batch_notes[cell] = full_note
-
-    if not batch_notes:
-        print("  No notes to write.")
+    changes = diff_sheet_notes(desired, existing_notes_grid)
+    unchanged = len(desired) - sum(1 for cell in changes if cell in desired)
+    if not changes:
+        print(f"  All {len(desired)} quality notes already up to date; nothing to write.")
         return
 
-    # Write all notes in one batch API call
+    requests = [_note_request(sheet.id, row, col, note) for (row, col), note in sorted(changes.items())]
     try:
-        sheet.update_notes(batch_notes)
-        print(f"  Wrote {len(batch_notes)} quality notes to Google Sheet (batch)")
+        calls = sheets_batch_update(spreadsheet, requests)
+        cleared = len(changes) - (len(desired) - unchanged)
+        print(f"  Wrote {len(changes)} changed note(s) in {calls} batch request(s) "
+              f"({unchanged} unchanged skipped, {cleared} stale auto-check note(s) removed)")
     except Exception as e:
         print(f"  Error writing batch notes: {e}")
         import traceback
         traceback.print_exc()
 
 
-if __name__ == "__main__":
-    if not os.path.exists(args.input):
-        print(f"Error: {args.input} not found. Run generate_catalog_data.py first.")
-        exit(1)
+def run_checks(catalog_path, output_path, check_urls=False, data=None, url_cache_ttl=None):
+    """Validate the catalog, print the console summary and write the report.
 
-    projects, issues = validate_catalog(args.input)
+    Returns (projects, issues). Shared by the CLI and build.py's in-process pipeline.
+    """
+    projects, issues = validate_catalog(catalog_path, data)
 
-    if args.check_urls:
+    if check_urls:
         try:
-            issues['broken_urls'] = validate_urls(projects)
+            issues['broken_urls'] = validate_urls(projects, url_cache_ttl)
         except Exception as e:
             print(f"  Warning: URL validation failed ({e}), skipping")
             issues['broken_urls'] = []
 
     print_console_summary(projects, issues)
-    write_report(projects, issues, args.output)
+    write_report(projects, issues, output_path)
+    return projects, issues
+
+
+if __name__ == "__main__":
+    if not os.path.exists(args.input):
+        print(f"Error: {args.input} not found. Run generate_catalog_data.py first.")
+        exit(1)
+
+    projects, issues = run_checks(args.input, args.output, args.check_urls,
+                                  url_cache_ttl=args.url_cache_ttl)
 
     if args.write_notes:
         if not os.path.exists(args.credentials):
@@ -546,10 +618,9 @@ if __name__ == "__main__":
         print("Writing quality notes to Google Sheet...")
         try:
             row_notes = build_row_notes(args.excel, issues.get('broken_urls'))
-            if row_notes:
-                write_notes_to_sheet(row_notes, args.credentials)
-            else:
-                print("  No quality issues found to write back.")
+            if not row_notes:
+                print("  No quality issues found; clearing any stale auto-check notes.")
+            write_notes_to_sheet(row_notes, args.credentials)
         except Exception as e:
             print(f"  Warning: Could not write notes to Google Sheet: {e}")
             import traceback
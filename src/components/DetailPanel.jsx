@@ -1,7 +1,8 @@
-import { useState, useEffect, useCallback, useRef, Fragment } from 'react'
+import { useState, useEffect, useCallback, useMemo, useRef, Fragment } from 'react'
 import ReactMarkdown from 'react-markdown'
 import remarkGfm from 'remark-gfm'
 import { withBasePath, resolvePublicHref } from '../utils/basePath'
+import { coverBackground } from '../utils/images'
 import { parseSdgList } from '../utils/sdgColors'
 import { completenessFromScore, depthLabel } from '../utils/depth'
 import { parseContacts, licenseLabel, firstUrl, labelFromUrl } from '../utils/parsing'
@@ -182,7 +183,29 @@ const parseOrganizations = (orgText = '') => {
   return { powered, catalyzed, financed }
 }
 
-const DetailPanel = ({ project, onClose }) => {
+const DetailPanel = ({ project: listProject, onClose }) => {
+  // The catalog page only holds the slim list-index entry (data/catalog-index.json).
+  // The full record -- links, organizations, prose, access note -- is fetched from
+  // data/projects/<id>.json when the panel opens; until it arrives the panel renders
+  // from the index entry. Health is merged client-side, so it is kept from the list.
+  const [detail, setDetail] = useState(null)
+  useEffect(() => {
+    if (!listProject?.id) return
+    let cancelled = false
+    setDetail(null)
+    fetch(withBasePath(`data/projects/${listProject.id}.json`))
+      .then(res => (res.ok ? res.json() : null))
+      .then(data => { if (!cancelled) setDetail(data) })
+      .catch(err => console.log(`Could not load details for ${listProject.id}:`, err))
+    return () => { cancelled = true }
+  }, [listProject?.id])
+  const project = useMemo(
+    () => (detail && detail.id === listProject?.id
+      ? { ...detail, health: listProject.health }
+      : listProject),
+    [detail, listProject]
+  )
+
   const [markdownContent, setMarkdownContent] = useState({})
   const [loading, setLoading] = useState(true)
   const [copied, setCopied] = useState(false)
@@ -270,7 +293,7 @@ const DetailPanel = ({ project, onClose }) => {
     }
 
     loadMarkdown()
-  }, [project])
+  }, [project?.id])
 
   // Focus management and focus trap
   useEffect(() => {
@@ -304,7 +327,7 @@ const DetailPanel = ({ project, onClose }) => {
       clearTimeout(timer)
       previousFocusRef.current?.focus()
     }
-  }, [project])
+  }, [project?.id])
 
   // Reflect the open project in the document title and social-preview tags so the
   // browser tab, bookmarks and screen readers show the project (not the generic
@@ -560,7 +583,7 @@ const DetailPanel = ({ project, onClose }) => {
                     return (
                       <div
                         className="panel-rail-image"
-                        style={{ backgroundImage: `url("${withBasePath(project.image)}")` }}
+                        style={{ backgroundImage: coverBackground(project.image, project.image_srcset, 360) }}
                       />
                     )
                   }
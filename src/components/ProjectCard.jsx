@@ -1,4 +1,5 @@
 import { withBasePath } from '../utils/basePath'
+import { coverBackground, expandVariants } from '../utils/images'
 import { parseFirstSdg } from '../utils/sdgColors'
 import { licenseLabel, firstUrl } from '../utils/parsing'
 import { completenessFromScore, depthLabel } from '../utils/depth'
@@ -6,7 +7,7 @@ import { hasHealthSignal, availabilityLabel, contextLabel } from '../utils/healt
 
 const ProjectCard = ({ project, onClick, onFilterSDG }) => {
   const {
-    id, slug, title, description, sdgs = [], data_types = [], image,
+    id, slug, title, summary, description, sdgs = [], data_types = [], image, image_variants,
     has_dataset, has_usecase, is_lacuna, has_access_note,
     countries = [], license, quality_score, health
   } = project
@@ -34,10 +35,14 @@ const ProjectCard = ({ project, onClick, onFilterSDG }) => {
   ].filter(Boolean).join(' ')
 
   // Short description -- two lines on the card, full text in the detail panel.
+  // The list index ships it pre-truncated as `summary` (CARD_SUMMARY_CHARS in
+  // scripts/generate_catalog_data.py -- keep the two lengths in sync).
   const maxLength = 160
-  const truncatedDesc = description && description.length > maxLength
-    ? description.substring(0, maxLength).trimEnd() + '…'
-    : description
+  const truncatedDesc = summary !== undefined
+    ? summary
+    : description && description.length > maxLength
+      ? description.substring(0, maxLength).trimEnd() + '…'
+      : description
 
   const countryLabel = countries.length > 0
     ? (countries.length > 2 ? `${countries.slice(0, 2).join(', ')} +${countries.length - 2}` : countries.join(', '))
@@ -63,7 +68,7 @@ const ProjectCard = ({ project, onClick, onFilterSDG }) => {
         className={`card-image${image ? ' has-image' : ''}`}
         style={
           image
-            ? { backgroundImage: `url("${withBasePath(image)}")` }
+            ? { backgroundImage: coverBackground(image, expandVariants(image_variants), 400) }
             : fallbackColor
               ? { backgroundImage: `linear-gradient(135deg, ${fallbackColor}20 0%, ${fallbackColor}44 100%)` }
               : undefined
@@ -7,9 +7,15 @@ import DetailPanel from '../components/DetailPanel'
 import Header from '../components/Header'
 import Footer from '../components/Footer'
 import { withBasePath } from '../utils/basePath'
-import { rankScore } from '../utils/ranking'
 import { matchesStatus, entryStatusValues, STATUS_OPTIONS } from '../utils/health'
 
+// Prose fields searched in addition to what the list index carries. They live only
+// in the full catalog.json, which is fetched the first time someone searches.
+const SEARCH_PROSE_FIELDS = [
+  'description', 'organizations', 'contact', 'authors', 'data_characteristics',
+  'model_characteristics', 'how_to_use', 'license', 'access_note_markdown'
+]
+
 const CatalogPage = () => {
   const [searchParams, setSearchParams] = useSearchParams()
   const routeParams = useParams()
@@ -18,6 +24,8 @@ const CatalogPage = () => {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const [selectedProject, setSelectedProject] = useState(null)
+  // id -> lowercased prose of that project, loaded on the first search.
+  const [searchText, setSearchText] = useState(null)
 
   // Handle project selection and URL updates
   const handleProjectSelect = useCallback((project) => {
@@ -78,22 +86,16 @@ const CatalogPage = () => {
   const loadCatalog = useCallback(() => {
     setLoading(true)
     setError(null)
-    // health.json is enriched separately (weekly) and merged here by id. A missing or
-    // failed fetch must never break the catalog -- the signal is purely additive.
-    const healthPromise = fetch(withBasePath('data/health.json'))
-      .then(res => (res.ok ? res.json() : null))
-      .catch(() => null)
-    Promise.all([
-      fetch(withBasePath('data/catalog.json')).then(res => {
+    // The slim list index: card fields, each project's weekly health entry under
+    // `health` (null when none), already in rank order (scripts/catalog_index.py).
+    // Full records are fetched per project by the detail panel, so first load stays
+    // small on slow connections.
+    fetch(withBasePath('data/catalog-index.json'))
+      .then(res => {
         if (!res.ok) throw new Error('Failed to load catalog data')
         return res.json()
-      }),
-      healthPromise
-    ])
-      .then(([data, health]) => {
-        if (health?.entries && Array.isArray(data.projects)) {
-          data.projects = data.projects.map(p => ({ ...p, health: health.entries[p.id] || null }))
-        }
+      })
+      .then(data => {
         setCatalogData(data)
         setLoading(false)
         
@@ -145,6 +147,25 @@ const CatalogPage = () => {
   // Load catalog data
   useEffect(() => { loadCatalog() }, [])
 
+  // Fetch the prose for full-text search once, the first time a search is entered.
+  // Until it arrives, search matches the fields the index carries.
+  useEffect(() => {
+    if (!filters.search || searchText) return
+    let cancelled = false
+    fetch(withBasePath('data/catalog.json'))
+      .then(res => (res.ok ? res.json() : null))
+      .then(data => {
+        if (cancelled || !Array.isArray(data?.projects)) return
+        const text = {}
+        data.projects.forEach(p => {
+          text[p.id] = SEARCH_PROSE_FIELDS.map(f => p[f]).filter(Boolean).join('\n').toLowerCase()
+        })
+        setSearchText(text)
+      })
+      .catch(() => {})
+    return () => { cancelled = true }
+  }, [filters.search, searchText])
+
   // Status filter options, derived from the merged (weekly) health data. Only statuses actually
   // present are offered; if health.json failed to load there are none and the filter stays hidden.
   const availableStatuses = useMemo(() => {
@@ -164,20 +185,10 @@ const CatalogPage = () => {
     if (filters.search) {
       const searchLower = filters.search.toLowerCase()
       projects = projects.filter(p => {
-        const textFields = [
-          p.title,
-          p.description,
-          p.organizations,
-          p.contact,
-          p.authors,
-          p.data_characteristics,
-          p.model_characteristics,
-          p.how_to_use,
-          p.license,
-          p.access_note_markdown
-        ]
+        const textFields = [p.title, p.summary, p.license]
         // Check plain text fields
         if (textFields.some(f => f && f.toLowerCase().includes(searchLower))) return true
+        if (searchText?.[p.id]?.includes(searchLower)) return true
         // Check array fields
         if (p.countries.some(c => c.toLowerCase().includes(searchLower))) return true
         if (p.sdgs.some(s => s.toLowerCase().includes(searchLower))) return true
@@ -229,10 +240,10 @@ const CatalogPage = () => {
       }
     }
 
-    // Sort by combined rank: documentation depth, boosted by recent activity and link availability.
-    // Copy first so we never sort catalogData.projects (state) in place.
-    return [...projects].sort((a, b) => rankScore(b) - rankScore(a))
-  }, [catalogData, filters, availableStatuses])
+    // The index is already sorted by combined rank (documentation depth, boosted by recent
+    // activity and link availability), and filtering keeps that order.
+    return projects
+  }, [catalogData, filters, availableStatuses, searchText])
 
   // Calculate dynamic stats based on filtered results
   const dynamicStats = useMemo(() => {
@@ -243,8 +254,8 @@ const CatalogPage = () => {
     let usecaseCount = 0
     let accessNoteCount = 0
     filteredProjects.forEach(p => {
-      if (p.dataset_links) datasetCount += p.dataset_links.length
-      if (p.usecase_links) usecaseCount += p.usecase_links.length
+      datasetCount += p.dataset_link_count || 0
+      usecaseCount += p.usecase_link_count || 0
       if (p.has_access_note) accessNoteCount += 1
     })
     
@@ -25,7 +25,9 @@ const InsightsPage = () => {
         if (!res.ok) throw new Error('Failed to load insights data')
         return res.json()
       }),
-      fetch(withBasePath('data/catalog.json')).then(res => {
+      // Only list-level fields (maturity, countries, sdgs) are read here, so the slim
+      // index will do.
+      fetch(withBasePath('data/catalog-index.json')).then(res => {
         if (!res.ok) throw new Error('Failed to load catalog data')
         return res.json()
       })
@@ -0,0 +1,52 @@
+// Cover images as CSS backgrounds, preferring the resized WebP/AVIF copies that
+// scripts/image_derivatives.py writes. A project's `image_srcset` (see
+// get_project_image in scripts/generate_catalog_data.py) lists, per MIME type, the
+// variants by width; `image` is the original and stays the fallback. Cards get the
+// compact `image_variants` from catalog-index.json instead (see image_variants in
+// scripts/catalog_index.py), which expandVariants turns back into that shape.
+import { withBasePath } from './basePath'
+
+// Keep in sync with DERIVED_URL and variant_name() in scripts/image_derivatives.py.
+const DERIVED_URL = '/img/derived'
+const EXTENSIONS = { 'image/avif': 'avif', 'image/webp': 'webp' }
+
+// image-set() with type() lets the browser skip formats it cannot decode. Where
+// it is unsupported the original is used, as it was before derivatives existed.
+const supportsTypedImageSet = typeof CSS !== 'undefined' && typeof CSS.supports === 'function' &&
+  CSS.supports('background-image', 'image-set(url("x.webp") type("image/webp") 1x)')
+
+const devicePixelRatio = () =>
+  (typeof window !== 'undefined' && window.devicePixelRatio) || 1
+
+// Narrowest variant at least cssWidth device pixels wide, else the widest one.
+const pickVariant = (srcset, cssWidth) => {
+  const needed = cssWidth * devicePixelRatio()
+  const sorted = [...srcset].sort((a, b) => a.width - b.width)
+  return sorted.find(v => v.width >= needed) || sorted[sorted.length - 1]
+}
+
+export const expandVariants = (variants) => {
+  if (!variants?.hash || !variants.widths?.length) return null
+  const sources = (variants.types || []).filter(type => EXTENSIONS[type]).map(type => ({
+    type,
+    srcset: variants.widths.map(width => ({
+      url: `${DERIVED_URL}/${variants.hash}-${width}.${EXTENSIONS[type]}`,
+      width
+    }))
+  }))
+  return { sources }
+}
+
+export const coverBackground = (image, srcset, cssWidth) => {
+  if (!image) return null
+  const original = `url("${withBasePath(image)}")`
+  const sources = srcset?.sources?.filter(s => s.srcset?.length) || []
+  if (!supportsTypedImageSet || sources.length === 0) return original
+  const candidates = sources.map(s => {
+    const variant = pickVariant(s.srcset, cssWidth)
+    return `url("${withBasePath(variant.url)}") type("${s.type}") 1x`
+  })
+  return `image-set(${candidates.join(', ')})`
+}
+
+export default coverBackground
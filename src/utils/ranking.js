@@ -1,4 +1,9 @@
-// Combined ranking score used to ORDER catalog cards (CatalogPage sort).
+// Combined ranking score used to ORDER catalog cards.
+//
+// The catalog page does not sort at runtime: scripts/catalog_index.py applies the same score at
+// build time (and after each weekly health check) and ships catalog-index.json in rank order.
+// This is the JavaScript statement of the rule; scripts/check_parity.py runs both over the live
+// catalog, so change them together.
 //
 // It blends documentation completeness (quality_score, computed in the Python build and shown as
 // the 5-dot "information depth" indicator) with the weekly health signal: